@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Archive and remove analytics events older than the retention window.
+
+Whole months older than ANALYTICS_RETENTION_DAYS (default 90) are written
+to gzipped NDJSON in ANALYTICS_ARCHIVE_DIR and removed from the database
+(a partition drop on Postgres once partitioned). Rollups are kept. Run it
+daily from cron.
+
+Usage:
+    python analytics_retention.py                          # Archive expired months
+    python analytics_retention.py --retention-days 30
+    python analytics_retention.py --partition              # Postgres: convert to monthly partitions (once)
+    python analytics_retention.py --rollup-archives 2026-01-01 2026-04-01
+                                                           # Recompute rollups from archives
+"""
+
+import sys
+import logging
+import argparse
+from datetime import datetime
+from sqlmodel import Session
+from database import engine, create_db_and_tables
+from services.analytics_retention import AnalyticsRetentionService, ARCHIVE_DIR, RETENTION_DAYS
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Archive and remove analytics events older than the retention window"
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=RETENTION_DAYS,
+        help=f"Days of raw events to keep (default: {RETENTION_DAYS})"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=ARCHIVE_DIR,
+        help=f"Archive directory (default: {ARCHIVE_DIR})"
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="Convert AnalyticsEvent to monthly partitions (Postgres only), then exit"
+    )
+    parser.add_argument(
+        "--rollup-archives",
+        nargs=2,
+        metavar=("START", "END"),
+        type=datetime.fromisoformat,
+        help="Recompute rollups for [START, END) from archived and live events, then exit"
+    )
+
+    args = parser.parse_args()
+    create_db_and_tables()
+
+    logger.info("=" * 70)
+    logger.info("ANALYTICS RETENTION")
+    logger.info("=" * 70)
+
+    if args.partition:
+        with engine.begin() as connection:
+            created = AnalyticsRetentionService.partition(connection)
+        logger.info(f"Partitions created:        {created}")
+        sys.exit(0)
+
+    with Session(engine) as session:
+        if args.rollup_archives:
+            start, end = args.rollup_archives
+            written = AnalyticsRetentionService.rollup_archives(session, start, end, args.archive_dir)
+            logger.info(f"Rollup rows written:       {written}")
+            sys.exit(0)
+
+        archived = AnalyticsRetentionService.apply_retention(
+            session, retention_days=args.retention_days, archive_dir=args.archive_dir
+        )
+
+    for month, events in archived.items():
+        logger.info(f"{month}:                   {events} events archived")
+    logger.info(f"Months archived:           {len(archived)}")
+    logger.info("✓ Analytics retention complete!")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,9 @@
 Backfill honking version cache for existing data.
 
 This script populates the denormalized cache fields with values
-calculated from the existing HonkingVersion records.
+calculated from the existing HonkingVersion records. The rebuild is
+set-based and runs one song-id range at a time, so it can also be run
+periodically to repair drift.
 
 Run this AFTER applying the migration that adds the cache columns.
 
@@ -11,14 +13,14 @@ Usage:
     python backfill_honking_cache.py                    # Full backfill
     python backfill_honking_cache.py --verify-only      # Verify without changes
     python backfill_honking_cache.py --fix              # Fix inconsistencies
+    python backfill_honking_cache.py --workers 4        # Rebuild 4 song ranges at a time
 """
 
 import sys
 import logging
 from sqlmodel import Session
 from database import engine, create_db_and_tables
-from models import Song, SongPerformance, HonkingVersion
-from services.honking_cache import HonkingCacheService
+from services.honking_cache import HonkingCacheService, REBUILD_CHUNK_SONGS
 import argparse
 
 # Set up logging
@@ -29,12 +31,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def backfill_cache(verify_only: bool = False):
+def backfill_cache(verify_only: bool = False, chunk_size: int = REBUILD_CHUNK_SONGS, workers: int = 1) -> bool:
     """
     Backfill the honking version cache from existing vote data.
 
     Args:
         verify_only: If True, only verify cache consistency without changes
+        chunk_size: Song ids rebuilt per range
+        workers: Song ranges rebuilt concurrently
+
+    Returns:
+        True if the cache is consistent afterwards
     """
     create_db_and_tables()
 
@@ -48,74 +55,29 @@ def backfill_cache(verify_only: bool = False):
         else:
             logger.info("Running in BACKFILL mode (will update database)")
 
-        # Get all songs with honking votes
-        from sqlmodel import select, func
-        songs_with_votes = session.exec(
-            select(HonkingVersion.song_id).distinct()
-        ).all()
-
-        logger.info(f"Found {len(songs_with_votes)} songs with honking votes")
-
-        songs_updated = 0
-        songs_fixed = 0
-        performances_updated = 0
-        inconsistencies_found = 0
-
-        for song_id in songs_with_votes:
-            # Verify cache consistency before update
-            is_consistent = HonkingCacheService.verify_cache_consistency(
-                session, song_id
-            )
-
-            if not is_consistent:
-                inconsistencies_found += 1
-                logger.warning(f"Cache inconsistency detected for song {song_id}")
-
-            if not verify_only:
-                # Rebuild cache for this song
-                HonkingCacheService.recalculate_song_cache(session, song_id)
-
-                # Rebuild cache for all performances in this song
-                performances = session.exec(
-                    select(SongPerformance.id).where(
-                        SongPerformance.song_id == song_id
-                    )
-                ).all()
-
-                for perf_id in performances:
-                    HonkingCacheService.recalculate_performance_cache(session, perf_id)
-                    performances_updated += 1
-
-                songs_updated += 1
-
-                # Progress indicator
-                if songs_updated % 10 == 0:
-                    logger.info(f"Progress: {songs_updated} songs processed")
+        initial = HonkingCacheService.find_inconsistencies(session)
+        logger.info(f"Initial inconsistencies:   {len(initial)}")
 
+        songs_updated = performances_updated = 0
         if not verify_only:
-            session.commit()
+            songs_updated, performances_updated = HonkingCacheService.rebuild_all_cache(
+                session, chunk_size=chunk_size, workers=workers
+            )
 
         # Final verification pass
-        logger.info("Running final verification pass...")
-        final_inconsistencies = 0
-        for song_id in songs_with_votes:
-            is_consistent = HonkingCacheService.verify_cache_consistency(
-                session, song_id
-            )
-            if not is_consistent:
-                final_inconsistencies += 1
+        final = initial if verify_only else HonkingCacheService.find_inconsistencies(session)
 
         logger.info("\n" + "=" * 70)
         logger.info("BACKFILL COMPLETE - Summary")
         logger.info("=" * 70)
-        logger.info(f"Songs processed:           {songs_updated if not verify_only else len(songs_with_votes)}")
+        logger.info(f"Songs updated:             {songs_updated}")
         logger.info(f"Performances updated:      {performances_updated}")
-        logger.info(f"Initial inconsistencies:   {inconsistencies_found}")
-        logger.info(f"Final inconsistencies:     {final_inconsistencies}")
+        logger.info(f"Initial inconsistencies:   {len(initial)}")
+        logger.info(f"Final inconsistencies:     {len(final)}")
         logger.info(f"Mode:                      {'VERIFY-ONLY' if verify_only else 'BACKFILL'}")
 
-        if final_inconsistencies > 0:
-            logger.warning(f"⚠️  {final_inconsistencies} inconsistencies remain!")
+        if final:
+            logger.warning(f"⚠️  {len(final)} inconsistencies remain!")
             return False
         else:
             logger.info("✓ Cache is fully consistent")
@@ -136,10 +98,22 @@ def main():
         action="store_true",
         help="Fix inconsistencies (alias for normal backfill)"
     )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=REBUILD_CHUNK_SONGS,
+        help=f"Song ids rebuilt per range (default: {REBUILD_CHUNK_SONGS})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Song ranges rebuilt concurrently (default: 1; use >1 on PostgreSQL)"
+    )
 
     args = parser.parse_args()
 
-    success = backfill_cache(verify_only=args.verify_only)
+    success = backfill_cache(verify_only=args.verify_only, chunk_size=args.chunk_size, workers=args.workers)
 
     if success:
         logger.info("\n✓ Cache backfill successful!")
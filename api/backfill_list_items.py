@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Backfill normalized list items from UserList.items.
+
+Rewrites every list's ListItem rows from its JSON items column and
+recomputes UserList.follower_count. Safe to re-run.
+
+Run this AFTER applying the migration that adds the listitem table.
+
+Usage:
+    python backfill_list_items.py
+"""
+
+import logging
+from sqlmodel import Session
+from database import engine, create_db_and_tables
+from services.list_items import ListItemService
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    create_db_and_tables()
+
+    with Session(engine) as session:
+        logger.info("=" * 70)
+        logger.info("LIST ITEMS BACKFILL")
+        logger.info("=" * 70)
+
+        lists, items = ListItemService.rebuild_all(session)
+        logger.info(f"Lists rebuilt:             {lists}")
+        logger.info(f"Items written:             {items}")
+
+    logger.info("✓ List items backfill successful!")
+
+
+if __name__ == "__main__":
+    main()
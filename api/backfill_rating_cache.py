@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Backfill rating aggregate cache for existing data.
+
+This script populates SongPerformance.vote_count/rating_sum and
+Show.vote_count/rating_sum from the existing Vote records.
+
+Run this AFTER applying the migration that adds the cache columns.
+
+Usage:
+    python backfill_rating_cache.py                    # Full rebuild
+    python backfill_rating_cache.py --verify-only      # Verify without changes
+"""
+
+import sys
+import logging
+import argparse
+from sqlmodel import Session
+from database import engine, create_db_and_tables
+from services.rating_cache import RatingCacheService
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def backfill_cache(verify_only: bool = False) -> bool:
+    """
+    Rebuild (or just verify) the rating aggregate cache.
+
+    Args:
+        verify_only: If True, only verify cache consistency without changes
+
+    Returns:
+        True if the cache is consistent afterwards
+    """
+    create_db_and_tables()
+
+    with Session(engine) as session:
+        logger.info("=" * 70)
+        logger.info("RATING AGGREGATE CACHE BACKFILL")
+        logger.info("=" * 70)
+
+        initial = RatingCacheService.find_inconsistencies(session)
+        logger.info(f"Initial inconsistencies:   {len(initial)}")
+
+        if not verify_only:
+            performances, shows = RatingCacheService.rebuild_all_cache(session)
+            logger.info(f"Performances rebuilt:      {performances}")
+            logger.info(f"Shows rebuilt:             {shows}")
+
+        final = initial if verify_only else RatingCacheService.find_inconsistencies(session)
+        logger.info(f"Final inconsistencies:     {len(final)}")
+        logger.info(f"Mode:                      {'VERIFY-ONLY' if verify_only else 'BACKFILL'}")
+
+        if final:
+            logger.warning(f"⚠️  {len(final)} inconsistencies remain!")
+            return False
+        logger.info("✓ Cache is fully consistent")
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill rating aggregate cache"
+    )
+    parser.add_argument(
+        "--verify-only",
+        action="store_true",
+        help="Only verify consistency without making changes"
+    )
+
+    args = parser.parse_args()
+
+    if backfill_cache(verify_only=args.verify_only):
+        logger.info("\n✓ Rating cache backfill successful!")
+        sys.exit(0)
+    else:
+        logger.error("\n✗ Rating cache backfill completed with warnings")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
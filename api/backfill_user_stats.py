@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Backfill and repair per-user counters.
+
+This script creates a UserCounters row for every user and recounts votes,
+followers, following, shows attended and lists from the source tables.
+Run it after applying the migration, and periodically (e.g. nightly) to
+repair any drift.
+
+Usage:
+    python backfill_user_stats.py                    # Full rebuild
+    python backfill_user_stats.py --verify-only      # Verify without changes
+"""
+
+import sys
+import logging
+import argparse
+from sqlmodel import Session
+from database import engine, create_db_and_tables
+from services.user_stats import UserStatsService
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def backfill_counters(verify_only: bool = False) -> bool:
+    """
+    Rebuild (or just verify) the per-user counters.
+
+    Args:
+        verify_only: If True, only verify counter consistency without changes
+
+    Returns:
+        True if the counters are consistent afterwards
+    """
+    create_db_and_tables()
+
+    with Session(engine) as session:
+        logger.info("=" * 70)
+        logger.info("USER COUNTERS BACKFILL")
+        logger.info("=" * 70)
+
+        initial = UserStatsService.find_inconsistencies(session)
+        logger.info(f"Initial inconsistencies:   {len(initial)}")
+
+        if not verify_only:
+            rebuilt = UserStatsService.rebuild_all(session)
+            logger.info(f"Users rebuilt:             {rebuilt}")
+
+        final = initial if verify_only else UserStatsService.find_inconsistencies(session)
+        logger.info(f"Final inconsistencies:     {len(final)}")
+        logger.info(f"Mode:                      {'VERIFY-ONLY' if verify_only else 'BACKFILL'}")
+
+        if final:
+            logger.warning(f"⚠️  {len(final)} inconsistencies remain!")
+            return False
+        logger.info("✓ Counters are fully consistent")
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill and repair per-user counters"
+    )
+    parser.add_argument(
+        "--verify-only",
+        action="store_true",
+        help="Only verify consistency without making changes"
+    )
+
+    args = parser.parse_args()
+
+    if backfill_counters(verify_only=args.verify_only):
+        logger.info("\n✓ User counters backfill successful!")
+        sys.exit(0)
+    else:
+        logger.error("\n✗ User counters backfill completed with warnings")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Backfill Venue rows and Show.venue_id for existing shows.
+
+Creates one Venue per distinct venue slug, links every show that has no
+venue_id yet, recomputes venue aggregates (show count, first/last date) and
+re-indexes venues for search. Safe to re-run.
+
+Run this AFTER applying the migration that adds the venue table.
+
+Usage:
+    python backfill_venues.py
+"""
+
+import sys
+import logging
+from sqlmodel import Session
+from database import engine, create_db_and_tables
+from services.setlist_ingest import backfill_venues
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    create_db_and_tables()
+
+    with Session(engine) as session:
+        logger.info("=" * 70)
+        logger.info("VENUE BACKFILL")
+        logger.info("=" * 70)
+
+        counts = backfill_venues(session)
+        session.commit()
+
+        unlinked = counts["shows_unlinked"]
+        logger.info(f"Venues:                    {counts['venues']}")
+        logger.info(f"Shows linked:              {counts['shows_linked']}")
+        logger.info(f"Shows still unlinked:      {unlinked}")
+
+    if unlinked:
+        logger.warning(f"⚠️  {unlinked} shows have no venue")
+        sys.exit(1)
+    logger.info("✓ Venue backfill successful!")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,13 @@ def create_db_and_tables():
     with engine.begin() as connection:
         ensure_vote_is_featured_column(connection)
 
+    from api.services.search_index import ensure_search_schema
+    from api.services.analytics_retention import ensure_analytics_partitions
+    with engine.begin() as connection:
+        ensure_search_schema(connection)
+    with engine.begin() as connection:
+        ensure_analytics_partitions(connection)
+
 def get_session():
     with Session(engine) as session:
         yield session
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Dump the public dataset (shows, songs, performances, vote aggregates, tags
+and honking versions) for offline analytics.
+
+Writes one gzipped NDJSON file per table, plus Parquet when pyarrow is
+installed, and a manifest.json recording row counts and watermarks.
+With --incremental only rows past the previous manifest's watermarks are
+written, to files suffixed with the dump time.
+
+Usage:
+    python dump_dataset.py dumps/                        # Full dump
+    python dump_dataset.py dumps/ --incremental          # Delta since last dump
+    python dump_dataset.py dumps/ --tables shows songs --format ndjson
+"""
+
+import sys
+import logging
+import argparse
+from database import create_db_and_tables
+from services.dataset_dump import DatasetDumpService, FORMATS, TABLES
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dump the public dataset as NDJSON/Parquet"
+    )
+    parser.add_argument("out_dir", help="Output directory")
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=list(TABLES),
+        help="Tables to dump (default: all)"
+    )
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        nargs="+",
+        choices=FORMATS,
+        default=list(FORMATS),
+        help="Output formats (default: all available)"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only dump rows past the watermarks in the previous manifest"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Tables dumped in parallel (default: 4)"
+    )
+
+    args = parser.parse_args()
+    create_db_and_tables()
+
+    logger.info("=" * 70)
+    logger.info("DATASET DUMP")
+    logger.info("=" * 70)
+
+    manifest = DatasetDumpService.dump(
+        args.out_dir,
+        tables=args.tables,
+        incremental=args.incremental,
+        formats=args.formats,
+        workers=args.workers,
+    )
+
+    for table, entry in manifest["tables"].items():
+        logger.info(f"{table + ':':<26} {entry['rows']} rows -> {', '.join(entry['files'])}")
+    logger.info(f"Mode:                      {'INCREMENTAL' if args.incremental else 'FULL'}")
+    logger.info("✓ Dataset dump complete!")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 from api.routes import (
@@ -47,13 +48,24 @@ from api.routes import (
     synopsis,
     analytics,
 )
-from api.database import create_db_and_tables
+from api.database import create_db_and_tables, engine
+from api.services.event_buffer import event_buffer
+from api.services.typeahead import typeahead
+from sqlmodel import Session
 
 # ... (previous code)
 
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
+    with Session(engine) as session:
+        typeahead.load(session)
+    event_buffer.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    event_buffer.stop()
 
 routers = [
     auth.router,
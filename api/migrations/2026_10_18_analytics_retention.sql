@@ -0,0 +1,11 @@
+-- Migration: Lighter AnalyticsEvent indexes for retention and rollups
+-- (see services/analytics_retention.py). Stats are served from rollups,
+-- so only the timestamp index is still read; the others just slow inserts.
+-- On Postgres, convert the table to monthly partitions with:
+--     python analytics_retention.py --partition
+
+DROP INDEX IF EXISTS ix_analyticsevent_event_type;
+DROP INDEX IF EXISTS ix_analyticsevent_path;
+DROP INDEX IF EXISTS ix_analyticsevent_session_id;
+DROP INDEX IF EXISTS ix_analyticsevent_user_id;
+CREATE INDEX IF NOT EXISTS ix_analyticsevent_timestamp ON analyticsevent (timestamp);
@@ -0,0 +1,21 @@
+-- Migration: Hourly and daily analytics rollups (see services/analytics_rollup.py)
+-- /analytics/stats reads these instead of counting raw AnalyticsEvent rows.
+-- analyticsrollupstate holds the id watermark of the last rolled-up event.
+-- Populate with: python rollup_analytics.py --rebuild
+
+CREATE TABLE IF NOT EXISTS analyticsrollup (
+    id INTEGER PRIMARY KEY,
+    granularity VARCHAR NOT NULL,
+    bucket_start DATETIME NOT NULL,
+    event_type VARCHAR NOT NULL,
+    path VARCHAR NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    unique_sessions INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT unique_analytics_rollup UNIQUE (granularity, bucket_start, event_type, path)
+);
+
+CREATE TABLE IF NOT EXISTS analyticsrollupstate (
+    name VARCHAR PRIMARY KEY,
+    last_event_id INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME
+);
@@ -0,0 +1,20 @@
+-- Migration: Materialized "following" timelines for /feed/following
+-- Written on vote creation and follow/unfollow by TimelineService
+
+CREATE TABLE IF NOT EXISTS timelineentry (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    vote_id INTEGER NOT NULL,
+    actor_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES user(id),
+    FOREIGN KEY (vote_id) REFERENCES vote(id),
+    FOREIGN KEY (actor_id) REFERENCES user(id),
+    CONSTRAINT unique_timeline_user_vote UNIQUE (user_id, vote_id)
+);
+-- One range scan per page: WHERE user_id = ? ORDER BY created_at DESC, vote_id DESC
+CREATE INDEX IF NOT EXISTS idx_timeline_user_created ON timelineentry (user_id, created_at, vote_id);
+CREATE INDEX IF NOT EXISTS ix_timelineentry_actor_id ON timelineentry (actor_id);
+
+-- Follow backfill and fan-out on read fetch recent votes per author
+CREATE INDEX IF NOT EXISTS ix_vote_user_id ON vote (user_id);
@@ -0,0 +1,8 @@
+-- Migration: Cover the honking breakdown with the song/vote-count index
+-- (see routes/honking_versions.py). GET /honking-versions/song/{song_id}
+-- reads the per-performance breakdown from SongPerformance.honking_vote_count;
+-- adding id lets PostgreSQL answer it with an index-only scan. On SQLite id
+-- is the rowid and already part of every index, so the rebuild is harmless.
+
+DROP INDEX IF EXISTS ix_songperformance_song_honking;
+CREATE INDEX IF NOT EXISTS ix_songperformance_song_honking ON songperformance (song_id, honking_vote_count, id);
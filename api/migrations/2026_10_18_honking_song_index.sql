@@ -0,0 +1,6 @@
+-- Migration: Index for re-ranking a song's performances by honking votes
+-- (see services/honking_cache.py). Honking votes are applied as deltas;
+-- when a song's leader loses a vote the new leader is read from this index
+-- instead of grouping every HonkingVersion row of the song.
+
+CREATE INDEX IF NOT EXISTS ix_songperformance_song_honking ON songperformance (song_id, honking_vote_count);
@@ -0,0 +1,21 @@
+-- Migration: Normalized list items (see services/list_items.py)
+-- UserList.items (JSON) stays the write format; ListItem mirrors it with one
+-- row per item so /lists/{id}/items can page by position and hydrate items
+-- in bulk. UserList.follower_count replaces a COUNT per list.
+-- Populate ListItem with backfill_list_items.py.
+
+CREATE TABLE IF NOT EXISTS listitem (
+    id INTEGER PRIMARY KEY,
+    list_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    item_type TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    label TEXT,
+    FOREIGN KEY (list_id) REFERENCES userlist(id),
+    CONSTRAINT unique_list_item_position UNIQUE (list_id, position)
+);
+
+ALTER TABLE userlist ADD COLUMN follower_count INTEGER NOT NULL DEFAULT 0;
+UPDATE userlist SET follower_count = (
+    SELECT COUNT(*) FROM listfollow WHERE listfollow.list_id = userlist.id
+);
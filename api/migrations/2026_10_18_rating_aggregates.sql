@@ -0,0 +1,12 @@
+-- Denormalized rating aggregates for performances and shows
+-- Maintained on write by RatingCacheService; backfill with backfill_rating_cache.py
+
+ALTER TABLE songperformance ADD COLUMN vote_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE songperformance ADD COLUMN rating_sum INTEGER NOT NULL DEFAULT 0;
+
+ALTER TABLE show ADD COLUMN vote_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE show ADD COLUMN rating_sum INTEGER NOT NULL DEFAULT 0;
+
+-- Supports per-performance / per-show recounts used by the verifier and rebuild
+CREATE INDEX idx_vote_performance_id ON vote(performance_id);
+CREATE INDEX idx_vote_show_id ON vote(show_id);
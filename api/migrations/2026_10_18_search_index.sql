@@ -0,0 +1,19 @@
+-- Migration: Search corpus for /search (see services/search_index.py)
+-- The full-text index itself is attached by ensure_search_schema() on
+-- startup: FTS5 + triggers on SQLite, tsvector + pg_trgm on Postgres.
+-- Populate with rebuild_search_index.py.
+
+CREATE TABLE IF NOT EXISTS searchdocument (
+    id INTEGER PRIMARY KEY,
+    doc_type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    object_id INTEGER,
+    title TEXT NOT NULL,
+    subtitle TEXT,
+    url TEXT NOT NULL,
+    body TEXT NOT NULL DEFAULT '',
+    popularity FLOAT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT unique_search_document UNIQUE (doc_type, key)
+);
+CREATE INDEX IF NOT EXISTS ix_searchdocument_doc_type ON searchdocument (doc_type);
@@ -0,0 +1,15 @@
+-- Migration: Denormalized per-user counters (see services/user_stats.py)
+-- Profile and user endpoints read one row by primary key instead of
+-- counting votes, follows, attendance and lists on every request.
+-- Populate with backfill_user_stats.py; rows missing afterwards are
+-- created from a recount on first read.
+
+CREATE TABLE IF NOT EXISTS usercounters (
+    user_id INTEGER PRIMARY KEY,
+    votes_count INTEGER NOT NULL DEFAULT 0,
+    followers_count INTEGER NOT NULL DEFAULT 0,
+    following_count INTEGER NOT NULL DEFAULT 0,
+    shows_attended INTEGER NOT NULL DEFAULT 0,
+    lists_count INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES user(id)
+);
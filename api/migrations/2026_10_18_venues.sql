@@ -0,0 +1,19 @@
+-- Migration: Normalized venues (see services/setlist_ingest.py)
+-- Venue pages look venues up by slug instead of slugifying every show.
+-- Show.venue is kept for display; Show.venue_id links to the Venue row.
+-- Populate with backfill_venues.py; new shows are linked on ingest.
+
+CREATE TABLE IF NOT EXISTS venue (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    city TEXT,
+    state TEXT,
+    show_count INTEGER NOT NULL DEFAULT 0,
+    first_show_date TEXT,
+    last_show_date TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_venue_slug ON venue (slug);
+
+ALTER TABLE show ADD COLUMN venue_id INTEGER REFERENCES venue(id);
+CREATE INDEX IF NOT EXISTS ix_show_venue_id ON show (venue_id);
@@ -0,0 +1,5 @@
+-- Keyset pagination for /feed/community
+-- The feed orders by (created_at DESC, id DESC) and seeks past the last row
+-- of the previous page, so one index range scan serves every page depth.
+
+CREATE INDEX idx_vote_created_at_id ON vote(created_at, id);
@@ -0,0 +1,6 @@
+-- Migration: Track when a vote was last re-rated
+-- Vote.updated_at is the watermark of the vote_aggregates table in incremental
+-- dataset dumps (see services/dataset_dump.py); existing votes start at created_at.
+
+ALTER TABLE vote ADD COLUMN updated_at TIMESTAMP;
+UPDATE vote SET updated_at = created_at WHERE updated_at IS NULL;
@@ -1,6 +1,7 @@
 from typing import Optional, List
 from enum import Enum
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship, UniqueConstraint
 
 class User(SQLModel, table=True):
@@ -48,15 +49,32 @@ class User(SQLModel, table=True):
         sa_relationship_kwargs={"foreign_keys": "ListFollow.user_id"}
     )
 
+class Venue(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    slug: str = Field(unique=True, index=True)
+    city: Optional[str] = None
+    state: Optional[str] = None
+
+    # Aggregates maintained on show ingest (see setlist_ingest.refresh_venues)
+    show_count: int = Field(default=0)
+    first_show_date: Optional[str] = None
+    last_show_date: Optional[str] = None
+
 class Show(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     elgoose_id: int = Field(unique=True, index=True)
     date: str = Field(index=True) # YYYY-MM-DD
     venue: str
+    venue_id: Optional[int] = Field(default=None, foreign_key="venue.id", index=True)
     location: str
     tour: Optional[str] = Field(default=None, index=True)
     setlist_data: str # JSON string
 
+    # Rating aggregates denormalized cache (see RatingCacheService)
+    vote_count: int = Field(default=0)
+    rating_sum: int = Field(default=0)
+
     # External links
     bandcamp_url: Optional[str] = None
     nugs_url: Optional[str] = None
@@ -117,6 +135,10 @@ class SongPerformance(SQLModel, table=True):
     honking_vote_count: int = Field(default=0, index=True)
     honking_votes_updated_at: Optional[datetime] = None
 
+    # Rating aggregates denormalized cache (see RatingCacheService)
+    vote_count: int = Field(default=0)
+    rating_sum: int = Field(default=0)
+
     # External links
     bandcamp_url: Optional[str] = None
     nugs_url: Optional[str] = None
@@ -132,6 +154,11 @@ class SongPerformance(SQLModel, table=True):
     honking_votes: List["HonkingVersion"] = Relationship(back_populates="performance")
     performance_tags: List["PerformanceTag"] = Relationship(back_populates="performance")
 
+    __table_args__ = (
+        # Re-ranking a song's performances and the honking breakdown, index-only (id included)
+        Index("ix_songperformance_song_honking", "song_id", "honking_vote_count", "id"),
+    )
+
 class UserFollow(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     follower_id: int = Field(foreign_key="user.id", index=True)
@@ -140,7 +167,7 @@ class UserFollow(SQLModel, table=True):
 
 class Vote(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="user.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
     show_id: Optional[int] = Field(default=None, foreign_key="show.id")
     performance_id: Optional[int] = Field(default=None, foreign_key="songperformance.id")
     rating: int # 1-10
@@ -149,12 +176,38 @@ class Vote(SQLModel, table=True):
     full_review: Optional[str] = None # Detailed review
     is_featured: bool = Field(default=False) # User can feature up to 5 songs and 5 shows
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow) # Bumped on re-rating; dataset dump watermark
     
     user: User = Relationship(back_populates="votes")
     show: Optional["Show"] = Relationship(back_populates="votes")
     performance: Optional[SongPerformance] = Relationship(back_populates="votes")
     comments: List["ReviewComment"] = Relationship(back_populates="vote")
 
+    __table_args__ = (
+        # Keyset pagination of the community feed on (created_at, id)
+        Index("idx_vote_created_at_id", "created_at", "id"),
+        # Per-performance / per-show rating recounts
+        Index("idx_vote_performance_id", "performance_id"),
+        Index("idx_vote_show_id", "show_id"),
+    )
+
+class TimelineEntry(SQLModel, table=True):
+    """
+    Materialized "following" feed: one row per (reader, vote) written when a
+    followed user reviews (see TimelineService). created_at copies the vote's
+    timestamp so a page is a single range scan of the reader's index.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")  # reader
+    vote_id: int = Field(foreign_key="vote.id")
+    actor_id: int = Field(foreign_key="user.id", index=True)  # author of the vote
+    created_at: datetime
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "vote_id", name="unique_timeline_user_vote"),
+        Index("idx_timeline_user_created", "user_id", "created_at", "vote_id"),
+    )
+
 class HonkingVersion(SQLModel, table=True):
     """
     User's vote for the definitive/best version of a song.
@@ -188,10 +241,24 @@ class UserList(SQLModel, table=True):
     share_token: Optional[str] = Field(default=None, index=True, unique=True)
     is_public: bool = Field(default=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    follower_count: int = Field(default=0)  # Denormalized ListFollow count
     
     user: User = Relationship(back_populates="lists")
     followers: List["ListFollow"] = Relationship(back_populates="list")
 
+class ListItem(SQLModel, table=True):
+    # Normalized UserList.items, kept in sync by ListItemService
+    id: Optional[int] = Field(default=None, primary_key=True)
+    list_id: int = Field(foreign_key="userlist.id")
+    position: int  # 0-based, contiguous within a list
+    item_type: str  # performance, show, song
+    item_id: int
+    label: Optional[str] = None
+
+    __table_args__ = (
+        UniqueConstraint("list_id", "position", name="unique_list_item_position"),
+    )
+
 class ListFollow(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id", index=True)
@@ -275,6 +342,16 @@ class UserStats(SQLModel):
     reviews_count: int = 0
     followers_count: int = 0
     following_count: int = 0
+    lists_count: int = 0
+
+class UserCounters(SQLModel, table=True):
+    # Denormalized per-user counters (see UserStatsService)
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    votes_count: int = Field(default=0)
+    followers_count: int = Field(default=0)
+    following_count: int = Field(default=0)
+    shows_attended: int = Field(default=0)
+    lists_count: int = Field(default=0)
 
 class UserRead(SQLModel):
     id: int
@@ -381,15 +458,58 @@ class SynopsisHistory(SQLModel, table=True):
     synopsis: Synopsis = Relationship()
     edited_by: User = Relationship()
 
+class SearchDocument(SQLModel, table=True):
+    """
+    Denormalized search corpus, one row per searchable object (see
+    SearchIndexService). Full-text indexes are attached per database:
+    FTS5 on SQLite, tsvector + pg_trgm on Postgres.
+    """
+    id: Optional[int] = Field(default=None, primary_key=True)
+    doc_type: str = Field(index=True)  # song, show, venue, user, review, synopsis
+    key: str  # natural key within doc_type (id, or slug for venues)
+    object_id: Optional[int] = None
+    title: str
+    subtitle: Optional[str] = None
+    url: str
+    body: str = Field(default="")  # extra searchable text (reviews, synopses, locations)
+    popularity: float = Field(default=0)  # plays / votes, used to boost ranking
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("doc_type", "key", name="unique_search_document"),
+    )
+
 class AnalyticsEvent(SQLModel, table=True):
+    # Write-heavy: only the timestamp is indexed (rollups and retention scan by time).
+    # Range-partitioned by month on Postgres, see AnalyticsRetentionService
     id: Optional[int] = Field(default=None, primary_key=True)
-    event_type: str = Field(index=True) # page_view, click, vote, etc.
-    path: str = Field(index=True)
+    event_type: str # page_view, click, vote, etc.
+    path: str
     metadata_json: Optional[str] = None # JSON string for extra data
-    session_id: str = Field(index=True) # Anonymous session ID
-    user_id: Optional[int] = Field(default=None, foreign_key="user.id", index=True)
+    session_id: str # Anonymous session ID
+    user_id: Optional[int] = Field(default=None, foreign_key="user.id")
     timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
 
     user: Optional[User] = Relationship()
 
+class AnalyticsRollup(SQLModel, table=True):
+    # Hourly and daily AnalyticsEvent aggregates (see AnalyticsRollupService)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    granularity: str  # hour, day
+    bucket_start: datetime
+    event_type: str
+    path: str
+    count: int = Field(default=0)
+    unique_sessions: int = Field(default=0)  # distinct session_ids within the bucket
+
+    __table_args__ = (
+        UniqueConstraint("granularity", "bucket_start", "event_type", "path", name="unique_analytics_rollup"),
+    )
+
+class AnalyticsRollupState(SQLModel, table=True):
+    # Watermark: events with id <= last_event_id are reflected in AnalyticsRollup
+    name: str = Field(primary_key=True)
+    last_event_id: int = Field(default=0)
+    updated_at: Optional[datetime] = None
+
 SQLModel.update_forward_refs()
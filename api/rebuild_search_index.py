@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Rebuild the search index from scratch.
+
+Creates the full-text index objects if needed (FTS5 on SQLite, tsvector and
+pg_trgm on Postgres), then re-indexes every song, show, venue, user, review
+and synopsis. Writes keep the index current afterwards; run this after the
+migration, after bulk imports that bypass the app, or to refresh popularity.
+
+Usage:
+    python rebuild_search_index.py
+"""
+
+import sys
+import logging
+from sqlmodel import Session
+from database import engine, create_db_and_tables
+from services.search_index import SearchIndexService
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    create_db_and_tables()
+
+    with Session(engine) as session:
+        logger.info("=" * 70)
+        logger.info("SEARCH INDEX REBUILD")
+        logger.info("=" * 70)
+
+        counts = SearchIndexService.rebuild(session)
+        for doc_type, count in counts.items():
+            logger.info(f"{doc_type + ':':<26}{count}")
+
+    logger.info("✓ Search index rebuilt")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
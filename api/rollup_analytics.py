@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Roll up analytics events into hourly and daily buckets.
+
+Only events added since the previous run are processed, so this is cheap
+to run from cron (e.g. every 5 minutes). /analytics/stats also triggers a
+run in the background when the rollups are stale.
+
+Usage:
+    python rollup_analytics.py              # Incremental run
+    python rollup_analytics.py --rebuild    # Recompute every rollup from raw events
+"""
+
+import sys
+import logging
+import argparse
+from sqlmodel import Session
+from database import engine, create_db_and_tables
+from services.analytics_rollup import AnalyticsRollupService
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Roll up analytics events into hourly and daily buckets"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Drop all rollups and recompute them from raw events"
+    )
+
+    args = parser.parse_args()
+    create_db_and_tables()
+
+    with Session(engine) as session:
+        logger.info("=" * 70)
+        logger.info("ANALYTICS ROLLUP")
+        logger.info("=" * 70)
+
+        if args.rebuild:
+            result = AnalyticsRollupService.rebuild_all(session)
+        else:
+            result = AnalyticsRollupService.run(session)
+
+        logger.info(f"New events:                {result['events']}")
+        logger.info(f"Rollup rows written:       {result['rollups']}")
+        logger.info(f"Watermark (event id):      {result['last_event_id']}")
+        logger.info(f"Mode:                      {'REBUILD' if args.rebuild else 'INCREMENTAL'}")
+
+    logger.info("✓ Analytics rollup complete!")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlmodel import Session, select, func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlmodel import Session
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import json
 
 from api.database import get_session
-from api.models import AnalyticsEvent, User
-from api.routes.auth import get_current_user_optional
+from api.models import User
+from api.routes.auth import get_admin_user, get_current_user_optional
+from api.services.analytics_rollup import AnalyticsRollupService
+from api.services.event_buffer import event_buffer
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+PERIODS = {"24h": timedelta(hours=24), "7d": timedelta(days=7), "30d": timedelta(days=30)}
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 class EventCreate(BaseModel):
     event_type: str
     path: str
@@ -20,74 +30,67 @@ class EventCreate(BaseModel):
 @router.post("/event")
 async def track_event(
     event: EventCreate,
-    background_tasks: BackgroundTasks,
     current_user: Optional[User] = Depends(get_current_user_optional),
-    session: Session = Depends(get_session)
 ):
     """
     Track a user event.
+    Events are buffered and written in batches (see services.event_buffer);
+    when the buffer is full the event is dropped and clients are asked to back off.
     """
-    # Use background task to avoid blocking the response
-    background_tasks.add_task(
-        save_event, 
-        event, 
-        current_user.id if current_user else None, 
-        session
+    accepted = event_buffer.add(
+        event_type=event.event_type,
+        path=event.path,
+        session_id=event.session_id,
+        user_id=current_user.id if current_user else None,
+        metadata_json=json.dumps(event.metadata) if event.metadata else None,
     )
+    if not accepted:
+        return JSONResponse(status_code=503, content={"status": "dropped"}, headers={"Retry-After": "5"})
     return {"status": "ok"}
 
-def save_event(event: EventCreate, user_id: Optional[int], session: Session):
+
+@router.get("/buffer")
+async def get_buffer_stats(admin_user: User = Depends(get_admin_user)):
     """
-    Save event to database.
+    Event buffer counters: accepted, dropped, written, failed, batches, buffered (admin only).
     """
-    db_event = AnalyticsEvent(
-        event_type=event.event_type,
-        path=event.path,
-        metadata_json=json.dumps(event.metadata) if event.metadata else None,
-        session_id=event.session_id,
-        user_id=user_id
-    )
-    session.add(db_event)
-    session.commit()
+    return event_buffer.stats()
 
 @router.get("/stats")
-async def get_stats(
+def get_stats(
+    background_tasks: BackgroundTasks,
     period: str = "24h",
+    start: Optional[datetime] = Query(default=None, description="Range start (UTC); overrides period"),
+    end: Optional[datetime] = Query(default=None, description="Range end (UTC), default now"),
     session: Session = Depends(get_session)
 ):
     """
     Get basic analytics stats.
+    Served from hourly/daily rollups (see services.analytics_rollup), at hour resolution.
+    ``session_buckets`` counts a session once per rollup bucket it was active in,
+    not once per range.
     """
     now = datetime.utcnow()
-    if period == "24h":
-        start_time = now - timedelta(hours=24)
-    elif period == "7d":
-        start_time = now - timedelta(days=7)
-    elif period == "30d":
-        start_time = now - timedelta(days=30)
+    start, end = _naive_utc(start), _naive_utc(end)
+    if start is None:
+        start = now - PERIODS.get(period, PERIODS["24h"])
     else:
-        start_time = now - timedelta(hours=24)
+        period = "custom"
+    end = end or now
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
 
-    # Total page views
-    query = select(func.count(AnalyticsEvent.id)).where(
-        AnalyticsEvent.event_type == "page_view",
-        AnalyticsEvent.timestamp >= start_time
-    )
-    page_views = session.exec(query).one()
+    if AnalyticsRollupService.is_stale(session):
+        background_tasks.add_task(AnalyticsRollupService.run_in_background)
 
-    # Top pages
-    top_pages_query = select(
-        AnalyticsEvent.path, 
-        func.count(AnalyticsEvent.id).label("count")
-    ).where(
-        AnalyticsEvent.event_type == "page_view",
-        AnalyticsEvent.timestamp >= start_time
-    ).group_by(AnalyticsEvent.path).order_by(func.count(AnalyticsEvent.id).desc()).limit(10)
-    
-    top_pages = session.exec(top_pages_query).all()
+    page_views, session_buckets, top_pages, as_of = AnalyticsRollupService.stats(session, start, end)
 
     return {
         "period": period,
+        "start": start,
+        "end": end,
         "page_views": page_views,
-        "top_pages": [{"path": path, "count": count} for path, count in top_pages]
+        "session_buckets": session_buckets,
+        "top_pages": [{"path": path, "count": count} for path, count in top_pages],
+        "as_of": as_of,
     }
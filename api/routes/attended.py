@@ -7,6 +7,7 @@ from datetime import datetime
 from api.database import get_session
 from api.models import User, Show, UserShowAttendance
 from api.routes.auth import get_current_user
+from api.services.user_stats import UserStatsService
 
 router = APIRouter(prefix="/attended", tags=["attended"])
 
@@ -34,6 +35,7 @@ def mark_attended(
         
     attendance = UserShowAttendance(user_id=current_user.id, show_id=show_id)
     session.add(attendance)
+    UserStatsService.increment(session, current_user.id, shows_attended=1)
     session.commit()
     return {"message": "Marked as attended"}
 
@@ -48,6 +50,7 @@ def unmark_attended(
         raise HTTPException(status_code=404, detail="Attendance record not found")
         
     session.delete(attendance)
+    UserStatsService.increment(session, current_user.id, shows_attended=-1)
     session.commit()
     return {"message": "Unmarked as attended"}
 
@@ -8,6 +8,9 @@ from jose import JWTError, jwt
 
 from api.database import get_session
 from api.models import User
+from api.services.search_index import SearchIndexService
+from api.services.user_stats import UserStatsService
+from api.services.typeahead import typeahead
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -118,8 +121,12 @@ def register(user_data: UserRegister, session: Session = Depends(get_session)):
         created_at=datetime.utcnow()
     )
     session.add(new_user)
+    session.flush()
+    UserStatsService.create(session, new_user.id)
+    SearchIndexService.index_users(session, [new_user.id])
     session.commit()
     session.refresh(new_user)
+    typeahead.add_users(session, [new_user.id])
     return {"message": "User registered successfully", "username": new_user.username}
 
 @router.post("/token")
@@ -8,6 +8,7 @@ from sqlmodel import Session, select, func
 from api.database import get_session
 from api.models import CommentVote, ReviewComment, User, Vote
 from api.routes.auth import get_current_user
+from api.routes.stats import invalidate_stats_cache
 from api.services.notifications import create_notification
 
 router = APIRouter(prefix="/comments", tags=["comments"])
@@ -60,6 +61,7 @@ def add_comment(
     )
     session.add(comment)
     session.commit()
+    invalidate_stats_cache()
     session.refresh(comment)
 
     # Notify vote owner about a new comment
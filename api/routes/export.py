@@ -1,121 +1,180 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
+from typing import Iterator, List
+from api import database
 from api.database import get_session
-from api.models import User, Vote, Show, SongPerformance, Song, UserShowAttendance, UserFollow, UserList
-from api.routes.auth import get_current_user, get_current_user_optional
+from api.models import User, Vote, Show, SongPerformance, Song, UserShowAttendance, UserFollow, UserList, ListItem
+from api.routes.auth import get_admin_user, get_current_user, get_current_user_optional
+from api.services.dataset_dump import TABLES, iter_batches, json_default
+from datetime import datetime
 import csv
 import io
 import json
 
 router = APIRouter(prefix="/export", tags=["export"])
 
-def generate_user_csv(user_id: int, session: Session) -> io.BytesIO:
-    """Collect user data and write to CSV in memory.
+# Rows fetched per round trip; on Postgres results stream from a server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+
+def _stream(session: Session, statement):
+    """Iterate a query's rows in batches instead of loading them all."""
+    return session.exec(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+
+def _profile(session: Session, user_id: int) -> Iterator[dict]:
+    user = session.get(User, user_id)
+    if user:
+        yield {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+        }
+
+
+def _votes(session: Session, user_id: int) -> Iterator[dict]:
+    votes = (
+        select(Song.name, Song.artist, SongPerformance.id, Show.date, Vote.rating, Vote.created_at)
+        .join(SongPerformance, SongPerformance.id == Vote.performance_id)
+        .join(Song, Song.id == SongPerformance.song_id)
+        .join(Show, Show.id == SongPerformance.show_id)
+        .where(Vote.user_id == user_id)
+        .order_by(Vote.id)
+    )
+    for song_name, artist, performance_id, show_date, rating, created_at in _stream(session, votes):
+        yield {
+            "song_name": song_name,
+            "artist": artist,
+            "performance_link": f"/performances/{performance_id}",
+            "show_date": show_date,
+            "rating": rating,
+            "voted_at": created_at.isoformat() if created_at else "",
+        }
+
+
+def _attended_shows(session: Session, user_id: int) -> Iterator[dict]:
+    attended = (
+        select(Show.date, Show.venue, Show.location)
+        .join(UserShowAttendance, UserShowAttendance.show_id == Show.id)
+        .where(UserShowAttendance.user_id == user_id)
+        .order_by(Show.date)
+    )
+    for date, venue, location in _stream(session, attended):
+        yield {"date": date, "venue": venue, "location": location}
+
+
+def _following(session: Session, user_id: int) -> Iterator[dict]:
+    following = (
+        select(User.username, UserFollow.created_at)
+        .join(UserFollow, UserFollow.followed_id == User.id)
+        .where(UserFollow.follower_id == user_id)
+        .order_by(UserFollow.id)
+    )
+    for username, followed_at in _stream(session, following):
+        yield {"username": username, "followed_at": followed_at.isoformat() if followed_at else ""}
+
+
+def _lists(session: Session, user_id: int) -> Iterator[dict]:
+    item_counts = (
+        select(ListItem.list_id, func.count(ListItem.id).label("item_count"))
+        .group_by(ListItem.list_id)
+        .subquery()
+    )
+    lists = (
+        select(UserList.title, UserList.description, UserList.list_type, item_counts.c.item_count)
+        .outerjoin(item_counts, item_counts.c.list_id == UserList.id)
+        .where(UserList.user_id == user_id)
+        .order_by(UserList.id)
+    )
+    for title, description, list_type, item_count in _stream(session, lists):
+        yield {
+            "title": title,
+            "description": description or "",
+            "type": list_type or "",
+            "item_count": item_count or 0,
+        }
+
+
+# (record type, CSV section title, CSV columns, rows); one joined query per section
+USER_SECTIONS = [
+    ("vote", "VOTING HISTORY", ["song_name", "artist", "performance_link", "rating", "voted_at"], _votes),
+    ("attended_show", "ATTENDED SHOWS", ["date", "venue", "location"], _attended_shows),
+    ("following", "FOLLOWING", ["username", "followed_at"], _following),
+    ("list", "LISTS", ["title", "description", "type", "item_count"], _lists),
+]
+
+
+def _csv_line(row: List) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+def generate_user_csv(user_id: int) -> Iterator[str]:
+    """Stream a user's data as CSV, one line at a time.
     Includes votes, attended shows, lists, follows, and basic profile info.
+    Opens its own session: request-scoped sessions are closed before the body is sent.
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
-    # Header
-    writer.writerow(["section", "field", "value"])
-    # User profile
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    writer.writerow(["profile", "id", user.id])
-    writer.writerow(["profile", "username", user.username])
-    writer.writerow(["profile", "email", user.email])
-    writer.writerow(["profile", "created_at", user.created_at.isoformat()])
-
-    # Voting History - detailed
-    writer.writerow([""])
-    writer.writerow(["VOTING HISTORY"])
-    writer.writerow(["song_name", "artist", "performance_link", "rating", "voted_at"])
-
-    votes = session.exec(select(Vote).where(Vote.user_id == user_id)).all()
-    for v in votes:
-        if v.performance_id:
-            perf = session.get(SongPerformance, v.performance_id)
-            song = None
-            if perf:
-                song = session.get(Song, perf.song_id)
-            if song and perf:
-                writer.writerow([
-                    song.name,
-                    song.artist,
-                    perf.link or "",
-                    v.rating,
-                    v.created_at.isoformat() if v.created_at else ""
-                ])
-
-    # Attended shows
-    writer.writerow([""])
-    writer.writerow(["ATTENDED SHOWS"])
-    writer.writerow(["date", "venue", "location"])
-
-    attended = session.exec(select(UserShowAttendance).where(UserShowAttendance.user_id == user_id)).all()
-    for attendance in attended:
-        show = session.get(Show, attendance.show_id)
-        if show:
-            writer.writerow([
-                show.date,
-                show.venue,
-                show.location
-            ])
-
-    # Follows (users this user is following)
-    writer.writerow([""])
-    writer.writerow(["FOLLOWING"])
-    writer.writerow(["username", "followed_at"])
-
-    following = session.exec(select(UserFollow).where(UserFollow.follower_id == user_id)).all()
-    for follow in following:
-        followed = session.get(User, follow.followed_id)
-        if followed:
-            writer.writerow([
-                followed.username,
-                follow.created_at.isoformat() if follow.created_at else ""
-            ])
-
-    # Lists
-    writer.writerow([""])
-    writer.writerow(["LISTS"])
-    writer.writerow(["title", "description", "type", "item_count"])
-
-    lists = session.exec(select(UserList).where(UserList.user_id == user_id)).all()
-    for user_list in lists:
-        try:
-            items = json.loads(user_list.items or "[]")
-            item_count = len(items)
-        except json.JSONDecodeError:
-            item_count = 0
+    with Session(database.engine) as session:
+        yield _csv_line(["section", "field", "value"])
+        for profile in _profile(session, user_id):
+            for field, value in profile.items():
+                yield _csv_line(["profile", field, value])
+
+        for _, title, columns, rows in USER_SECTIONS:
+            yield _csv_line([""])
+            yield _csv_line([title])
+            yield _csv_line(columns)
+            for row in rows(session, user_id):
+                yield _csv_line([row[column] for column in columns])
+
+
+def generate_user_jsonl(user_id: int) -> Iterator[str]:
+    """Stream a user's data as JSON Lines ({"type": ..., ...fields}), in its own session."""
+    with Session(database.engine) as session:
+        for profile in _profile(session, user_id):
+            yield json.dumps({"type": "profile", **profile}) + "\n"
+        for record_type, _, _, rows in USER_SECTIONS:
+            for row in rows(session, user_id):
+                yield json.dumps({"type": record_type, **row}) + "\n"
 
-        writer.writerow([
-            user_list.title,
-            user_list.description or "",
-            user_list.list_type or "",
-            item_count
-        ])
-
-    return io.BytesIO(output.getvalue().encode("utf-8"))
 
 @router.get("/me/csv", response_class=StreamingResponse)
-async def export_user_data(
-    session: Session = Depends(get_session),
+def export_user_data(
     user: User = Depends(get_current_user),
 ):
     """Export the authenticated user's data as a CSV file.
     The `user` dependency should be provided by authentication middleware.
     """
-    csv_bytes = generate_user_csv(user.id, session)
     headers = {
         "Content-Disposition": f"attachment; filename=user_{user.id}_data.csv"
     }
-    return StreamingResponse(csv_bytes, media_type="text/csv", headers=headers)
+    return StreamingResponse(generate_user_csv(user.id), media_type="text/csv", headers=headers)
+
+
+@router.get("/me/jsonl", response_class=StreamingResponse)
+def export_user_data_jsonl(
+    user: User = Depends(get_current_user),
+):
+    """Export the authenticated user's data as JSON Lines, one record per line."""
+    headers = {
+        "Content-Disposition": f"attachment; filename=user_{user.id}_data.jsonl"
+    }
+    return StreamingResponse(generate_user_jsonl(user.id), media_type="application/x-ndjson", headers=headers)
+
+
+def generate_list_csv(list_id: int, title: str, list_type: str) -> Iterator[str]:
+    with Session(database.engine) as session:
+        yield _csv_line(["list_id", "title", "list_type", "item_id"])
+        items = select(ListItem.item_id).where(ListItem.list_id == list_id).order_by(ListItem.position)
+        for item_id in _stream(session, items):
+            yield _csv_line([list_id, title, list_type, item_id])
 
 
 @router.get("/list/{list_id}", response_class=StreamingResponse)
-async def export_list(
+def export_list(
     list_id: int,
     token: str | None = Query(default=None),
     session: Session = Depends(get_session),
@@ -131,19 +190,40 @@ async def export_list(
     if not (is_owner or token_ok or user_list.is_public):
         raise HTTPException(status_code=403, detail="Not authorized to export this list")
 
-    items = []
-    try:
-        items = json.loads(user_list.items or "[]")
-    except json.JSONDecodeError:
-        items = []
+    headers = {
+        "Content-Disposition": f"attachment; filename=list_{user_list.id}.csv"
+    }
+    return StreamingResponse(
+        generate_list_csv(user_list.id, user_list.title, user_list.list_type),
+        media_type="text/csv",
+        headers=headers,
+    )
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["list_id", "title", "list_type", "item_id"])
-    for item_id in items:
-        writer.writerow([user_list.id, user_list.title, user_list.list_type, item_id])
 
+def generate_dataset_jsonl(table: str, since) -> Iterator[str]:
+    with Session(database.engine) as session:
+        for batch in iter_batches(session, table, since):
+            yield "".join(json.dumps(row, default=json_default) + "\n" for row in batch)
+
+
+@router.get("/dataset/{table}", response_class=StreamingResponse)
+def export_dataset_table(
+    table: str,
+    since: str | None = Query(default=None, description="Watermark from a previous dump"),
+    admin_user: User = Depends(get_admin_user),
+):
+    """Stream one dataset dump table as JSON Lines (admin only).
+    For full dumps to disk, including Parquet, use dump_dataset.py.
+    """
+    if table not in TABLES:
+        raise HTTPException(status_code=404, detail="Unknown dataset table")
+    watermark = since
+    if since is not None:
+        try:
+            watermark = int(since) if TABLES[table][1] == "id" else datetime.fromisoformat(since).isoformat()
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid watermark for this table")
     headers = {
-        "Content-Disposition": f"attachment; filename=list_{user_list.id}.csv"
+        "Content-Disposition": f"attachment; filename={table}.jsonl"
     }
-    return StreamingResponse(io.BytesIO(output.getvalue().encode("utf-8")), media_type="text/csv", headers=headers)
+    return StreamingResponse(generate_dataset_jsonl(table, watermark), media_type="application/x-ndjson", headers=headers)
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import Session, select, or_, and_
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 
 from api.database import get_session
-from api.models import Vote, SongPerformance, PerformanceTag, ShowTag, Tag, Show, User
-from api.routes.auth import get_current_user_optional
+from api.models import Vote, SongPerformance, Song, Show, User
+from api.routes.auth import get_current_user, get_current_user_optional
+from api.services.pagination import decode_cursor, encode_cursor, set_next_cursor
+from api.services.timeline import TimelineService
 
 router = APIRouter(prefix="/feed", tags=["feed"])
 
@@ -45,6 +47,18 @@ class FeedItem(BaseModel):
     show: Optional[FeedShow] = None
 
 
+# Exactly the relationships and columns serialize_vote reads
+FEED_LOAD_OPTIONS = (
+    selectinload(Vote.user).load_only(User.id, User.username),
+    selectinload(Vote.performance).options(
+        load_only(SongPerformance.id, SongPerformance.song_id, SongPerformance.show_id),
+        selectinload(SongPerformance.song).load_only(Song.id, Song.name, Song.slug),
+        selectinload(SongPerformance.show).load_only(Show.id, Show.date, Show.venue, Show.location),
+    ),
+    selectinload(Vote.show).load_only(Show.id, Show.date, Show.venue, Show.location),
+)
+
+
 def serialize_vote(vote: Vote) -> FeedItem:
     performance = None
     if vote.performance:
@@ -79,26 +93,81 @@ def serialize_vote(vote: Vote) -> FeedItem:
     )
 
 
+def _decode_feed_cursor(cursor: str):
+    """Decode a (created_at, id) feed cursor."""
+    last_created_at, last_id = decode_cursor(cursor, 2)
+    try:
+        return datetime.fromisoformat(last_created_at), int(last_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/community", response_model=List[FeedItem])
 def community_feed(
-    limit: int = 20,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
     offset: int = 0,
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
-    """Recent activity across all users."""
-    votes = session.exec(
+    """
+    Recent activity across all users.
+
+    Pass the ``X-Next-Cursor`` header of a page as ``cursor`` to fetch the
+    next one; ``offset`` is kept for older clients.
+    """
+    statement = (
         select(Vote)
-        .options(
-            selectinload(Vote.user),
-            selectinload(Vote.performance).selectinload(SongPerformance.song),
-            selectinload(Vote.performance).selectinload(SongPerformance.show),
-            selectinload(Vote.performance).selectinload(SongPerformance.performance_tags).selectinload(PerformanceTag.tag),
-            selectinload(Vote.show).selectinload(Show.show_tags).selectinload(ShowTag.tag),
+        .options(*FEED_LOAD_OPTIONS)
+        .order_by(Vote.created_at.desc(), Vote.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        last_created_at, last_id = _decode_feed_cursor(cursor)
+        statement = statement.where(
+            or_(
+                Vote.created_at < last_created_at,
+                and_(Vote.created_at == last_created_at, Vote.id < last_id),
+            )
         )
-        .order_by(Vote.created_at.desc())
-        .limit(limit)
-        .offset(offset)
-    ).all()
+    elif offset:
+        statement = statement.offset(offset)
 
-    return [serialize_vote(v) for v in votes]
+    votes = session.exec(statement).all()
+    page = votes[:limit]
+    if len(votes) > limit:
+        set_next_cursor(response, encode_cursor(page[-1].created_at.isoformat(), page[-1].id))
+
+    return [serialize_vote(v) for v in page]
+
+
+@router.get("/following", response_model=List[FeedItem])
+def following_feed(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Recent reviews by users the current user follows, newest first.
+
+    Reads the materialized timeline (see TimelineService); paginate with the
+    ``X-Next-Cursor`` header.
+    """
+    after = _decode_feed_cursor(cursor) if cursor else None
+    keys = TimelineService.page(session, current_user.id, limit, after)
+    page = keys[:limit]
+    if len(keys) > limit:
+        last_created_at, last_id = page[-1]
+        set_next_cursor(response, encode_cursor(last_created_at.isoformat(), last_id))
+
+    vote_ids = [vote_id for _, vote_id in page]
+    if not vote_ids:
+        return []
+    votes = {
+        vote.id: vote
+        for vote in session.exec(select(Vote).options(*FEED_LOAD_OPTIONS).where(Vote.id.in_(vote_ids))).all()
+    }
+    return [serialize_vote(votes[vote_id]) for vote_id in vote_ids if vote_id in votes]
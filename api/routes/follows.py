@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlmodel import Session, select, func
 from typing import List
 from pydantic import BaseModel
@@ -7,7 +7,10 @@ from datetime import datetime
 from api.database import get_session
 from api.models import User, UserFollow, UserRead
 from api.routes.auth import get_current_user
+from api.routes.stats import invalidate_stats_cache
 from api.services.notifications import create_notification
+from api.services.timeline import TimelineService, backfill_followers_in_background
+from api.services.user_stats import UserStatsService
 
 router = APIRouter(prefix="/follows", tags=["follows"])
 
@@ -49,7 +52,10 @@ def follow_user(
         created_at=datetime.utcnow()
     )
     session.add(follow)
+    UserStatsService.on_follow(session, current_user.id, target_user.id)
+    TimelineService.on_follow(session, current_user.id, target_user.id)
     session.commit()
+    invalidate_stats_cache()
 
     create_notification(
         session,
@@ -64,6 +70,7 @@ def follow_user(
 @router.delete("/{username}")
 def unfollow_user(
     username: str,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -84,7 +91,11 @@ def unfollow_user(
         raise HTTPException(status_code=404, detail="Not following this user")
     
     session.delete(follow)
+    UserStatsService.on_follow(session, current_user.id, target_user.id, delta=-1)
+    if TimelineService.on_unfollow(session, current_user.id, target_user.id):
+        background_tasks.add_task(backfill_followers_in_background, target_user.id)
     session.commit()
+    invalidate_stats_cache()
     return {"message": "Unfollowed successfully"}
 
 @router.get("/{username}/followers", response_model=List[UserSummary])
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, func
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select, update
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import List, Optional
 from pydantic import BaseModel
 from api.database import get_session
 from api.models import HonkingVersion, Song, SongPerformance, User
-from api.routes.auth import get_current_user
+from api.routes.auth import get_current_user, get_current_user_optional
 from api.services.honking_cache import HonkingCacheService
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,88 +27,142 @@ class HonkingVersionRead(BaseModel):
 class HonkingVersionCreate(BaseModel):
     performance_id: int
 
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
 @router.get("/song/{song_id}")
 def get_honking_version_for_song(
     song_id: int,
+    request: Request,
+    response: Response,
+    top: Optional[int] = Query(None, ge=1, le=500, description="Only return the N performances with the most votes"),
     session: Session = Depends(get_session),
-    current_user: Optional[User] = Depends(get_current_user)
+    current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """
     Get the honking version for a song.
 
-    Uses denormalized cache for efficient lookups. Returns:
-    - The performance with the most honking votes (from cache, O(1) lookup)
+    Served entirely from the denormalized cache. Returns:
+    - The performance with the most honking votes (joined with the song row)
     - User's own honking vote for the song (if authenticated)
-    - Vote counts for all performances
+    - Vote counts per performance from SongPerformance.honking_vote_count,
+      most votes first (optionally only the top N)
+
+    Responses carry an ETag and Last-Modified keyed on the song's
+    honking_version_updated_at (bumped on every vote), so clients
+    revalidate with a 304 instead of re-downloading.
     """
-    # Verify song exists
-    song = session.get(Song, song_id)
-    if not song:
+    # Song cache and leader details in one query
+    leader = aliased(SongPerformance)
+    row = session.exec(
+        select(
+            Song.honking_version_updated_at,
+            Song.current_honking_vote_count,
+            leader.id,
+            leader.song_id,
+            leader.show_id,
+            leader.position,
+            leader.set_number,
+            leader.notes,
+        )
+        .outerjoin(leader, leader.id == Song.current_honking_performance_id)
+        .where(Song.id == song_id)
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Song not found")
+    updated_at, leader_votes, leader_id, leader_song_id, show_id, position, set_number, notes = row
+
+    # Get current user's honking vote if authenticated
+    user_honking = None
+    if current_user:
+        user_honking = session.exec(
+            select(HonkingVersion).where(
+                HonkingVersion.user_id == current_user.id,
+                HonkingVersion.song_id == song_id
+            )
+        ).first()
+
+    # Validators: the song's cache timestamp, plus the caller's own vote
+    last_modified = max(filter(None, [updated_at, user_honking.updated_at if user_honking else None]), default=None)
+    key = f"{song_id}:{updated_at.isoformat() if updated_at else '-'}:{top or 'all'}"
+    if current_user:
+        key += f":{current_user.id}:{user_honking.updated_at.isoformat() if user_honking else '-'}"
+    etag = f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache" if current_user else "public, no-cache",
+        "Vary": "Authorization",
+    }
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
 
     # Build response using cached data
-    response = {
+    response_data = {
         "song_id": song_id,
         "honking_version": None,
         "honking_votes": [],
         "user_honking_vote": None,
-        "cache_timestamp": song.honking_version_updated_at.isoformat() if song.honking_version_updated_at else None
+        "cache_timestamp": updated_at.isoformat() if updated_at else None
     }
 
-    # Use cached current honking version (O(1) lookup)
-    if song.current_honking_performance_id:
-        top_perf = session.get(SongPerformance, song.current_honking_performance_id)
-
-        if top_perf:
-            response["honking_version"] = {
-                "id": top_perf.id,
-                "performance_id": top_perf.id,
-                "song_id": top_perf.song_id,
-                "show_id": top_perf.show_id,
-                "position": top_perf.position,
-                "set_number": top_perf.set_number,
-                "notes": top_perf.notes,
-                "honking_votes": song.current_honking_vote_count
-            }
-
-    # Get all performances with honking votes for complete breakdown
+    if leader_id:
+        response_data["honking_version"] = {
+            "id": leader_id,
+            "performance_id": leader_id,
+            "song_id": leader_song_id,
+            "show_id": show_id,
+            "position": position,
+            "set_number": set_number,
+            "notes": notes,
+            "honking_votes": leader_votes
+        }
+
+    # Breakdown from the cached counters, read off the (song_id, honking_vote_count, id) index
     statement = select(
-        HonkingVersion.performance_id,
-        func.count(HonkingVersion.id).label("vote_count")
+        SongPerformance.id,
+        SongPerformance.honking_vote_count
     ).where(
-        HonkingVersion.song_id == song_id
-    ).group_by(
-        HonkingVersion.performance_id
+        SongPerformance.song_id == song_id,
+        SongPerformance.honking_vote_count > 0
     ).order_by(
-        func.count(HonkingVersion.id).desc()
+        SongPerformance.honking_vote_count.desc(),
+        SongPerformance.id
     )
+    if top:
+        statement = statement.limit(top)
 
-    results = session.exec(statement).all()
-
-    # Return all performances with honking votes
-    for perf_id, vote_count in results:
-        response["honking_votes"].append({
+    for perf_id, vote_count in session.exec(statement).all():
+        response_data["honking_votes"].append({
             "performance_id": perf_id,
-            "vote_count": int(vote_count)
+            "vote_count": vote_count
         })
 
-    # Get current user's honking vote if authenticated
-    if current_user:
-        user_honking = session.exec(
-            select(HonkingVersion).where(
-                HonkingVersion.user_id == current_user.id,
-                HonkingVersion.song_id == song_id
-            )
-        ).first()
-
-        if user_honking:
-            response["user_honking_vote"] = {
-                "performance_id": user_honking.performance_id,
-                "created_at": user_honking.created_at.isoformat(),
-                "updated_at": user_honking.updated_at.isoformat()
-            }
+    if user_honking:
+        response_data["user_honking_vote"] = {
+            "performance_id": user_honking.performance_id,
+            "created_at": user_honking.created_at.isoformat(),
+            "updated_at": user_honking.updated_at.isoformat()
+        }
 
-    return response
+    return response_data
 
 @router.post("/song/{song_id}")
 def set_honking_version(
@@ -143,11 +200,22 @@ def set_honking_version(
 
     old_performance_id = None
     if existing_honking:
-        # Update existing honking version
-        old_performance_id = existing_honking.performance_id
-        existing_honking.performance_id = data.performance_id
-        existing_honking.updated_at = datetime.utcnow()
-        session.add(existing_honking)
+        # Move the vote only from the performance we read, so two concurrent
+        # re-votes can't both apply the same deltas; if another request moved
+        # it first, move it from where that request left it
+        while True:
+            old_performance_id = existing_honking.performance_id
+            moved = session.exec(
+                update(HonkingVersion)
+                .where(
+                    HonkingVersion.id == existing_honking.id,
+                    HonkingVersion.performance_id == old_performance_id
+                )
+                .values(performance_id=data.performance_id, updated_at=datetime.utcnow())
+            ).rowcount
+            if moved:
+                break
+            session.refresh(existing_honking)
     else:
         # Create new honking version
         honking = HonkingVersion(
@@ -160,19 +228,17 @@ def set_honking_version(
         session.add(honking)
         existing_honking = honking
 
-    session.commit()
-    session.refresh(existing_honking)
+    session.flush()
 
-    # Update cache transactionally
+    # Update cache in the same transaction as the vote
     try:
-        if old_performance_id and old_performance_id != data.performance_id:
+        if old_performance_id is None:
+            HonkingCacheService.on_honking_vote_created(session, existing_honking)
+        elif old_performance_id != data.performance_id:
             # Vote was changed - update both old and new performances
             HonkingCacheService.on_honking_vote_changed(
                 session, old_performance_id, existing_honking
             )
-        else:
-            # Vote was created
-            HonkingCacheService.on_honking_vote_created(session, existing_honking)
 
         session.commit()
         logger.info(f"Cache updated for honking vote: user={current_user.id}, song={song_id}")
@@ -180,6 +246,7 @@ def set_honking_version(
         session.rollback()
         logger.error(f"Failed to update cache: {e}")
         raise HTTPException(status_code=500, detail="Cache update failed")
+    session.refresh(existing_honking)
 
     return {
         "id": existing_honking.id,
@@ -222,9 +289,9 @@ def delete_honking_version(
     song_id_val = honking.song_id
 
     session.delete(honking)
-    session.commit()
+    session.flush()
 
-    # Update cache transactionally
+    # Update cache in the same transaction as the vote
     try:
         HonkingCacheService.on_honking_vote_deleted(
             session, song_id_val, performance_id
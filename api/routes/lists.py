@@ -1,15 +1,38 @@
 import secrets
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select, func
+from sqlalchemy import delete
+from sqlmodel import Session, select, update
 from typing import List, Optional
 from datetime import datetime
 
 from api.database import get_session
-from api.models import User, UserList, UserRead, Vote, ListFollow
+from api.models import User, UserList, UserRead, Vote, ListFollow, ListItem
 from api.routes.auth import get_current_user, get_current_user_optional
+from api.services.list_items import ListItemService
+from api.services.user_stats import UserStatsService
 
 router = APIRouter(prefix="/lists", tags=["lists"])
 
+def _get_viewable_list(session: Session, list_id: int, token: Optional[str], current_user: Optional[User]):
+    """Load a list the caller may view; returns (list, is_owner)."""
+    user_list = session.get(UserList, list_id)
+    if not user_list:
+        raise HTTPException(status_code=404, detail="List not found")
+
+    is_owner = current_user and user_list.user_id == current_user.id
+    token_ok = token and user_list.share_token and token == user_list.share_token
+
+    if not (is_owner or token_ok or user_list.is_public):
+        raise HTTPException(status_code=403, detail="Not authorized to view this list")
+    return user_list, is_owner
+
+def _adjust_follower_count(session: Session, list_id: int, delta: int) -> None:
+    session.exec(
+        update(UserList)
+        .where(UserList.id == list_id)
+        .values(follower_count=UserList.follower_count + delta)
+    )
+
 @router.get("/", response_model=List[dict])
 def list_lists(session: Session = Depends(get_session)):
     rows = session.exec(select(UserList, User).join(User, User.id == UserList.user_id)).all()
@@ -18,9 +41,6 @@ def list_lists(session: Session = Depends(get_session)):
         data = user_list.model_dump()
         data["share_token"] = None
         data["username"] = user.username
-        data["follower_count"] = session.exec(
-            select(func.count(ListFollow.id)).where(ListFollow.list_id == user_list.id)
-        ).one()
         results.append(data)
     return results
 
@@ -35,8 +55,12 @@ def create_list(
     if user_list.is_public is None:
         user_list.is_public = True
     user_list.created_at = datetime.utcnow()
+    user_list.follower_count = 0
     
     session.add(user_list)
+    session.flush()
+    ListItemService.sync(session, user_list)
+    UserStatsService.increment(session, current_user.id, lists_count=1)
     session.commit()
     session.refresh(user_list)
     return user_list
@@ -48,19 +72,7 @@ def get_list(
     session: Session = Depends(get_session),
     current_user: Optional[User] = Depends(get_current_user_optional),
 ):
-    user_list = session.get(UserList, list_id)
-    if not user_list:
-        raise HTTPException(status_code=404, detail="List not found")
-
-    is_owner = current_user and user_list.user_id == current_user.id
-    token_ok = token and user_list.share_token and token == user_list.share_token
-
-    if not (is_owner or token_ok or user_list.is_public):
-        raise HTTPException(status_code=403, detail="Not authorized to view this list")
-
-    follower_count = session.exec(
-        select(func.count(ListFollow.id)).where(ListFollow.list_id == list_id)
-    ).one()
+    user_list, is_owner = _get_viewable_list(session, list_id, token, current_user)
 
     is_following = False
     if current_user:
@@ -74,10 +86,31 @@ def get_list(
     list_dict = user_list.model_dump()
     if not is_owner:
         list_dict["share_token"] = None
-    list_dict["follower_count"] = follower_count
     list_dict["is_following"] = is_following
     return list_dict
 
+@router.get("/{list_id}/items")
+def get_list_items(
+    list_id: int,
+    token: Optional[str] = Query(default=None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    session: Session = Depends(get_session),
+    current_user: Optional[User] = Depends(get_current_user_optional),
+):
+    """
+    A page of the list's items by position, each hydrated with its song,
+    show and rating aggregates.
+    """
+    _get_viewable_list(session, list_id, token, current_user)
+    return {
+        "list_id": list_id,
+        "total": ListItemService.count(session, list_id),
+        "offset": offset,
+        "limit": limit,
+        "items": ListItemService.page(session, list_id, offset=offset, limit=limit),
+    }
+
 @router.put("/{list_id}", response_model=UserList)
 def update_list(
     list_id: int,
@@ -98,6 +131,7 @@ def update_list(
     user_list.list_type = updated_list.list_type
     
     session.add(user_list)
+    ListItemService.sync(session, user_list)
     session.commit()
     session.refresh(user_list)
     return user_list
@@ -115,7 +149,9 @@ def delete_list(
     if user_list.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this list")
         
+    session.exec(delete(ListItem).where(ListItem.list_id == list_id))
     session.delete(user_list)
+    UserStatsService.increment(session, current_user.id, lists_count=-1)
     session.commit()
     return {"status": "success"}
 
@@ -206,6 +242,7 @@ def follow_list(
         
     follow = ListFollow(user_id=current_user.id, list_id=list_id)
     session.add(follow)
+    _adjust_follower_count(session, list_id, 1)
     session.commit()
     return {"message": "List followed"}
 
@@ -226,6 +263,7 @@ def unfollow_list(
         raise HTTPException(status_code=404, detail="Not following this list")
         
     session.delete(follow)
+    _adjust_follower_count(session, list_id, -1)
     session.commit()
     return {"message": "List unfollowed"}
 
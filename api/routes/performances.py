@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlmodel import Session, select
+from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel
 
 from api.database import get_session
 from api.models import SongPerformance, Song, Show, Vote, User
 from api.routes.auth import get_current_user
+from api.routes.stats import invalidate_stats_cache
+from api.services.rating_cache import RatingCacheService, average_rating, average_rating_expr
+from api.services.search_index import index_vote_in_background
+from api.services.timeline import fan_out_vote_in_background
+from api.services.user_stats import UserStatsService
 
 router = APIRouter(prefix="/performances", tags=["performances"])
 
@@ -28,14 +34,6 @@ def list_performances(
     
     performances = []
     for perf, song, show in results:
-        # Get vote count and average for this performance
-        vote_statement = select(Vote).where(Vote.performance_id == perf.id)
-        votes = session.exec(vote_statement).all()
-        
-        avg_rating = None
-        if votes:
-            avg_rating = sum(v.rating for v in votes) / len(votes)
-        
         performances.append({
             "id": perf.id,
             "position": perf.position,
@@ -54,8 +52,8 @@ def list_performances(
                 "venue": show.venue,
                 "location": show.location
             },
-            "vote_count": len(votes),
-            "avg_rating": round(avg_rating, 1) if avg_rating else None
+            "vote_count": perf.vote_count,
+            "avg_rating": average_rating(perf.vote_count, perf.rating_sum)
         })
     
     return performances
@@ -71,26 +69,19 @@ def list_top_rated_performances(
     Return the highest-rated performances by average vote.
     Only performances with at least ``min_votes`` are considered.
     """
+    avg_rating = average_rating_expr(SongPerformance)
     statement = (
-        select(
-            SongPerformance,
-            Song,
-            Show,
-            func.count(Vote.id).label("vote_count"),
-            func.avg(Vote.rating).label("avg_rating")
-        )
+        select(SongPerformance, Song, Show)
         .join(Song, SongPerformance.song_id == Song.id)
         .join(Show, SongPerformance.show_id == Show.id)
-        .join(Vote, Vote.performance_id == SongPerformance.id)
-        .group_by(SongPerformance.id, Song.id, Show.id)
-        .having(func.count(Vote.id) >= min_votes)
-        .order_by(func.avg(Vote.rating).desc(), func.count(Vote.id).desc())
+        .where(SongPerformance.vote_count >= max(min_votes, 1))
+        .order_by(avg_rating.desc(), SongPerformance.vote_count.desc())
         .limit(limit)
     )
 
     results = session.exec(statement).all()
     top_performances = []
-    for perf, song, show, vote_count, avg_rating in results:
+    for perf, song, show in results:
         top_performances.append({
             "id": perf.id,
             "position": perf.position,
@@ -109,8 +100,8 @@ def list_top_rated_performances(
                 "venue": show.venue,
                 "location": show.location
             },
-            "vote_count": vote_count,
-            "avg_rating": round(avg_rating, 1) if avg_rating else None
+            "vote_count": perf.vote_count,
+            "avg_rating": average_rating(perf.vote_count, perf.rating_sum)
         })
 
     return top_performances
@@ -135,14 +126,6 @@ def get_performance(
     
     perf, song, show = result
     
-    # Get votes
-    vote_statement = select(Vote).where(Vote.performance_id == perf.id)
-    votes = session.exec(vote_statement).all()
-    
-    avg_rating = None
-    if votes:
-        avg_rating = sum(v.rating for v in votes) / len(votes)
-    
     return {
         "id": perf.id,
         "position": perf.position,
@@ -150,8 +133,8 @@ def get_performance(
         "notes": perf.notes,
         "song": song.model_dump(),
         "show": show.model_dump(),
-        "vote_count": len(votes),
-        "avg_rating": round(avg_rating, 1) if avg_rating else None
+        "vote_count": perf.vote_count,
+        "avg_rating": average_rating(perf.vote_count, perf.rating_sum)
     }
 
 class PerformanceVoteCreate(BaseModel):
@@ -171,14 +154,6 @@ def get_performance_rating(
     if not perf:
         raise HTTPException(status_code=404, detail="Performance not found")
     
-    # Get all votes
-    vote_statement = select(Vote).where(Vote.performance_id == performance_id)
-    votes = session.exec(vote_statement).all()
-    
-    avg_rating = None
-    if votes:
-        avg_rating = sum(v.rating for v in votes) / len(votes)
-    
     # Get user's vote if authenticated
     user_vote = None
     if current_user:
@@ -192,8 +167,8 @@ def get_performance_rating(
     
     return {
         "performance_id": performance_id,
-        "avg_rating": round(avg_rating, 1) if avg_rating else None,
-        "vote_count": len(votes),
+        "avg_rating": average_rating(perf.vote_count, perf.rating_sum),
+        "vote_count": perf.vote_count,
         "user_vote": user_vote
     }
 
@@ -201,6 +176,7 @@ def get_performance_rating(
 def vote_on_performance(
     performance_id: int,
     vote_data: PerformanceVoteCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -223,12 +199,17 @@ def vote_on_performance(
     
     if existing_vote:
         # Update existing vote
+        old_rating = existing_vote.rating
         existing_vote.rating = vote_data.rating
         existing_vote.blurb = vote_data.blurb
         existing_vote.full_review = vote_data.full_review
+        existing_vote.updated_at = datetime.utcnow()
         session.add(existing_vote)
+        RatingCacheService.on_vote_changed(session, existing_vote, old_rating)
         session.commit()
+        invalidate_stats_cache()
         session.refresh(existing_vote)
+        background_tasks.add_task(index_vote_in_background, existing_vote.id)
         return {"message": "Vote updated", "vote_id": existing_vote.id, "rating": existing_vote.rating}
     else:
         # Create new vote
@@ -240,6 +221,12 @@ def vote_on_performance(
             full_review=vote_data.full_review
         )
         session.add(new_vote)
+        session.flush()
+        RatingCacheService.on_vote_created(session, new_vote)
+        UserStatsService.increment(session, current_user.id, votes_count=1)
         session.commit()
+        invalidate_stats_cache()
         session.refresh(new_vote)
+        background_tasks.add_task(fan_out_vote_in_background, new_vote.id)
+        background_tasks.add_task(index_vote_in_background, new_vote.id)
         return {"message": "Vote created", "vote_id": new_vote.id, "rating": new_vote.rating}
@@ -1,10 +1,11 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, func, SQLModel
+from sqlmodel import Session, select, SQLModel
 from api.database import get_session
 from api.models import User, UserTitle, UserBadge, Vote, UserList, ListFollow, UserShowAttendance, UserFollow
 from api.routes.auth import get_current_user_optional, get_current_user
 from api.services.badges import get_all_system_badges
+from api.services.user_stats import UserStatsService
 import json
 
 router = APIRouter(prefix="/profile", tags=["profile"])
@@ -38,28 +39,7 @@ def get_user_profile(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Get stats
-    shows_attended = session.exec(
-        select(func.count(UserShowAttendance.show_id))
-        .where(UserShowAttendance.user_id == user.id)
-    ).one()
-
-    total_votes = session.exec(
-        select(func.count(Vote.id))
-        .where(Vote.user_id == user.id)
-    ).one()
-
-    lists_created = session.exec(
-        select(func.count(UserList.id))
-        .where(UserList.user_id == user.id)
-    ).one()
-
-    followers_count = session.exec(
-        select(func.count(UserFollow.id)).where(UserFollow.followed_id == user.id)
-    ).one()
-
-    following_count = session.exec(
-        select(func.count(UserFollow.id)).where(UserFollow.follower_id == user.id)
-    ).one()
+    counters = UserStatsService.get(session, user.id)
     
     # Get selected title
     selected_title = None
@@ -120,11 +100,11 @@ def get_user_profile(
             "social_links": social_links
         },
         "stats": {
-            "shows_attended": shows_attended,
-            "total_votes": total_votes,
-            "lists_created": lists_created,
-            "followers": followers_count,
-            "following": following_count
+            "shows_attended": counters.shows_attended,
+            "total_votes": counters.votes_count,
+            "lists_created": counters.lists_count,
+            "followers": counters.followers_count,
+            "following": counters.following_count
         },
         "is_following": is_following,
         "selected_title": selected_title_dict,
@@ -1,82 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, col
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from sqlmodel import Session
 from typing import List, Optional
 from pydantic import BaseModel
 
 from api.database import get_session
-from api.models import Show, Song, User
+from api.services.search_index import SearchIndexService
+from api.services.typeahead import TYPES, typeahead
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 class SearchResult(BaseModel):
-    type: str  # 'show', 'song', 'user'
+    type: str  # 'song', 'show', 'venue', 'user', 'review', 'synopsis'
     id: int
     title: str
     subtitle: Optional[str] = None
     url: str
 
+class Suggestion(BaseModel):
+    type: str  # 'song', 'venue', 'tour', 'user'
+    key: str
+    label: str
+    url: str
+
+@router.get("/suggest", response_model=List[Suggestion])
+def suggest(
+    q: str,
+    background_tasks: BackgroundTasks,
+    types: Optional[str] = Query(None, description="Comma-separated subset of song,venue,tour,user"),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """
+    Search-as-you-type suggestions served from the worker's in-memory
+    typeahead index; never queries the database on the request path.
+    """
+    if typeahead.is_stale():
+        background_tasks.add_task(typeahead.reload_in_background)
+
+    type_filter = [t.strip() for t in types.split(",") if t.strip() in TYPES] if types else None
+    return typeahead.suggest(q, types=type_filter, limit=limit)
+
 @router.get("/", response_model=List[SearchResult])
 def search(
     q: str,
+    types: Optional[str] = Query(None, description="Comma-separated result types to include"),
+    limit: int = Query(20, ge=1, le=50),
     session: Session = Depends(get_session)
 ):
+    """
+    Ranked full-text search over songs, shows, venues, users, reviews and
+    synopses. Matches partial words and tolerates small typos; results are
+    ordered by relevance boosted by popularity.
+    """
     if not q or len(q) < 2:
         return []
-        
-    results = []
-    query_str = f"%{q}%"
-    
-    # Search Songs
-    songs = session.exec(
-        select(Song)
-        .where(col(Song.name).like(query_str))
-        .limit(5)
-    ).all()
-    
-    for song in songs:
-        results.append(SearchResult(
-            type="song",
-            id=song.id,
-            title=song.name,
-            subtitle=song.artist,
-            url=f"/songs/{song.slug}"
-        ))
-        
-    # Search Shows (by venue or location)
-    shows = session.exec(
-        select(Show)
-        .where(
-            (col(Show.venue).like(query_str)) | 
-            (col(Show.location).like(query_str)) |
-            (col(Show.date).like(query_str))
+
+    type_filter = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    documents = SearchIndexService.search(session, q, types=type_filter, limit=limit)
+
+    return [
+        SearchResult(
+            type=doc.doc_type,
+            id=doc.object_id if doc.object_id is not None else doc.id,
+            title=doc.title,
+            subtitle=doc.subtitle,
+            url=doc.url,
         )
-        .order_by(Show.date.desc())
-        .limit(5)
-    ).all()
-    
-    for show in shows:
-        results.append(SearchResult(
-            type="show",
-            id=show.id,
-            title=f"{show.date} - {show.venue}",
-            subtitle=show.location,
-            url=f"/shows/{show.date}"
-        ))
-        
-    # Search Users
-    users = session.exec(
-        select(User)
-        .where(col(User.username).like(query_str))
-        .limit(5)
-    ).all()
-    
-    for user in users:
-        results.append(SearchResult(
-            type="user",
-            id=user.id,
-            title=user.username,
-            subtitle="User",
-            url=f"/u/{user.username}"
-        ))
-        
-    return results
+        for doc in documents
+    ]
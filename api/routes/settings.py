@@ -4,6 +4,8 @@ from sqlmodel import Session, select
 from api.database import get_session
 from api.models import User, UserRead
 from api.routes.auth import get_current_user
+from api.services.search_index import SearchIndexService
+from api.services.typeahead import typeahead
 from api.shared_models.settings import ProfileUpdate, EmailChangeRequest, PasswordChangeRequest, PrivacyPreferences
 
 router = APIRouter(prefix="/settings", tags=["settings"])
@@ -35,6 +37,7 @@ def update_profile_settings(
 
     # Use merge to attach even if current_user came from another session (e.g., testing overrides)
     merged_user = session.merge(current_user)
+    SearchIndexService.index_users(session, [merged_user.id])
     session.commit()
     session.refresh(merged_user)
 
@@ -147,6 +150,7 @@ def update_privacy_settings(
     merged_user = session.merge(current_user)
     session.commit()
     session.refresh(merged_user)
+    typeahead.add_users(session, [merged_user.id])
 
     return {
         "message": "Privacy settings updated successfully",
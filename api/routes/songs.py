@@ -1,32 +1,85 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import Session, select, func, or_, and_
 from typing import List, Optional
 
 from api.database import get_session
 from api.models import Song, SongPerformance, Show, Vote, Tag, PerformanceTag, User
 from api.routes.auth import get_current_user_optional
 from api.routes.tags import _visibility_filter
+from api.services.pagination import decode_cursor, encode_cursor, set_next_cursor
+from api.services.rating_cache import average_rating, average_rating_expr
 
 router = APIRouter(prefix="/songs", tags=["songs"])
 
+CATALOG_SORTS = {"name", "plays", "rating", "last_played"}
+
 @router.get("/")
-def list_songs(session: Session = Depends(get_session)):
-    """List all songs with aggregated stats"""
-    statement = select(Song)
-    songs = session.exec(statement).all()
-    
-    # Add performance counts for each song
+def list_songs(
+    sort: str = Query("name", description="name, plays, rating or last_played"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session)
+):
+    """
+    List all songs with aggregated stats.
+
+    Play count, last played date and rating aggregates (from the cached
+    SongPerformance.vote_count/rating_sum columns) are computed with one
+    grouped subquery joined onto Song, so the whole catalog page is a
+    single round trip regardless of how many songs exist. The current
+    honking version comes from the denormalized cache on Song.
+    """
+    if sort not in CATALOG_SORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort (use one of: {', '.join(sorted(CATALOG_SORTS))})")
+
+    plays_sq = (
+        select(
+            SongPerformance.song_id.label("song_id"),
+            func.count(SongPerformance.id).label("plays"),
+            func.max(Show.date).label("last_played"),
+            func.sum(SongPerformance.vote_count).label("vote_count"),
+            func.sum(SongPerformance.rating_sum).label("rating_sum"),
+        )
+        .join(Show, SongPerformance.show_id == Show.id)
+        .group_by(SongPerformance.song_id)
+        .subquery()
+    )
+
+    plays = func.coalesce(plays_sq.c.plays, 0)
+    avg_rating = (plays_sq.c.rating_sum * 1.0) / func.nullif(plays_sq.c.vote_count, 0)
+    statement = (
+        select(
+            Song,
+            plays.label("plays"),
+            plays_sq.c.last_played,
+            func.coalesce(plays_sq.c.vote_count, 0).label("vote_count"),
+            avg_rating.label("avg_rating"),
+        )
+        .outerjoin(plays_sq, plays_sq.c.song_id == Song.id)
+    )
+
+    if sort == "plays":
+        statement = statement.order_by(plays.desc(), Song.name)
+    elif sort == "rating":
+        statement = statement.order_by(avg_rating.desc().nulls_last(), Song.name)
+    elif sort == "last_played":
+        statement = statement.order_by(plays_sq.c.last_played.desc().nulls_last(), Song.name)
+    else:
+        statement = statement.order_by(Song.name)
+
+    statement = statement.offset(offset)
+    if limit is not None:
+        statement = statement.limit(limit)
+
     result = []
-    for song in songs:
-        perf_count = session.exec(
-            select(func.count(SongPerformance.id))
-            .where(SongPerformance.song_id == song.id)
-        ).one()
-        
+    for song, perf_count, last_played, vote_count, avg_rating in session.exec(statement).all():
         song_dict = song.model_dump()
         song_dict['times_played'] = perf_count
+        song_dict['last_played'] = last_played
+        song_dict['vote_count'] = vote_count
+        song_dict['avg_rating'] = round(avg_rating, 1) if avg_rating is not None else None
         result.append(song_dict)
-    
+
     return result
 
 @router.get("/{slug}")
@@ -78,32 +131,71 @@ def get_song_by_id(song_id: int, session: Session = Depends(get_session)):
 
 @router.get("/{slug}/performances")
 def get_song_performances(
-    slug: str, 
+    slug: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
-    """Return performances for a song with rating stats, sorted by avg rating descending"""
+    """
+    Return performances for a song with rating stats, sorted by avg rating descending.
+
+    Ratings come from the cached SongPerformance.vote_count/rating_sum columns
+    and tags are loaded for the whole page in one batched query. When ``limit`` is
+    given, the next page cursor is returned in the X-Next-Cursor header.
+    """
     # Find song
     song = session.exec(select(Song).where(Song.slug == slug)).first()
     if not song:
         raise HTTPException(status_code=404, detail="Song not found")
 
-    # Gather performances with show info
+    avg_rating = average_rating_expr(SongPerformance)
+
+    # Gather performances with show info, pre-sorted by cached rating aggregates
     perf_stmt = (
         select(SongPerformance, Show)
         .join(Show, SongPerformance.show_id == Show.id)
         .where(SongPerformance.song_id == song.id)
+        .order_by(avg_rating.is_(None), avg_rating.desc(), SongPerformance.id)
     )
+
+    if cursor:
+        last_avg, last_id = decode_cursor(cursor, 2)
+        if last_avg is None:
+            perf_stmt = perf_stmt.where(avg_rating.is_(None), SongPerformance.id > last_id)
+        else:
+            perf_stmt = perf_stmt.where(or_(
+                avg_rating < last_avg,
+                and_(avg_rating == last_avg, SongPerformance.id > last_id),
+                avg_rating.is_(None),
+            ))
+
+    if limit is not None:
+        perf_stmt = perf_stmt.limit(limit + 1)
+
     perf_rows = session.exec(perf_stmt).all()
+    if limit is not None and len(perf_rows) > limit:
+        perf_rows = perf_rows[:limit]
+        last_perf, _ = perf_rows[-1]
+        last_avg = last_perf.rating_sum / last_perf.vote_count if last_perf.vote_count else None
+        set_next_cursor(response, encode_cursor(last_avg, last_perf.id))
+
+    # Fetch visible tags for every performance on the page at once
+    tags_by_perf = {}
+    perf_ids = [perf.id for perf, _ in perf_rows]
+    if perf_ids:
+        tag_rows = session.exec(
+            select(PerformanceTag.performance_id, Tag)
+            .join(Tag, PerformanceTag.tag_id == Tag.id)
+            .where(PerformanceTag.performance_id.in_(perf_ids))
+            .where(_visibility_filter(current_user))
+        ).all()
+        for perf_id, tag in tag_rows:
+            tags_by_perf.setdefault(perf_id, []).append(tag)
 
     results = []
     for perf, show in perf_rows:
-        # Rating aggregation for this performance
-        vote_stmt = select(Vote).where(Vote.performance_id == perf.id)
-        votes = session.exec(vote_stmt).all()
-        avg = None
-        if votes:
-            avg = round(sum(v.rating for v in votes) / len(votes), 1)
         results.append({
             "id": perf.id,
             "position": perf.position,
@@ -115,20 +207,9 @@ def get_song_performances(
                 "venue": show.venue,
                 "location": show.location,
             },
-            "avg_rating": avg,
-            "vote_count": len(votes),
+            "avg_rating": average_rating(perf.vote_count, perf.rating_sum),
+            "vote_count": perf.vote_count,
+            "tags": tags_by_perf.get(perf.id, []),
         })
 
-        # Fetch tags for this performance
-        tags = session.exec(
-            select(Tag)
-            .join(PerformanceTag, PerformanceTag.tag_id == Tag.id)
-            .where(PerformanceTag.performance_id == perf.id)
-            .where(_visibility_filter(current_user))
-        ).all()
-        
-        results[-1]["tags"] = tags
-
-    # Sort by avg rating (None values go last)
-    results.sort(key=lambda x: (x["avg_rating"] is None, -(x["avg_rating"] or 0)))
     return results
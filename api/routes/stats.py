@@ -6,9 +6,18 @@ from sqlmodel import Session, select, func
 
 from api.database import get_session
 from api.models import Show, Song, SongPerformance, Vote, User, UserFollow, Notification
+from api.services.response_cache import cache_from_env
 
 router = APIRouter(prefix="/stats", tags=["stats"])
 
+# Shared across uvicorn workers when STATS_CACHE_BACKEND=sqlite
+stats_cache = cache_from_env("stats", "STATS_CACHE", default_ttl=60)
+
+
+def invalidate_stats_cache() -> None:
+    """Called from vote, follow and comment write paths."""
+    stats_cache.invalidate()
+
 
 def build_stats_payload(session: Session) -> Dict[str, Any]:
     # Top songs by play count
@@ -153,4 +162,4 @@ def build_stats_payload(session: Session) -> Dict[str, Any]:
 @router.get("/")
 def get_stats(session: Session = Depends(get_session)) -> Dict[str, Any]:
     """Return overall site stats (supports both /stats and /stats/)."""
-    return build_stats_payload(session)
+    return stats_cache.get_or_compute("payload", lambda: build_stats_payload(session))
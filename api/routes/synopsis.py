@@ -6,6 +6,7 @@ from datetime import datetime
 from api.database import get_session
 from api.models import Synopsis, SynopsisHistory, User, ObjectType
 from api.routes.auth import get_current_user, get_current_user_optional
+from api.services.search_index import SearchIndexService
 
 router = APIRouter(prefix="/synopsis", tags=["synopsis"])
 
@@ -92,7 +93,8 @@ def update_synopsis(
         version=synopsis.version
     )
     session.add(history)
-    
+    SearchIndexService.index_synopses(session, [synopsis.id])
+
     session.commit()
     session.refresh(synopsis)
     return synopsis
@@ -1,29 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlmodel import Session, select
 from typing import List
 
 from api.database import get_session
-from api.models import User, UserList, UserRead, UserStats, Vote, UserFollow, UserShowAttendance
+from api.models import User, UserList, UserRead, UserStats, Vote, UserFollow
 from api.routes.auth import get_current_user, get_current_user_optional
+from api.routes.stats import invalidate_stats_cache
+from api.services.timeline import TimelineService, backfill_followers_in_background
+from api.services.user_stats import UserStatsService
 from api.models import SongPerformance, PerformanceTag, ShowTag, Tag
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+def _user_stats(session: Session, user_id: int) -> UserStats:
+    counters = UserStatsService.get(session, user_id)
+    return UserStats(
+        shows_attended=counters.shows_attended,
+        reviews_count=counters.votes_count,
+        followers_count=counters.followers_count,
+        following_count=counters.following_count,
+        lists_count=counters.lists_count,
+    )
+
 @router.get("/me", response_model=UserRead)
 def read_users_me(current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
-    # Compute stats
-    reviews_count = session.exec(select(Vote).where(Vote.user_id == current_user.id)).all()
-    followers_count = session.exec(select(UserFollow).where(UserFollow.followed_id == current_user.id)).all()
-    following_count = session.exec(select(UserFollow).where(UserFollow.follower_id == current_user.id)).all()
-    shows_attended = session.exec(select(UserShowAttendance).where(UserShowAttendance.user_id == current_user.id)).all()
+    stats = _user_stats(session, current_user.id)
 
-    stats = UserStats(
-        shows_attended=len(shows_attended),
-        reviews_count=len(reviews_count),
-        followers_count=len(followers_count),
-        following_count=len(following_count)
-    )
-    
     return UserRead(
         id=current_user.id,
         username=current_user.username,
@@ -44,11 +46,7 @@ def read_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Compute stats
-    reviews_count = session.exec(select(Vote).where(Vote.user_id == user.id)).all()
-    followers_count = session.exec(select(UserFollow).where(UserFollow.followed_id == user.id)).all()
-    following_count = session.exec(select(UserFollow).where(UserFollow.follower_id == user.id)).all()
-    shows_attended = session.exec(select(UserShowAttendance).where(UserShowAttendance.user_id == user.id)).all()
+    stats = _user_stats(session, user.id)
 
     is_following = False
     if current_user:
@@ -61,13 +59,6 @@ def read_user(
         if follow_check:
             is_following = True
 
-    stats = UserStats(
-        shows_attended=len(shows_attended),
-        reviews_count=len(reviews_count),
-        followers_count=len(followers_count),
-        following_count=len(following_count)
-    )
-    
     return UserRead(
         id=user.id,
         username=user.username,
@@ -100,13 +91,17 @@ def follow_user(
     if not existing:
         follow = UserFollow(follower_id=current_user.id, followed_id=target_user.id)
         session.add(follow)
+        UserStatsService.on_follow(session, current_user.id, target_user.id)
+        TimelineService.on_follow(session, current_user.id, target_user.id)
         session.commit()
+        invalidate_stats_cache()
         
     return {"status": "success", "is_following": True}
 
 @router.delete("/{username}/follow")
 def unfollow_user(
     username: str,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -123,7 +118,11 @@ def unfollow_user(
     
     if existing:
         session.delete(existing)
+        UserStatsService.on_follow(session, current_user.id, target_user.id, delta=-1)
+        if TimelineService.on_unfollow(session, current_user.id, target_user.id):
+            background_tasks.add_task(backfill_followers_in_background, target_user.id)
         session.commit()
+        invalidate_stats_cache()
         
     return {"status": "success", "is_following": False}
 
@@ -1,45 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
 from api.database import get_session
-from api.models import Show
+from api.models import Show, Song, SongPerformance, Venue
 from typing import List, Dict
-import re
 
 router = APIRouter(prefix="/venues", tags=["venues"])
 
-def slugify(text: str) -> str:
-    """Simple slugify for venue names"""
-    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip('-')
+TOP_SONGS_LIMIT = 10
 
 @router.get("/", response_model=List[Dict[str, str]])
 def list_venues(session: Session = Depends(get_session)):
-    """Return a list of distinct venues with slug and display name"""
-    stmt = select(Show.venue).distinct()
-    results = session.exec(stmt).all()
-    venues = []
-    for venue in results:
-        venues.append({"name": venue, "slug": slugify(venue)})
-    return venues
+    """Return a list of venues with slug and display name"""
+    venues = session.exec(select(Venue.name, Venue.slug).order_by(Venue.name)).all()
+    return [{"name": name, "slug": slug} for name, slug in venues]
 
 @router.get("/{venue_slug}", response_model=Dict)
 def venue_detail(venue_slug: str, session: Session = Depends(get_session)):
-    """Return venue info and all shows at that venue"""
-    stmt = select(Show).where(Show.venue != None)
-    shows = session.exec(stmt).all()
-    # Find matching venue
-    matching = [s for s in shows if slugify(s.venue) == venue_slug]
-    if not matching:
+    """Return venue info, precomputed stats and all shows at that venue"""
+    venue = session.exec(select(Venue).where(Venue.slug == venue_slug)).first()
+    if not venue:
         raise HTTPException(status_code=404, detail="Venue not found")
-    venue_name = matching[0].venue
-    # Build list of shows
-    show_list = []
-    for s in matching:
-        show_list.append({
-            "id": s.id,
-            "date": s.date,
-            "location": s.location,
-            "elgoose_id": s.elgoose_id,
-        })
-    # Simple stats: count of shows
-    stats = {"show_count": len(show_list)}
-    return {"name": venue_name, "slug": venue_slug, "stats": stats, "shows": show_list}
+
+    shows = session.exec(
+        select(Show.id, Show.date, Show.location, Show.elgoose_id)
+        .where(Show.venue_id == venue.id)
+        .order_by(Show.date)
+    ).all()
+    show_list = [
+        {"id": show_id, "date": date, "location": location, "elgoose_id": elgoose_id}
+        for show_id, date, location, elgoose_id in shows
+    ]
+
+    plays = func.count(SongPerformance.id).label("plays")
+    top_songs = session.exec(
+        select(Song.name, Song.slug, plays)
+        .join(SongPerformance, SongPerformance.song_id == Song.id)
+        .join(Show, Show.id == SongPerformance.show_id)
+        .where(Show.venue_id == venue.id)
+        .group_by(Song.id, Song.name, Song.slug)
+        .order_by(plays.desc(), Song.name)
+        .limit(TOP_SONGS_LIMIT)
+    ).all()
+
+    stats = {
+        "show_count": venue.show_count,
+        "first_show_date": venue.first_show_date,
+        "last_show_date": venue.last_show_date,
+        "top_songs": [{"name": name, "slug": slug, "plays": count} for name, slug, count in top_songs],
+    }
+    return {
+        "name": venue.name,
+        "slug": venue.slug,
+        "city": venue.city,
+        "state": venue.state,
+        "stats": stats,
+        "shows": show_list,
+    }
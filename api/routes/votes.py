@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlmodel import Session, select
 from typing import List, Optional
 from pydantic import BaseModel
 from sqlalchemy import func, Integer
 from datetime import datetime
 
+from api import database
 from api.database import get_session
-from api.models import User, Vote, Show, UserRead, UserFollow
+from api.models import User, Vote, Show, UserRead
 from api.routes.auth import get_current_user
-from api.services.notifications import create_notification
+from api.routes.stats import invalidate_stats_cache
+from api.services.notifications import notify_followers
+from api.services.rating_cache import RatingCacheService
+from api.services.search_index import index_vote_in_background
+from api.services.timeline import fan_out_vote_in_background
+from api.services.user_stats import UserStatsService
 from api.models import SongPerformance, PerformanceTag, ShowTag, Tag, Song
 
 router = APIRouter(prefix="/votes", tags=["votes"])
@@ -29,6 +35,7 @@ class VoteRead(BaseModel):
 @router.post("/", response_model=VoteRead)
 def create_vote(
     vote_in: VoteCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session)
 ):
@@ -46,12 +53,17 @@ def create_vote(
 
     if existing_vote:
         # Update existing vote
+        old_rating = existing_vote.rating
         existing_vote.rating = vote_in.rating
         existing_vote.comment = vote_in.comment
+        existing_vote.updated_at = datetime.utcnow()
         session.add(existing_vote)
+        RatingCacheService.on_vote_changed(session, existing_vote, old_rating)
         session.commit()
+        invalidate_stats_cache()
         session.refresh(existing_vote)
-        notify_new_vote(session, existing_vote.id, current_user.id)
+        background_tasks.add_task(notify_new_vote, existing_vote.id, current_user.id)
+        background_tasks.add_task(index_vote_in_background, existing_vote.id)
         return VoteRead(
             id=existing_vote.id,
             user_id=existing_vote.user_id,
@@ -69,9 +81,15 @@ def create_vote(
             comment=vote_in.comment
         )
         session.add(vote)
+        session.flush()
+        RatingCacheService.on_vote_created(session, vote)
+        UserStatsService.increment(session, current_user.id, votes_count=1)
         session.commit()
+        invalidate_stats_cache()
         session.refresh(vote)
-        notify_new_vote(session, vote.id, current_user.id)
+        background_tasks.add_task(notify_new_vote, vote.id, current_user.id)
+        background_tasks.add_task(fan_out_vote_in_background, vote.id)
+        background_tasks.add_task(index_vote_in_background, vote.id)
         return VoteRead(
             id=vote.id,
             user_id=vote.user_id,
@@ -384,20 +402,19 @@ def get_user_votes(username: str, session: Session = Depends(get_session)):
         ))
     return results
 
-def notify_new_vote(session: Session, vote_id: int, actor_id: int):
-    follower_ids = session.exec(
-        select(UserFollow.follower_id)
-        .where(UserFollow.followed_id == actor_id)
-    ).all()
-    if not follower_ids:
-        return
-    follower_ids = [fid for fid, in follower_ids] if isinstance(follower_ids[0], tuple) else follower_ids
-    for uid in follower_ids:
-        create_notification(
+def notify_new_vote(vote_id: int, actor_id: int):
+    """
+    Fan a new review out to the actor's followers.
+
+    Runs as a background task after the response is sent, in its own session,
+    so vote latency does not depend on follower count.
+    """
+    with Session(database.engine) as session:
+        notify_followers(
             session,
-            user_id=uid,
             actor_id=actor_id,
             type="review",
             object_type="vote",
             object_id=vote_id,
         )
+        session.commit()
@@ -6,21 +6,44 @@ After initial population, shows are updated on-demand as users view them.
 
 Usage:
     python seed_from_elgoose.py [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--limit N]
+                                [--workers N] [--checkpoint PATH] [--no-resume]
 
 Examples:
     python seed_from_elgoose.py                              # Default: last 365 days
     python seed_from_elgoose.py --start 2020-01-01           # From 2020 to today
     python seed_from_elgoose.py --start 2016-01-01 --end 2024-01-01  # Specific range
     python seed_from_elgoose.py --limit 50                   # First 50 shows only (testing)
+    python seed_from_elgoose.py --workers 8 --no-resume      # More parsers, ignore checkpoint
+
+Pipeline:
+    1. Fetch the El Goose show index once and keep only dates that had a show
+       (falls back to probing every day in the range if the index is unavailable)
+    2. Download uncached setlists concurrently with the shared async client
+    3. Parse setlists in a process pool (--workers)
+    4. Insert each chunk of shows, songs and performances with multi-row
+       INSERTs in a single transaction
+    5. Record finished dates in a checkpoint file so an interrupted run can
+       resume where it stopped (--no-resume starts over)
 """
 
-import requests
+import asyncio
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from sqlmodel import Session, select
-from database import engine, create_db_and_tables
-from models import Show, Song, SongPerformance
+from pathlib import Path
+
+# Allow running as `python api/seed_from_elgoose.py` from the repository root
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlmodel import Session, select, func
+from api.database import engine, create_db_and_tables
+from api.models import Song
+from api.services.cache_manager import get_cache_manager, negative_ttl_for_date
+from api.services.elgoose_client import AsyncElGooseClient, ElGooseClient, ElGooseError, get_elgoose_client
+from api.services.setlist_ingest import index_dates, insert_shows, parse_setlist
 import logging
 
 # Set up logging
@@ -30,8 +53,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-EL_GOOSE_BASE_URL = "https://elgoose.net/api/v2"
-BATCH_SIZE = 10  # Days per batch to avoid overwhelming the API
+BATCH_SIZE = 50  # Show dates fetched, parsed and inserted per transaction
+DEFAULT_CHECKPOINT = Path(__file__).resolve().parent / "data" / "seed_checkpoint.json"
 
 # Common Goose songs (for matching)
 KNOWN_SONGS = {
@@ -43,9 +66,24 @@ KNOWN_SONGS = {
 }
 
 
+def _parse_item(item):
+    """Process-pool entry point: parse one (date, rows) pair."""
+    date_str, setlist_data = item
+    return parse_setlist(date_str, setlist_data)
+
+
 class ElGooseScraper:
-    def __init__(self):
-        self.session = Session(engine)
+    def __init__(self, workers=4, batch_size=BATCH_SIZE, checkpoint_path=DEFAULT_CHECKPOINT,
+                 resume=True, client_options=None, db_engine=None, cache=None):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.resume = resume
+        self.client_options = client_options or {}
+        self.engine = db_engine or engine
+        self.client = ElGooseClient(**self.client_options) if self.client_options else get_elgoose_client()
+        self.cache = cache or get_cache_manager()
+        self.completed = self.load_checkpoint() if resume else set()
         self.stats = {
             "shows_found": 0,
             "shows_created": 0,
@@ -55,195 +93,140 @@ class ElGooseScraper:
             "errors": 0,
         }
 
-    def fetch_show_by_date(self, date_str):
+    def load_checkpoint(self):
+        """Dates finished by a previous run."""
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return set()
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                return set(json.load(f).get("completed", []))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {e}")
+            return set()
+
+    def save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"completed": sorted(self.completed)}, f)
+        tmp_path.replace(self.checkpoint_path)
+
+    def discover_dates(self, start_date, end_date):
         """
-        Fetch setlist data for a specific date from El Goose API.
-        Returns list of songs or None if no show found.
+        Dates in the range that had a show, from one call to the show index.
+        Falls back to every day in the range if the index is unavailable.
         """
-        from services.cache_manager import CacheManager
-        cache = CacheManager()
-        cache_key = f"show_date_{date_str}"
-        
-        # Check cache first
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            # logger.info(f"Using cached data for {date_str}") # Reduce noise in bulk scrape
-            return cached_data
-
+        start, end = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
         try:
-            url = f"{EL_GOOSE_BASE_URL}/setlists/showdate/{date_str}.json"
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = None
-                # Check if it's wrapped in 'data' key
-                if isinstance(data, dict) and 'data' in data:
-                    if data.get('error') and data['error'] != 0:
-                        return None
-                    result = data['data']
-                elif isinstance(data, list) and len(data) > 0:
-                    result = data
-                
-                if result:
-                    cache.set(cache_key, result)
-                    return result
-            
-            return None
-        except Exception as e:
-            logger.warning(f"Error fetching {date_str}: {e}")
-            self.stats["errors"] += 1
-            return None
-
-    def get_or_create_song(self, song_name, set_data=None):
-        """Get or create a Song record from setlist data."""
-        try:
-            # Check if song exists
-            existing = self.session.exec(
-                select(Song).where(Song.name == song_name)
-            ).first()
-
-            if existing:
-                return existing
-
-            # Determine if it's a cover based on song data
-            is_cover = False
-            original_artist = None
-
-            if set_data and "artist" in set_data:
-                # Some APIs include artist information
-                is_cover = set_data["artist"] != "Goose"
-                if is_cover:
-                    original_artist = set_data["artist"]
-
-            # Create slug
-            slug = song_name.lower().replace(" ", "-").replace("'", "")
-
-            song = Song(
-                name=song_name,
-                artist="Goose",
-                slug=slug,
-                is_cover=is_cover,
-                original_artist=original_artist,
-            )
-            self.session.add(song)
-            self.session.commit()
-            self.session.refresh(song)
-            self.stats["songs_created"] += 1
-            return song
-        except Exception as e:
-            logger.error(f"Error creating song '{song_name}': {e}")
-            self.session.rollback()
-            self.stats["errors"] += 1
-            return None
-
-    def create_show(self, date_str, setlist_data):
-        """Create a Show and its SongPerformance records."""
-        try:
-            if not setlist_data or len(setlist_data) == 0:
-                return None
-
-            first_item = setlist_data[0]
-
-            # Extract show info
-            elgoose_id = first_item.get("show_id") or first_item.get("showid")
-            if not elgoose_id:
-                logger.warning(f"No show_id found for {date_str}")
-                return None
-
-            # Check if show already exists
-            existing = self.session.exec(
-                select(Show).where(Show.elgoose_id == elgoose_id)
-            ).first()
-
-            if existing:
-                self.stats["shows_skipped"] += 1
-                return existing
-
-            venue = first_item.get("venuename", "Unknown Venue")
-            city = first_item.get("city", "Unknown City")
-            state = first_item.get("state", "")
-            location = f"{city}, {state}" if state else city
-
-            # Create show
-            show = Show(
-                elgoose_id=elgoose_id,
-                date=date_str,
-                venue=venue,
-                location=location,
-                setlist_data=json.dumps(setlist_data),
-            )
-            self.session.add(show)
-            self.session.flush()  # Get the show ID
-
-            # Create performances
-            position = 1
-            current_set = 1
-
-            for item in setlist_data:
-                song_name = item.get("songname")
-                if not song_name:
-                    continue
-
-                song = self.get_or_create_song(song_name, item)
-                if not song:
-                    continue
+            index = self.client.get_show_index()
+        except ElGooseError as e:
+            logger.warning(f"Show index unavailable ({e}); probing every day in range")
+            index = None
 
-                # Detect set changes
-                set_name = item.get("setname", f"Set {current_set}")
-                if "Encore" in set_name:
-                    current_set = 3
-                elif set_name and "2" in set_name:
-                    current_set = 2
-
-                performance = SongPerformance(
-                    song_id=song.id,
-                    show_id=show.id,
-                    position=position,
-                    set_number=current_set,
-                    notes=None,  # Could extract encore/guest info here
-                )
-                self.session.add(performance)
-                position += 1
-                self.stats["performances_created"] += 1
+        if index is not None:
+            return index_dates(index, start, end)
 
-            self.session.commit()
-            self.stats["shows_created"] += 1
-            logger.info(f"✓ Created show: {venue} on {date_str} ({len(setlist_data)} songs)")
-            return show
+        dates = []
+        current = start_date
+        while current <= end_date:
+            dates.append(current.strftime("%Y-%m-%d"))
+            current += timedelta(days=1)
+        return dates
 
-        except Exception as e:
-            logger.error(f"Error creating show for {date_str}: {e}")
-            self.session.rollback()
-            self.stats["errors"] += 1
-            return None
+    def fetch_setlists(self, dates):
+        """
+        Setlists for ``dates``: cached ones from the CacheManager, the rest
+        downloaded concurrently. Dates without a show are omitted.
+        """
+        setlists = {}
+        to_fetch = []
+        for date_str in dates:
+            # A negative entry means "no show on this date"
+            found, cached_data = self.cache.lookup(f"show_date_{date_str}")
+            if not found:
+                to_fetch.append(date_str)
+            elif cached_data:
+                setlists[date_str] = cached_data
+
+        if to_fetch:
+            async def download():
+                async with AsyncElGooseClient(**self.client_options) as client:
+                    return await client.get_setlists(to_fetch)
+
+            for date_str, result in asyncio.run(download()).items():
+                cache_key = f"show_date_{date_str}"
+                if isinstance(result, ElGooseError):
+                    logger.warning(f"Error fetching {date_str}: {result}")
+                    self.stats["errors"] += 1
+                elif result:
+                    self.cache.set(cache_key, result)
+                    setlists[date_str] = result
+                elif result is not None:
+                    self.cache.set_negative(cache_key, negative_ttl_for_date(date_str))
+        return setlists
+
+    def parse_setlists(self, setlists, executor=None):
+        items = sorted(setlists.items())
+        if executor is None:
+            return [_parse_item(item) for item in items]
+        return list(executor.map(_parse_item, items))
+
+    def insert_batch(self, parsed_shows):
+        """Insert one batch of parsed shows in a single transaction."""
+        with Session(self.engine) as session:
+            songs_before = session.exec(select(func.count(Song.id))).one()
+            counts = insert_shows(session, parsed_shows)
+            songs_after = session.exec(select(func.count(Song.id))).one()
+            session.commit()
+
+        self.stats["songs_created"] += songs_after - songs_before
+        for key, value in counts.items():
+            self.stats[key] += value
 
     def scrape_date_range(self, start_date, end_date, limit=None):
         """Scrape all shows within a date range."""
-        current = start_date
-        count = 0
-
         logger.info(f"Starting scrape from {start_date.date()} to {end_date.date()}")
-        logger.info(f"This may take a while... fetching shows one day at a time")
-
-        while current <= end_date:
-            if limit and count >= limit:
-                logger.info(f"Reached limit of {limit} shows")
-                break
 
-            date_str = current.strftime("%Y-%m-%d")
+        dates = [d for d in self.discover_dates(start_date, end_date) if d not in self.completed]
+        logger.info(f"{len(dates)} dates to import ({len(self.completed)} already done)")
 
-            setlist_data = self.fetch_show_by_date(date_str)
-            if setlist_data:
-                self.stats["shows_found"] += 1
-                self.create_show(date_str, setlist_data)
-                count += 1
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            for i in range(0, len(dates), self.batch_size):
+                if limit and self.stats["shows_found"] >= limit:
+                    logger.info(f"Reached limit of {limit} shows")
+                    break
+
+                batch = dates[i:i + self.batch_size]
+                errors_before = self.stats["errors"]
+                setlists = self.fetch_setlists(batch)
+                if limit:
+                    remaining = limit - self.stats["shows_found"]
+                    setlists = dict(sorted(setlists.items())[:remaining])
+                self.stats["shows_found"] += len(setlists)
+
+                parsed = [show for show in self.parse_setlists(setlists, executor) if show]
+                try:
+                    self.insert_batch(parsed)
+                except Exception as e:
+                    logger.error(f"Error inserting batch starting {batch[0]}: {e}")
+                    self.stats["errors"] += 1
+                    continue
 
-            current += timedelta(days=1)
+                # Only checkpoint a batch that had no fetch failures
+                if self.stats["errors"] == errors_before and not limit:
+                    self.completed.update(batch)
+                    self.save_checkpoint()
 
-            # Progress indicator
-            if count % 10 == 0:
-                logger.info(f"Progress: {count} shows found, {self.stats['shows_created']} created")
+                logger.info(
+                    f"Progress: {self.stats['shows_found']} shows found, "
+                    f"{self.stats['shows_created']} created"
+                )
+        finally:
+            if executor:
+                executor.shutdown()
 
     def print_stats(self):
         """Print final statistics."""
@@ -283,6 +266,23 @@ def main():
         default=None,
         help="Limit number of shows to fetch (for testing)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Processes used to parse setlists. Default: 4"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default=str(DEFAULT_CHECKPOINT),
+        help="File recording imported dates, for resuming interrupted runs"
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore the checkpoint and re-import every date in the range"
+    )
 
     args = parser.parse_args()
 
@@ -306,7 +306,11 @@ def main():
     logger.info("="*60 + "\n")
 
     # Run scraper
-    scraper = ElGooseScraper()
+    scraper = ElGooseScraper(
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        resume=not args.no_resume,
+    )
     scraper.scrape_date_range(start_date, end_date, limit=args.limit)
     scraper.print_stats()
 
@@ -0,0 +1,306 @@
+"""
+Analytics Retention Service
+
+Keeps AnalyticsEvent bounded. Whole calendar months older than
+RETENTION_DAYS are exported to gzipped NDJSON archives in ARCHIVE_DIR
+(``analyticsevent-YYYY-MM.ndjson.gz``, plus numbered parts for
+events that arrive after their month was archived) and then removed:
+- Postgres: AnalyticsEvent is range-partitioned by month (``partition``
+  converts an existing table once; ``ensure_analytics_partitions`` creates
+  upcoming partitions on startup), so removing a month is
+  DETACH + DROP of its partition
+- SQLite: the month is deleted in one statement on the timestamp index
+
+The export is written and renamed into place before anything is removed,
+and the removal is a single transaction, so a failed run can simply be
+repeated.
+
+Rollups (see AnalyticsRollupService) are kept indefinitely.
+``rollup_archives`` recomputes rollups for a range from the archives plus
+whatever is still live, e.g. after ``rollup_analytics.py --rebuild``.
+"""
+
+import glob
+import gzip
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, text
+from sqlmodel import Session, func, insert, select
+
+from api.models import AnalyticsEvent, AnalyticsRollup
+from api.services.analytics_rollup import GRANULARITIES, ceil_bucket, floor_bucket
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = int(os.getenv("ANALYTICS_RETENTION_DAYS", 90))
+ARCHIVE_DIR = os.getenv("ANALYTICS_ARCHIVE_DIR", "./analytics_archive")
+# Monthly partitions created ahead of time on Postgres
+PARTITION_MONTHS_AHEAD = 2
+BATCH_SIZE = 1000
+
+COLUMNS = ["id", "event_type", "path", "metadata_json", "session_id", "user_id", "timestamp"]
+_ARCHIVE_NAME = re.compile(r"analyticsevent-(\d{4})-(\d{2})(?:\.(\d+))?\.ndjson\.gz$")
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"analyticsevent_{month:%Y_%m}"
+
+
+def _archives(pattern: str) -> List[Tuple[datetime, str]]:
+    """(month, path) of archive files matching a glob, in month then part order."""
+    found = []
+    for path in glob.glob(pattern):
+        match = _ARCHIVE_NAME.search(path)
+        if match:
+            year, month, part = match.groups()
+            found.append((datetime(int(year), int(month), 1), int(part or 0), path))
+    return [(month, path) for month, _, path in sorted(found)]
+
+
+def archive_parts(archive_dir: str, month: datetime) -> List[str]:
+    return [path for _, path in _archives(os.path.join(archive_dir, f"analyticsevent-{month:%Y-%m}*.ndjson.gz"))]
+
+
+def _archived_max_id(archive_dir: str, month: datetime) -> int:
+    max_id = 0
+    for path in archive_parts(archive_dir, month):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                max_id = max(max_id, json.loads(line)["id"])
+    return max_id
+
+
+def is_partitioned(connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'analyticsevent'::regclass"
+    )).first() is not None
+
+
+def _create_partition(connection, month: datetime) -> None:
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF analyticsevent "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month(month):%Y-%m-%d}')"
+    ))
+
+
+def ensure_analytics_partitions(connection, now: Optional[datetime] = None) -> None:
+    """Create this month's and the next PARTITION_MONTHS_AHEAD partitions (Postgres, once partitioned)."""
+    if not is_partitioned(connection):
+        return
+    month = month_start(now or datetime.utcnow())
+    for _ in range(PARTITION_MONTHS_AHEAD + 1):
+        _create_partition(connection, month)
+        month = next_month(month)
+
+
+def _row(event: dict) -> dict:
+    return {**event, "timestamp": event["timestamp"].isoformat()}
+
+
+class AnalyticsRetentionService:
+    """Service for analytics partitioning, retention and archives."""
+
+    @staticmethod
+    def partition(connection) -> int:
+        """
+        Convert AnalyticsEvent into a table range-partitioned by month (Postgres only).
+        Run once, in a transaction, during a quiet period: existing rows are copied.
+
+        Returns:
+            Number of partitions created, 0 if already partitioned
+        """
+        if connection.dialect.name != "postgresql":
+            raise ValueError("Native partitioning requires Postgres")
+        if is_partitioned(connection):
+            return 0
+
+        first = connection.execute(text("SELECT min(timestamp) FROM analyticsevent")).scalar()
+        for statement in [
+            "ALTER TABLE analyticsevent RENAME TO analyticsevent_unpartitioned",
+            "ALTER TABLE analyticsevent_unpartitioned RENAME CONSTRAINT analyticsevent_pkey "
+            "TO analyticsevent_unpartitioned_pkey",
+            "DROP INDEX IF EXISTS ix_analyticsevent_timestamp",
+            "CREATE TABLE analyticsevent ("
+            "id INTEGER NOT NULL DEFAULT nextval('analyticsevent_id_seq'), "
+            "event_type VARCHAR NOT NULL, path VARCHAR NOT NULL, metadata_json VARCHAR, "
+            "session_id VARCHAR NOT NULL, user_id INTEGER, timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL, "
+            "PRIMARY KEY (id, timestamp)) PARTITION BY RANGE (timestamp)",
+            "ALTER SEQUENCE analyticsevent_id_seq OWNED BY analyticsevent.id",
+            "CREATE INDEX ix_analyticsevent_timestamp ON analyticsevent (timestamp)",
+            "CREATE TABLE analyticsevent_default PARTITION OF analyticsevent DEFAULT",
+        ]:
+            connection.execute(text(statement))
+
+        now = month_start(datetime.utcnow())
+        month, created = month_start(first or now), 0
+        while month <= now:
+            _create_partition(connection, month)
+            month, created = next_month(month), created + 1
+        ensure_analytics_partitions(connection)
+
+        connection.execute(text(
+            f"INSERT INTO analyticsevent ({', '.join(COLUMNS)}) "
+            f"SELECT {', '.join(COLUMNS)} FROM analyticsevent_unpartitioned"
+        ))
+        connection.execute(text("DROP TABLE analyticsevent_unpartitioned"))
+        logger.info(f"AnalyticsEvent partitioned by month ({created} partitions for existing data)")
+        return created + PARTITION_MONTHS_AHEAD
+
+    @staticmethod
+    def expired_months(session: Session, now: Optional[datetime] = None,
+                       retention_days: int = RETENTION_DAYS) -> List[datetime]:
+        """Months that end before the retention cutoff and still have live events."""
+        cutoff = month_start((now or datetime.utcnow()) - timedelta(days=retention_days))
+        first = session.exec(select(func.min(AnalyticsEvent.timestamp))).one()
+        months = []
+        month = month_start(first) if first else cutoff
+        while month < cutoff:
+            months.append(month)
+            month = next_month(month)
+        return months
+
+    @staticmethod
+    def archive_month(session: Session, month: datetime, archive_dir: str = ARCHIVE_DIR) -> int:
+        """
+        Export one month of events to its archive file, then remove them and commit.
+
+        Returns:
+            Number of events archived
+        """
+        os.makedirs(archive_dir, exist_ok=True)
+        end = next_month(month)
+        in_month = (AnalyticsEvent.timestamp >= month, AnalyticsEvent.timestamp < end)
+
+        # A month archived before gets another part: late events, or the rows of a
+        # run that failed after writing its file (ids already archived are skipped)
+        parts = archive_parts(archive_dir, month)
+        archived_max_id = _archived_max_id(archive_dir, month) if parts else 0
+        suffix = f".{len(parts)}" if parts else ""
+        path = os.path.join(archive_dir, f"analyticsevent-{month:%Y-%m}{suffix}.ndjson.gz")
+
+        events = 0
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            result = session.execute(
+                select(*[getattr(AnalyticsEvent, column) for column in COLUMNS])
+                .where(*in_month, AnalyticsEvent.id > archived_max_id)
+                .order_by(AnalyticsEvent.id)
+                .execution_options(yield_per=BATCH_SIZE)
+            )
+            for partition in result.mappings().partitions():
+                f.writelines(json.dumps(_row(dict(row))) + "\n" for row in partition)
+                events += len(partition)
+        if events:
+            os.replace(path + ".tmp", path)
+        else:
+            os.remove(path + ".tmp")
+
+        connection = session.connection()
+        name = partition_name(month)
+        if is_partitioned(connection) and connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+            connection.execute(text(f"ALTER TABLE analyticsevent DETACH PARTITION {name}"))
+            connection.execute(text(f"DROP TABLE {name}"))
+        else:
+            session.exec(delete(AnalyticsEvent).where(*in_month))
+        session.commit()
+        logger.info(f"Archived {events} analytics events for {month:%Y-%m} to {path}")
+        return events
+
+    @staticmethod
+    def apply_retention(session: Session, now: Optional[datetime] = None, retention_days: int = RETENTION_DAYS,
+                        archive_dir: str = ARCHIVE_DIR) -> Dict[str, int]:
+        """
+        Archive and remove every expired month.
+
+        Returns:
+            {"YYYY-MM": events archived} per month
+        """
+        if is_partitioned(session.connection()):
+            ensure_analytics_partitions(session.connection(), now)
+            session.commit()
+        return {
+            f"{month:%Y-%m}": AnalyticsRetentionService.archive_month(session, month, archive_dir)
+            for month in AnalyticsRetentionService.expired_months(session, now, retention_days)
+        }
+
+    @staticmethod
+    def iter_archived_events(archive_dir: str = ARCHIVE_DIR, start: Optional[datetime] = None,
+                             end: Optional[datetime] = None) -> Iterator[dict]:
+        """
+        Read archived events in [start, end), skipping archive files outside the range.
+
+        Yields:
+            Event dicts with the AnalyticsEvent columns; ``timestamp`` is a datetime
+        """
+        for month, path in _archives(os.path.join(archive_dir, "analyticsevent-*.ndjson.gz")):
+            if (end and month >= end) or (start and next_month(month) <= start):
+                continue
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    event = json.loads(line)
+                    event["timestamp"] = datetime.fromisoformat(event["timestamp"])
+                    if (start and event["timestamp"] < start) or (end and event["timestamp"] >= end):
+                        continue
+                    yield event
+
+    @staticmethod
+    def _live_events(session: Session, start: datetime, end: datetime) -> Iterator[dict]:
+        result = session.execute(
+            select(AnalyticsEvent.event_type, AnalyticsEvent.path, AnalyticsEvent.session_id, AnalyticsEvent.timestamp)
+            .where(AnalyticsEvent.timestamp >= start, AnalyticsEvent.timestamp < end)
+            .execution_options(yield_per=BATCH_SIZE)
+        )
+        for row in result.mappings():
+            yield dict(row)
+
+    @staticmethod
+    def rollup_archives(session: Session, start: datetime, end: datetime, archive_dir: str = ARCHIVE_DIR) -> int:
+        """
+        Recompute hour and day rollups for [start, end) from archived and live events, then commit.
+        The range is widened to whole days so every bucket it touches is complete.
+
+        Returns:
+            Number of rollup rows written
+        """
+        start, end = floor_bucket(start, "day"), ceil_bucket(end, "day")
+        buckets: Dict[tuple, list] = defaultdict(lambda: [0, set()])
+        sources: List[Iterable[dict]] = [
+            AnalyticsRetentionService.iter_archived_events(archive_dir, start, end),
+            AnalyticsRetentionService._live_events(session, start, end),
+        ]
+        for source in sources:
+            for event in source:
+                for granularity in GRANULARITIES:
+                    bucket = buckets[(granularity, floor_bucket(event["timestamp"], granularity),
+                                      event["event_type"], event["path"])]
+                    bucket[0] += 1
+                    bucket[1].add(event["session_id"])
+
+        session.exec(
+            delete(AnalyticsRollup).where(AnalyticsRollup.bucket_start >= start, AnalyticsRollup.bucket_start < end)
+        )
+        rows = [
+            {"granularity": granularity, "bucket_start": bucket_start, "event_type": event_type, "path": path,
+             "count": count, "unique_sessions": len(sessions)}
+            for (granularity, bucket_start, event_type, path), (count, sessions) in buckets.items()
+        ]
+        if rows:
+            session.exec(insert(AnalyticsRollup), params=rows)
+        session.commit()
+        logger.info(f"Rolled up {len(rows)} buckets from archives for {start:%Y-%m-%d}..{end:%Y-%m-%d}")
+        return len(rows)
@@ -0,0 +1,231 @@
+"""
+Analytics Rollup Service
+
+Aggregates AnalyticsEvent into AnalyticsRollup rows, one per
+(granularity, bucket_start, event_type, path), at hour and day
+granularity, so ``/analytics/stats`` reads a few hundred rollup rows
+instead of counting raw events.
+
+Runs are incremental. AnalyticsRollupState records the highest event id
+already rolled up; a run finds the time span covered by newer events and
+recomputes just the buckets in that span from the raw table (delete +
+``INSERT ... SELECT``). Recomputing whole buckets keeps ``unique_sessions``
+exact and makes runs idempotent.
+
+Runs are triggered by ``rollup_analytics.py`` (cron) and, when the rollups
+are older than REFRESH_SECONDS, in the background by ``/analytics/stats``.
+
+Range queries use day buckets for the whole days in a range and hour
+buckets for the partial days at either end. Per-bucket uniques don't
+merge, so a range reports ``session_buckets``: the sum of per-bucket
+uniques, which counts a session once per bucket it was active in.
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, literal
+from sqlmodel import Session, and_, func, insert, or_, select
+
+from api import database
+from api.models import AnalyticsEvent, AnalyticsRollup, AnalyticsRollupState
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "analytics_rollup"
+REFRESH_SECONDS = int(os.getenv("ANALYTICS_ROLLUP_REFRESH_SECONDS", 300))
+GRANULARITIES = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+_run_lock = threading.Lock()
+
+
+def floor_bucket(value: datetime, granularity: str) -> datetime:
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if granularity == "day" else value
+
+
+def ceil_bucket(value: datetime, granularity: str) -> datetime:
+    floor = floor_bucket(value, granularity)
+    return floor if floor == value else floor + GRANULARITIES[granularity]
+
+
+def _bucket_expr(session: Session, granularity: str):
+    """SQL expression truncating AnalyticsEvent.timestamp to the bucket start."""
+    if session.get_bind().dialect.name == "sqlite":
+        # Same text format SQLAlchemy uses for DateTime on SQLite, so comparisons line up
+        fmt = "%Y-%m-%d 00:00:00.000000" if granularity == "day" else "%Y-%m-%d %H:00:00.000000"
+        return func.strftime(fmt, AnalyticsEvent.timestamp)
+    return func.date_trunc(granularity, AnalyticsEvent.timestamp)
+
+
+class AnalyticsRollupService:
+    """Service for maintaining and querying analytics rollups."""
+
+    @staticmethod
+    def _recompute(session: Session, granularity: str, start: datetime, end: datetime) -> int:
+        """Replace the rollups of one granularity for buckets in [start, end)."""
+        session.exec(
+            delete(AnalyticsRollup).where(
+                AnalyticsRollup.granularity == granularity,
+                AnalyticsRollup.bucket_start >= start,
+                AnalyticsRollup.bucket_start < end,
+            )
+        )
+        bucket = _bucket_expr(session, granularity)
+        aggregated = (
+            select(
+                literal(granularity),
+                bucket,
+                AnalyticsEvent.event_type,
+                AnalyticsEvent.path,
+                func.count(AnalyticsEvent.id),
+                func.count(func.distinct(AnalyticsEvent.session_id)),
+            )
+            .where(AnalyticsEvent.timestamp >= start, AnalyticsEvent.timestamp < end)
+            .group_by(bucket, AnalyticsEvent.event_type, AnalyticsEvent.path)
+        )
+        result = session.exec(
+            insert(AnalyticsRollup).from_select(
+                ["granularity", "bucket_start", "event_type", "path", "count", "unique_sessions"],
+                aggregated,
+            )
+        )
+        return result.rowcount or 0
+
+    @staticmethod
+    def recompute_range(session: Session, start: datetime, end: datetime) -> int:
+        """
+        Recompute hour and day rollups for every bucket overlapping [start, end].
+        The caller commits.
+
+        Returns:
+            Number of rollup rows written
+        """
+        written = 0
+        for granularity in GRANULARITIES:
+            written += AnalyticsRollupService._recompute(
+                session,
+                granularity,
+                floor_bucket(start, granularity),
+                floor_bucket(end, granularity) + GRANULARITIES[granularity],
+            )
+        return written
+
+    @staticmethod
+    def run(session: Session) -> Dict[str, int]:
+        """
+        Roll up events added since the last run, then commit.
+
+        Returns:
+            {"events": new events seen, "rollups": rollup rows written, "last_event_id": new watermark}
+        """
+        state = session.get(AnalyticsRollupState, STATE_NAME) or AnalyticsRollupState(name=STATE_NAME)
+        max_id, events, first, last = session.exec(
+            select(
+                func.max(AnalyticsEvent.id),
+                func.count(AnalyticsEvent.id),
+                func.min(AnalyticsEvent.timestamp),
+                func.max(AnalyticsEvent.timestamp),
+            ).where(AnalyticsEvent.id > state.last_event_id)
+        ).one()
+
+        written = 0
+        if max_id is not None:
+            written = AnalyticsRollupService.recompute_range(session, first, last)
+            state.last_event_id = max_id
+        state.updated_at = datetime.utcnow()
+        session.add(state)
+        session.commit()
+        logger.info(f"Analytics rollup: {events} new events, {written} rollup rows written")
+        return {"events": events, "rollups": written, "last_event_id": state.last_event_id}
+
+    @staticmethod
+    def rebuild_all(session: Session) -> Dict[str, int]:
+        """Drop every rollup and the watermark, then roll up the whole event table."""
+        session.exec(delete(AnalyticsRollup))
+        session.exec(delete(AnalyticsRollupState).where(AnalyticsRollupState.name == STATE_NAME))
+        session.commit()
+        return AnalyticsRollupService.run(session)
+
+    @staticmethod
+    def is_stale(session: Session) -> bool:
+        state = session.get(AnalyticsRollupState, STATE_NAME)
+        return not state or not state.updated_at or (
+            datetime.utcnow() - state.updated_at > timedelta(seconds=REFRESH_SECONDS)
+        )
+
+    @staticmethod
+    def run_in_background() -> None:
+        """Background-task entry point: run in its own session, once at a time per process."""
+        if not _run_lock.acquire(blocking=False):
+            return
+        try:
+            with Session(database.engine) as session:
+                AnalyticsRollupService.run(session)
+        except Exception as e:
+            logger.error(f"Analytics rollup failed: {e}")
+        finally:
+            _run_lock.release()
+
+    @staticmethod
+    def _range_filter(start: datetime, end: datetime):
+        """Whole days from day buckets, partial days at either end from hour buckets."""
+        day_start, day_end = ceil_bucket(start, "day"), floor_bucket(end, "day")
+        if day_start >= day_end:
+            return and_(
+                AnalyticsRollup.granularity == "hour",
+                AnalyticsRollup.bucket_start >= start,
+                AnalyticsRollup.bucket_start < end,
+            )
+        return or_(
+            and_(
+                AnalyticsRollup.granularity == "day",
+                AnalyticsRollup.bucket_start >= day_start,
+                AnalyticsRollup.bucket_start < day_end,
+            ),
+            and_(
+                AnalyticsRollup.granularity == "hour",
+                or_(
+                    and_(AnalyticsRollup.bucket_start >= start, AnalyticsRollup.bucket_start < day_start),
+                    and_(AnalyticsRollup.bucket_start >= day_end, AnalyticsRollup.bucket_start < end),
+                ),
+            ),
+        )
+
+    @staticmethod
+    def stats(session: Session, start: datetime, end: datetime, event_type: str = "page_view",
+              limit: int = 10) -> Tuple[int, int, List[Tuple[str, int]], Optional[datetime]]:
+        """
+        Totals and top paths for one event type over [start, end), at hour resolution.
+
+        Args:
+            session: Database session
+            start: Range start, rounded down to the hour
+            end: Range end, rounded up to the hour
+            event_type: Event type to count
+            limit: Number of top paths
+
+        Returns:
+            Tuple of (count, session_buckets, [(path, count)], rolled up as of)
+        """
+        start, end = floor_bucket(start, "hour"), ceil_bucket(end, "hour")
+        where = and_(AnalyticsRollup.event_type == event_type, AnalyticsRollupService._range_filter(start, end))
+        count, session_buckets = session.exec(
+            select(
+                func.coalesce(func.sum(AnalyticsRollup.count), 0),
+                func.coalesce(func.sum(AnalyticsRollup.unique_sessions), 0),
+            ).where(where)
+        ).one()
+        total = func.sum(AnalyticsRollup.count).label("total")
+        top = session.exec(
+            select(AnalyticsRollup.path, total)
+            .where(where)
+            .group_by(AnalyticsRollup.path)
+            .order_by(total.desc(), AnalyticsRollup.path)
+            .limit(limit)
+        ).all()
+        state = session.get(AnalyticsRollupState, STATE_NAME)
+        return count, session_buckets, [(path, n) for path, n in top], state.updated_at if state else None
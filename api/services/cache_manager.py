@@ -1,72 +1,249 @@
 import json
-import os
 import logging
-from datetime import datetime
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import date, timedelta
 from pathlib import Path
+from typing import Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# How long "no show on this date" answers are remembered
+NEGATIVE_TTL = 6 * 60 * 60
+# Dates this recent (or in the future) may get a setlist any minute, e.g.
+# during or right after a show, so their negative answers expire quickly
+RECENT_SHOW_DAYS = 3
+RECENT_NEGATIVE_TTL = 5 * 60
+
+
+def negative_ttl_for_date(date_str: str) -> float:
+    """Negative-cache TTL for a show date in YYYY-MM-DD format."""
+    try:
+        show_date = date.fromisoformat(date_str)
+    except ValueError:
+        return NEGATIVE_TTL
+    if show_date >= date.today() - timedelta(days=RECENT_SHOW_DAYS):
+        return RECENT_NEGATIVE_TTL
+    return NEGATIVE_TTL
+
+
 class CacheManager:
     """
-    Simple file-based cache manager for storing API responses.
+    Tiered cache manager for storing API responses.
+
+    Tier 1 is an in-memory LRU bounded by the total size of the encoded
+    entries. Tier 2 is a single SQLite file holding zlib-compressed compact
+    JSON. Entries may carry a TTL, and ``set_negative`` remembers that a key
+    has no data (e.g. no show on a date) so repeated lookups skip the network.
+
+    Use ``get_cache_manager()`` to share one instance per cache directory.
     """
-    
-    def __init__(self, cache_dir: str = "api/data/cache"):
+
+    def __init__(self, cache_dir: str = "api/data/cache", max_memory_bytes: int = 8 * 1024 * 1024):
         self.cache_dir = Path(cache_dir)
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
         self._ensure_cache_dir()
-        
+
     def _ensure_cache_dir(self):
-        """Ensure the cache directory exists."""
-        if not self.cache_dir.exists():
-            try:
-                self.cache_dir.mkdir(parents=True, exist_ok=True)
-                logger.info(f"Created cache directory at {self.cache_dir}")
-            except Exception as e:
-                logger.error(f"Failed to create cache directory: {e}")
+        """Ensure the cache directory and database exist."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._connect().execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialise cache at {self.cache_dir}: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.cache_dir / "cache.db"), timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode(data) -> bytes:
+        return zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(blob: bytes):
+        return json.loads(zlib.decompress(blob))
 
     def _get_file_path(self, key: str) -> Path:
-        """Get the file path for a given key."""
+        """Get the legacy per-key file path for a given key."""
         # Sanitize key to be safe for filenames
         safe_key = "".join(c for c in key if c.isalnum() or c in ('-', '_', '.'))
         return self.cache_dir / f"{safe_key}.json"
 
-    def get(self, key: str):
+    def _remember(self, key: str, expires_at: Optional[float], blob: bytes):
+        """Insert into the memory tier, evicting least recently used entries."""
+        if len(blob) > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous:
+                self._memory_bytes -= len(previous[1])
+            self._memory[key] = (expires_at, blob)
+            self._memory_bytes += len(blob)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self.stats["evictions"] += 1
+
+    def _forget(self, key: str):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous:
+                self._memory_bytes -= len(previous[1])
+
+    def _load_legacy(self, key: str) -> Optional[bytes]:
+        """Import an entry written by the old file-per-key cache, if present."""
+        file_path = self._get_file_path(key)
+        if not file_path.exists():
+            return None
+        with open(file_path, 'r', encoding='utf-8') as f:
+            blob = self._encode(json.load(f))
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, NULL)",
+            (key, blob),
+        )
+        return blob
+
+    def lookup(self, key: str) -> Tuple[bool, Any]:
         """
-        Retrieve data from cache.
-        
+        Retrieve data from cache, distinguishing misses from negative entries.
+
         Args:
             key: The cache key.
-            
+
         Returns:
-            The cached data (dict/list) or None if not found/error.
+            (found, data). ``found`` is True for negative entries too, in
+            which case ``data`` is None.
         """
-        file_path = self._get_file_path(key)
-        
-        if not file_path.exists():
-            return None
-            
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None:
+            expires_at, blob = entry
+            if expires_at is None or expires_at > now:
+                self.stats["memory_hits"] += 1
+                data = self._decode(blob)
+                if data is None:
+                    self.stats["negative_hits"] += 1
+                return True, data
+            self._forget(key)
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.debug(f"Cache hit for key: {key}")
-                return data
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache_entry WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                self.delete(key)
+                self.stats["expirations"] += 1
+                row = None
+            if row is None:
+                blob = self._load_legacy(key)
+                row = (blob, None) if blob is not None else None
         except Exception as e:
             logger.warning(f"Failed to read cache for key {key}: {e}")
-            return None
+            row = None
+
+        if row is None:
+            self.stats["misses"] += 1
+            return False, None
+
+        blob, expires_at = row
+        self._remember(key, expires_at, blob)
+        self.stats["disk_hits"] += 1
+        data = self._decode(blob)
+        if data is None:
+            self.stats["negative_hits"] += 1
+        logger.debug(f"Cache hit for key: {key}")
+        return True, data
 
-    def set(self, key: str, data):
+    def get(self, key: str):
+        """
+        Retrieve data from cache.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached data (dict/list) or None if not found, negative or expired.
+        """
+        return self.lookup(key)[1]
+
+    def set(self, key: str, data, ttl: Optional[float] = None):
         """
         Save data to cache.
-        
+
         Args:
             key: The cache key.
             data: The data to cache (must be JSON serializable).
+            ttl: Seconds until the entry expires (None keeps it forever).
         """
-        file_path = self._get_file_path(key)
-        
+        expires_at = time.time() + ttl if ttl else None
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-                logger.debug(f"Cached data for key: {key}")
+            blob = self._encode(data)
+            self._connect().execute(
+                "INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, blob, expires_at),
+            )
+            self._remember(key, expires_at, blob)
+            logger.debug(f"Cached data for key: {key}")
         except Exception as e:
             logger.error(f"Failed to write cache for key {key}: {e}")
+
+    def set_negative(self, key: str, ttl: float = NEGATIVE_TTL):
+        """Remember that ``key`` has no data for ``ttl`` seconds."""
+        self.set(key, None, ttl=ttl)
+
+    def delete(self, key: str):
+        """Remove a key from both tiers."""
+        self._forget(key)
+        try:
+            self._connect().execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+        except Exception as e:
+            logger.warning(f"Failed to delete cache key {key}: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from the disk tier. Returns the number removed."""
+        cursor = self._connect().execute(
+            "DELETE FROM cache_entry WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (time.time(),),
+        )
+        self.stats["expirations"] += cursor.rowcount
+        return cursor.rowcount
+
+
+_shared: dict = {}
+_shared_lock = threading.Lock()
+
+
+def get_cache_manager(cache_dir: str = "api/data/cache") -> CacheManager:
+    """Return the process-wide CacheManager for ``cache_dir``."""
+    with _shared_lock:
+        cache = _shared.get(cache_dir)
+        if cache is None:
+            cache = _shared[cache_dir] = CacheManager(cache_dir)
+        return cache
@@ -0,0 +1,298 @@
+"""
+Dataset Dump Service
+
+Bulk export of the public catalog for offline analytics, so data consumers
+don't have to page through the API. Each table is streamed from the
+database in batches (a server-side cursor on Postgres) and written as
+gzipped NDJSON and, when ``pyarrow`` is installed, Parquet. Tables are
+dumped in parallel, each in its own session.
+
+Tables:
+- shows, songs, performances: catalog rows (vote and honking counters live
+  in vote_aggregates and honking_versions)
+- vote_aggregates: vote count / rating sum / min / max per voted show or performance
+- tags, tag_assignments: public tags and what they are attached to
+- honking_versions: honking vote counts per (song, performance)
+
+Incremental dumps pick up from the watermarks recorded in the previous
+run's ``manifest.json``. Catalog tables are append-only deltas (rows with
+a higher id), so they carry no counters that change after insert; edits to
+other catalog fields (e.g. a show's tour or links) only show up in full
+dumps. Aggregate tables re-emit every group touched since the watermark,
+including votes re-rated in place (Vote.updated_at). Deletions are not
+tracked, so take a full dump periodically.
+"""
+
+import gzip
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlmodel import Session, func, literal, select, union_all
+
+from api import database
+from api.models import HonkingVersion, PerformanceTag, Show, ShowTag, Song, SongPerformance, SongTag, Tag, Vote
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet output is optional
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+FORMATS = ("ndjson", "parquet")
+MANIFEST = "manifest.json"
+
+
+def _after(column, since: Optional[str]):
+    """Comparison against a watermark: ids are ints, timestamps ISO strings."""
+    if isinstance(since, int):
+        return column > since
+    return column > datetime.fromisoformat(since)
+
+
+def _shows(since):
+    statement = select(
+        Show.id, Show.elgoose_id, Show.date, Show.venue, Show.venue_id, Show.location, Show.tour,
+        Show.bandcamp_url, Show.nugs_url,
+    ).order_by(Show.id)
+    return statement if since is None else statement.where(_after(Show.id, since))
+
+
+def _songs(since):
+    statement = select(
+        Song.id, Song.name, Song.artist, Song.slug, Song.debut_date, Song.times_played, Song.is_cover,
+        Song.original_artist,
+    ).order_by(Song.id)
+    return statement if since is None else statement.where(_after(Song.id, since))
+
+
+def _performances(since):
+    statement = select(
+        SongPerformance.id, SongPerformance.song_id, SongPerformance.show_id, SongPerformance.position,
+        SongPerformance.set_number, SongPerformance.notes,
+    ).order_by(SongPerformance.id)
+    return statement if since is None else statement.where(_after(SongPerformance.id, since))
+
+
+def _vote_aggregates(since):
+    statement = (
+        select(
+            Vote.performance_id, Vote.show_id,
+            func.count(Vote.id).label("votes"),
+            func.sum(Vote.rating).label("rating_sum"),
+            func.min(Vote.rating).label("min_rating"),
+            func.max(Vote.rating).label("max_rating"),
+            func.max(Vote.created_at).label("last_vote_at"),
+            func.max(Vote.updated_at).label("updated_at"),
+        )
+        .group_by(Vote.performance_id, Vote.show_id)
+        .order_by(Vote.performance_id, Vote.show_id)
+    )
+    return statement if since is None else statement.having(_after(func.max(Vote.updated_at), since))
+
+
+def _tags(since):
+    statement = (
+        select(Tag.id, Tag.name, Tag.category, Tag.color, Tag.description, Tag.created_at)
+        .where(Tag.is_private == False)  # noqa: E712
+        .order_by(Tag.id)
+    )
+    return statement if since is None else statement.where(_after(Tag.id, since))
+
+
+def _tag_assignments(since):
+    links = [
+        ("performance", PerformanceTag, PerformanceTag.performance_id),
+        ("show", ShowTag, ShowTag.show_id),
+        ("song", SongTag, SongTag.song_id),
+    ]
+    assignments = union_all(*[
+        select(
+            literal(target_type).label("target_type"),
+            target_id.label("target_id"),
+            link.tag_id.label("tag_id"),
+            link.created_at.label("created_at"),
+        )
+        .join(Tag, Tag.id == link.tag_id)
+        .where(Tag.is_private == False)  # noqa: E712
+        for target_type, link, target_id in links
+    ]).subquery()
+    statement = select(assignments).order_by(assignments.c.created_at)
+    return statement if since is None else statement.where(_after(assignments.c.created_at, since))
+
+
+def _honking_versions(since):
+    statement = (
+        select(
+            HonkingVersion.song_id, HonkingVersion.performance_id,
+            func.count(HonkingVersion.id).label("votes"),
+            func.max(HonkingVersion.updated_at).label("updated_at"),
+        )
+        .group_by(HonkingVersion.song_id, HonkingVersion.performance_id)
+        .order_by(HonkingVersion.song_id, HonkingVersion.performance_id)
+    )
+    if since is None:
+        return statement
+    # Re-emit every performance of a touched song, so moved votes show up on both sides
+    touched = select(HonkingVersion.song_id).where(_after(HonkingVersion.updated_at, since))
+    return statement.where(HonkingVersion.song_id.in_(touched))
+
+
+# table name -> (statement builder taking a watermark, watermark column)
+TABLES = {
+    "shows": (_shows, "id"),
+    "songs": (_songs, "id"),
+    "performances": (_performances, "id"),
+    "vote_aggregates": (_vote_aggregates, "updated_at"),
+    "tags": (_tags, "id"),
+    "tag_assignments": (_tag_assignments, "created_at"),
+    "honking_versions": (_honking_versions, "updated_at"),
+}
+
+
+def _watermark(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _arrow_schema(statement):
+    arrow_types = {
+        int: pyarrow.int64(), float: pyarrow.float64(), bool: pyarrow.bool_(),
+        str: pyarrow.string(), datetime: pyarrow.timestamp("us"),
+    }
+    fields = []
+    for column in statement.selected_columns:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = str
+        fields.append(pyarrow.field(column.name, arrow_types.get(python_type, pyarrow.string())))
+    return pyarrow.schema(fields)
+
+
+def iter_batches(session: Session, table: str, since=None) -> Iterable[List[dict]]:
+    """Stream a dump table as lists of row dicts, BATCH_SIZE rows at a time."""
+    build, _ = TABLES[table]
+    result = session.execute(build(since).execution_options(yield_per=BATCH_SIZE))
+    for partition in result.mappings().partitions():
+        yield [dict(row) for row in partition]
+
+
+class DatasetDumpService:
+    """Service for bulk dataset dumps."""
+
+    @staticmethod
+    def dump_table(out_dir: str, table: str, since=None, formats: Iterable[str] = FORMATS,
+                   suffix: str = "") -> dict:
+        """
+        Dump one table to ``out_dir`` in its own session.
+        Files are written under a temporary name and renamed when complete.
+
+        Args:
+            out_dir: Output directory
+            table: Key of TABLES
+            since: Watermark from a previous dump, or None for everything
+            formats: Subset of FORMATS; parquet is skipped without pyarrow
+            suffix: Appended to file names (used for incremental deltas)
+
+        Returns:
+            Manifest entry: {"rows", "watermark", "since", "files"}
+        """
+        build, watermark_column = TABLES[table]
+        paths = {"ndjson": os.path.join(out_dir, f"{table}{suffix}.ndjson.gz")}
+        if "parquet" in formats and pyarrow is not None:
+            paths["parquet"] = os.path.join(out_dir, f"{table}{suffix}.parquet")
+
+        rows, watermark = 0, since
+        ndjson = gzip.open(paths["ndjson"] + ".tmp", "wt", encoding="utf-8") if "ndjson" in formats else None
+        parquet = None
+        if "parquet" in paths:
+            schema = _arrow_schema(build(since))
+            parquet = pyarrow.parquet.ParquetWriter(paths["parquet"] + ".tmp", schema)
+        try:
+            with Session(database.engine) as session:
+                for batch in iter_batches(session, table, since):
+                    rows += len(batch)
+                    batch_max = max(row[watermark_column] for row in batch if row[watermark_column] is not None)
+                    watermark = _watermark(batch_max) if watermark is None else max(watermark, _watermark(batch_max))
+                    if ndjson:
+                        ndjson.writelines(json.dumps(row, default=json_default) + "\n" for row in batch)
+                    if parquet:
+                        parquet.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+        finally:
+            if ndjson:
+                ndjson.close()
+            if parquet:
+                parquet.close()
+
+        files = []
+        for fmt, path in paths.items():
+            if fmt in formats:
+                os.replace(path + ".tmp", path)
+                files.append(os.path.basename(path))
+        logger.info(f"Dumped {table}: {rows} rows")
+        return {"rows": rows, "watermark": watermark, "since": since, "files": files}
+
+    @staticmethod
+    def dump(out_dir: str, tables: Optional[Iterable[str]] = None, incremental: bool = False,
+             formats: Iterable[str] = FORMATS, workers: int = 4) -> dict:
+        """
+        Dump tables in parallel and write ``manifest.json``.
+
+        Args:
+            out_dir: Output directory (created if missing)
+            tables: Subset of TABLES, default all
+            incremental: Only dump rows past the previous manifest's watermarks
+            formats: Subset of FORMATS
+            workers: Tables dumped concurrently
+
+        Returns:
+            The manifest: {"generated_at", "incremental", "tables": {name: entry}}
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        tables = list(tables or TABLES)
+        unknown = [table for table in tables if table not in TABLES]
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+        if "parquet" in formats and pyarrow is None:
+            logger.warning("pyarrow is not installed; skipping Parquet output")
+
+        manifest_path = os.path.join(out_dir, MANIFEST)
+        previous: Dict[str, dict] = {}
+        if incremental and os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                previous = json.load(f).get("tables", {})
+
+        generated_at = datetime.utcnow()
+        suffix = f".since-{generated_at:%Y%m%dT%H%M%S}" if incremental else ""
+
+        def run(table):
+            since = previous.get(table, {}).get("watermark") if incremental else None
+            entry = DatasetDumpService.dump_table(out_dir, table, since, formats, suffix if since is not None else "")
+            if entry["watermark"] is None:
+                entry["watermark"] = since
+            return table, entry
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = dict(pool.map(run, tables))
+
+        manifest = {
+            "generated_at": generated_at.isoformat(),
+            "incremental": incremental,
+            "tables": {**previous, **results},
+        }
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        return manifest
@@ -1,9 +1,8 @@
-import requests
 from datetime import datetime
 
-class SetlistClient:
-    BASE_URL = "https://elgoose.net/api/v2/setlists/showdate"
+from api.services.elgoose_client import AsyncElGooseClient, ElGooseError, get_elgoose_client
 
+class SetlistClient:
     @staticmethod
     def get_setlist(date_obj):
         """
@@ -14,28 +13,29 @@ class SetlistClient:
             str: Formatted setlist string or None if no show found.
         """
         date_str = date_obj.strftime("%Y-%m-%d")
-        url = f"{SetlistClient.BASE_URL}/{date_str}.json"
-        
+        client = get_elgoose_client()
+
         try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                response_data = response.json()
-                # Check if it's the wrapper format
-                if isinstance(response_data, dict) and 'data' in response_data:
-                    if response_data.get('error') and response_data['error'] != 0:
-                        return None
-                    data = response_data['data']
-                else:
-                    # Fallback if it returns list directly (unlikely based on debug, but good for safety)
-                    data = response_data
+            data = client.get_setlist(date_str)
+            if not data:
+                return None
+            return SetlistClient._format_setlist(data, SetlistClient.get_show_links(SetlistClient._show_id(data)))
+        except ElGooseError as e:
+            print(f"Error fetching setlist: {e}")
+            return None
 
-                if not data:
-                    return None
-                return SetlistClient._format_setlist(data)
-            else:
-                # 204 or 404 means no content/not found
+    @staticmethod
+    async def get_setlist_async(date_obj, client: AsyncElGooseClient):
+        """Async variant of get_setlist using a shared AsyncElGooseClient."""
+        date_str = date_obj.strftime("%Y-%m-%d")
+        try:
+            data = await client.get_setlist(date_str)
+            if not data:
                 return None
-        except Exception as e:
+            show_id = SetlistClient._show_id(data)
+            links = await client.get_show_links(show_id) if show_id else []
+            return SetlistClient._format_setlist(data, links)
+        except ElGooseError as e:
             print(f"Error fetching setlist: {e}")
             return None
 
@@ -44,21 +44,23 @@ class SetlistClient:
         """
         Fetches links for a given show ID.
         """
-        url = f"https://elgoose.net/api/v2/links/show_id/{show_id}.json"
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                response_data = response.json()
-                if isinstance(response_data, dict) and 'data' in response_data:
-                    return response_data['data']
+        if not show_id:
             return []
-        except Exception:
+        try:
+            return get_elgoose_client().get_show_links(show_id)
+        except ElGooseError:
             return []
 
     @staticmethod
-    def _format_setlist(data):
+    def _show_id(data):
+        first_item = data[0]
+        return first_item.get('show_id') or first_item.get('showid') # API might vary
+
+    @staticmethod
+    def _format_setlist(data, links=None):
         """
         Formats the API response into a Reddit-friendly string.
+        Performs no I/O; links for the show are passed in by the caller.
         """
         if not data:
             return None
@@ -70,16 +72,12 @@ class SetlistClient:
         state = first_item.get('state', '')
         location = f"{city}, {state}" if state else city
         date_display = datetime.strptime(first_item.get('showdate'), "%Y-%m-%d").strftime("%B %d, %Y")
-        show_id = first_item.get('show_id') or first_item.get('showid') # API might vary
 
-        # Fetch links if show_id is available
         bandcamp_link = None
-        if show_id:
-            links = SetlistClient.get_show_links(show_id)
-            for link in links:
-                if 'bandcamp' in link.get('url', '').lower() or 'bandcamp' in link.get('description', '').lower():
-                    bandcamp_link = link['url']
-                    break
+        for link in links or []:
+            if 'bandcamp' in link.get('url', '').lower() or 'bandcamp' in link.get('description', '').lower():
+                bandcamp_link = link['url']
+                break
         
         # Group songs by set
         sets = {}
@@ -0,0 +1,333 @@
+"""
+Shared HTTP client for the El Goose API.
+
+All El Goose traffic (on-demand show fetches, the bulk seeder and the
+setlist formatter) goes through one client so that it gets:
+- A persistent connection pool (no TCP/TLS handshake per request)
+- Bounded concurrency and a token-bucket rate limiter, to stay polite
+- Retries with exponential backoff and full jitter on transport errors
+  (timeouts, dropped connections, truncated bodies), 429 and 5xx
+- Every failure, including a non-JSON body, surfaces as ElGooseError
+- ETag / Last-Modified revalidation, so unchanged resources cost a 304
+
+ElGooseClient is the blocking variant (requests); AsyncElGooseClient is the
+asyncio-native variant (httpx) for fetching many dates concurrently.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+EL_GOOSE_BASE_URL = "https://elgoose.net/api/v2"
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+NOT_FOUND_STATUSES = {204, 404}
+
+
+class ElGooseError(Exception):
+    """Raised when El Goose cannot be reached or keeps failing after retries."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class RateLimiter:
+    """Token bucket shared by every thread or task using a client."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def unwrap_payload(payload: Any) -> Optional[list]:
+    """
+    Normalize an El Goose response body.
+
+    Returns:
+        The list of rows ([] when there is nothing at that URL), or None when
+        El Goose reported an error in its response wrapper.
+    """
+    if payload is None:
+        return []
+    if isinstance(payload, dict) and "data" in payload:
+        if payload.get("error") and payload["error"] != 0:
+            return None
+        return payload["data"] or []
+    if isinstance(payload, list):
+        return payload
+    return None
+
+
+class _ElGooseBase:
+    def __init__(
+        self,
+        base_url: str = EL_GOOSE_BASE_URL,
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        max_backoff: float = 8,
+        max_concurrency: int = 8,
+        requests_per_second: float = 5,
+        pool_size: int = 16,
+        max_validators: int = 1024,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.rate_limiter = RateLimiter(requests_per_second, burst=max(1, max_concurrency))
+        self.max_validators = max_validators
+        # url -> (etag, last_modified, payload) for conditional requests
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], Any]]" = OrderedDict()
+        self._validators_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "not_modified": 0}
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._validators_lock:
+            cached = self._validators.get(url)
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _cached_payload(self, url: str) -> Any:
+        with self._validators_lock:
+            cached = self._validators.get(url)
+            if cached is None:
+                raise ElGooseError(f"Unexpected 304 for {url}", 304)
+            self._validators.move_to_end(url)
+            return cached[2]
+
+    def _remember(self, url: str, headers, payload: Any) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        with self._validators_lock:
+            self._validators[url] = (etag, last_modified, payload)
+            self._validators.move_to_end(url)
+            while len(self._validators) > self.max_validators:
+                self._validators.popitem(last=False)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * (2 ** attempt)))
+
+    def _handle(self, url: str, status_code: int, headers, parse_json) -> Tuple[bool, Any]:
+        """Return (done, payload) for a response; done=False means retry."""
+        if status_code == 304:
+            self.stats["not_modified"] += 1
+            return True, self._cached_payload(url)
+        if status_code in NOT_FOUND_STATUSES:
+            return True, None
+        if status_code in RETRYABLE_STATUSES:
+            return False, None
+        if status_code >= 400:
+            raise ElGooseError(f"El Goose returned {status_code} for {url}", status_code)
+        try:
+            payload = parse_json()
+        except ValueError as e:
+            raise ElGooseError(f"Invalid JSON from {url}: {e}", status_code)
+        self._remember(url, headers, payload)
+        return True, payload
+
+
+class ElGooseClient(_ElGooseBase):
+    """Blocking El Goose client backed by a pooled requests.Session."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.http.headers.update({"Accept": "application/json", "User-Agent": "honkingversion/1.0"})
+
+    def get_json(self, path: str) -> Any:
+        """
+        GET a JSON resource, retrying transient failures.
+
+        Returns:
+            The parsed body, or None for 204/404
+
+        Raises:
+            ElGooseError: if the request still fails after all retries
+        """
+        url = self._url(path)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+            self.rate_limiter.acquire()
+            retry_after = None
+            try:
+                with self._semaphore:
+                    self.stats["requests"] += 1
+                    response = self.http.get(url, headers=self._conditional_headers(url), timeout=self.timeout)
+                done, payload = self._handle(url, response.status_code, response.headers, response.json)
+                if done:
+                    return payload
+                retry_after = response.headers.get("Retry-After")
+                last_error = ElGooseError(f"El Goose returned {response.status_code} for {url}", response.status_code)
+            except requests.RequestException as e:
+                # Connection errors, timeouts, truncated bodies, ...: all retried, then wrapped
+                last_error = ElGooseError(f"Error requesting {url}: {e}")
+
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                logger.debug(f"Retrying {url} in {delay:.2f}s ({last_error})")
+                time.sleep(delay)
+
+        raise last_error
+
+    def get_setlist(self, date_str: str) -> Optional[list]:
+        """Setlist rows for a date ([] if no show), or None if El Goose reported an error."""
+        return unwrap_payload(self.get_json(f"setlists/showdate/{date_str}.json"))
+
+    def get_show_index(self) -> Optional[list]:
+        """Every show El Goose knows about (one row per show), or None on an error payload."""
+        return unwrap_payload(self.get_json("shows.json"))
+
+    def get_show_links(self, show_id) -> list:
+        """External links (Bandcamp, Nugs, ...) for an El Goose show id."""
+        return unwrap_payload(self.get_json(f"links/show_id/{show_id}.json")) or []
+
+    def close(self) -> None:
+        self.http.close()
+
+
+class AsyncElGooseClient(_ElGooseBase):
+    """asyncio-native El Goose client backed by a pooled httpx.AsyncClient."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.http = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            headers={"Accept": "application/json", "User-Agent": "honkingversion/1.0"},
+        )
+
+    async def __aenter__(self) -> "AsyncElGooseClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    async def get_json(self, path: str) -> Any:
+        """Async equivalent of ElGooseClient.get_json."""
+        url = self._url(path)
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+            await self.rate_limiter.acquire_async()
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    self.stats["requests"] += 1
+                    response = await self.http.get(url, headers=self._conditional_headers(url))
+                done, payload = self._handle(url, response.status_code, response.headers, response.json)
+                if done:
+                    return payload
+                retry_after = response.headers.get("Retry-After")
+                last_error = ElGooseError(f"El Goose returned {response.status_code} for {url}", response.status_code)
+            except httpx.HTTPError as e:
+                last_error = ElGooseError(f"Error requesting {url}: {e}")
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        raise last_error
+
+    async def get_setlist(self, date_str: str) -> Optional[list]:
+        return unwrap_payload(await self.get_json(f"setlists/showdate/{date_str}.json"))
+
+    async def get_show_index(self) -> Optional[list]:
+        return unwrap_payload(await self.get_json("shows.json"))
+
+    async def get_show_links(self, show_id) -> list:
+        return unwrap_payload(await self.get_json(f"links/show_id/{show_id}.json")) or []
+
+    async def get_setlists(self, dates: Iterable[str]) -> Dict[str, Any]:
+        """
+        Fetch many dates concurrently (bounded by max_concurrency).
+
+        Returns:
+            Mapping of date to its setlist rows, or to the ElGooseError raised for it
+        """
+        dates = list(dates)
+
+        async def fetch(date_str: str):
+            try:
+                return await self.get_setlist(date_str)
+            except ElGooseError as e:
+                return e
+
+        results = await asyncio.gather(*(fetch(d) for d in dates))
+        return dict(zip(dates, results))
+
+
+_shared_client: Optional[ElGooseClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_elgoose_client() -> ElGooseClient:
+    """Return the process-wide blocking El Goose client."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = ElGooseClient()
+        return _shared_client
@@ -0,0 +1,148 @@
+"""
+Analytics Event Buffer
+
+Page-view tracking is the highest-volume write in the API, so events are
+not written per request. ``track_event`` appends a row to an in-process
+buffer and returns; a background thread writes the buffer out in batches,
+when BATCH_SIZE events are waiting or every FLUSH_SECONDS. Each batch is a
+single multi-row INSERT on the writer's own connection.
+
+The buffer is bounded. When it is full, new events are rejected and
+counted as dropped, and the endpoint tells clients to back off. Events that
+fail to write are counted and discarded rather than retried, so a database
+outage cannot grow the buffer without bound. The application's shutdown
+hook flushes whatever is left.
+
+Each API worker has its own buffer; events buffered in a worker that is
+killed rather than shut down are lost.
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlmodel import insert
+
+from api import database
+from api.models import AnalyticsEvent
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENTS = int(os.getenv("ANALYTICS_BUFFER_MAX_EVENTS", 10000))
+BATCH_SIZE = int(os.getenv("ANALYTICS_BUFFER_BATCH_SIZE", 500))
+FLUSH_SECONDS = float(os.getenv("ANALYTICS_BUFFER_FLUSH_SECONDS", 2))
+
+
+class EventBuffer:
+    """Bounded, thread-safe buffer of AnalyticsEvent rows; see the module docstring."""
+
+    def __init__(self, max_events: int = MAX_EVENTS, batch_size: int = BATCH_SIZE,
+                 flush_seconds: float = FLUSH_SECONDS):
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._events: deque = deque()
+        self._ready = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.counters = {"accepted": 0, "dropped": 0, "written": 0, "failed": 0, "batches": 0}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(self, event_type: str, path: str, session_id: str, user_id: Optional[int] = None,
+            metadata_json: Optional[str] = None) -> bool:
+        """
+        Queue one event.
+
+        Returns:
+            False if the buffer is full and the event was dropped
+        """
+        row = {
+            "event_type": event_type,
+            "path": path,
+            "session_id": session_id,
+            "user_id": user_id,
+            "metadata_json": metadata_json,
+            "timestamp": datetime.utcnow(),
+        }
+        with self._ready:
+            if len(self._events) >= self.max_events:
+                self.counters["dropped"] += 1
+                return False
+            self._events.append(row)
+            self.counters["accepted"] += 1
+            if len(self._events) >= self.batch_size:
+                self._ready.notify()
+        return True
+
+    def _take(self) -> List[dict]:
+        with self._ready:
+            count = min(len(self._events), self.batch_size)
+            return [self._events.popleft() for _ in range(count)]
+
+    def _write(self, rows: List[dict]) -> None:
+        try:
+            with database.engine.begin() as connection:
+                connection.execute(insert(AnalyticsEvent), rows)
+        except Exception as e:
+            self.counters["failed"] += len(rows)
+            logger.error(f"Dropped {len(rows)} analytics events after a failed write: {e}")
+            return
+        self.counters["written"] += len(rows)
+        self.counters["batches"] += 1
+
+    def flush(self) -> int:
+        """
+        Write every buffered event now, in batches.
+
+        Returns:
+            Number of events taken from the buffer
+        """
+        taken = 0
+        with self._write_lock:
+            while True:
+                rows = self._take()
+                if not rows:
+                    return taken
+                self._write(rows)
+                taken += len(rows)
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                if not self._stopping and len(self._events) < self.batch_size:
+                    self._ready.wait(self.flush_seconds)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def start(self) -> None:
+        """Start the background writer thread (idempotent)."""
+        with self._ready:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="analytics-event-buffer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Stop the writer thread after a final flush."""
+        with self._ready:
+            self._stopping = True
+            self._ready.notify()
+            thread = self._thread
+        if thread:
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "buffered": len(self._events), "max_events": self.max_events}
+
+
+event_buffer = EventBuffer()
@@ -11,17 +11,31 @@ Cache Fields:
 - Song.current_honking_vote_count: vote count of the winner
 - Song.honking_version_updated_at: timestamp of last update
 
-The cache is maintained transactionally whenever votes are created/updated/deleted.
+The cache is maintained in the same transaction as the vote write, with atomic
+``honking_vote_count = honking_vote_count +/- 1`` deltas. The winner check only
+compares the touched performance against the cached leader; the song's
+performances are re-ranked (on the (song_id, honking_vote_count, id) index) only
+when the leader itself loses a vote. Ties keep the incumbent.
+Full recounts are kept for verification and repair; ``rebuild_all_cache``
+recounts set-based, one song-id range at a time (optionally in parallel):
+one grouped count applied with ``UPDATE ... FROM``, then the winners picked
+with ``ROW_NUMBER() OVER (PARTITION BY song_id ...)``. Only rows whose
+values change are written.
 """
 
-from sqlmodel import Session, select, func
+from sqlmodel import Session, and_, case, or_, select, func, update
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from api.models import HonkingVersion, Song, SongPerformance
 import logging
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
+REBUILD_CHUNK_SONGS = int(os.getenv("HONKING_REBUILD_CHUNK_SONGS", 500))
+
 
 class HonkingCacheService:
     """Service for maintaining honking version cache consistency."""
@@ -114,26 +128,99 @@ class HonkingCacheService:
 
         return (result[0] if result else None), song.current_honking_vote_count
 
+    @staticmethod
+    def apply_delta(
+        session: Session,
+        song_id: int,
+        performance_id: int,
+        delta: int
+    ) -> int:
+        """
+        Atomically adjust a performance's honking vote count and the song's cached winner.
+
+        Args:
+            session: Database session
+            song_id: ID of the song
+            performance_id: ID of the performance that gained or lost votes
+            delta: Change in the performance's vote count
+
+        Returns:
+            The new vote count for the performance
+        """
+        now = datetime.utcnow()
+        no_sync = {"synchronize_session": False}
+        session.exec(
+            update(SongPerformance)
+            .where(SongPerformance.id == performance_id)
+            .values(
+                honking_vote_count=SongPerformance.honking_vote_count + delta,
+                honking_votes_updated_at=now,
+            ),
+            execution_options=no_sync,
+        )
+        vote_count = session.exec(
+            select(SongPerformance.honking_vote_count).where(SongPerformance.id == performance_id)
+        ).first() or 0
+
+        leader_id = Song.current_honking_performance_id
+        leader_count = Song.current_honking_vote_count
+        if delta > 0:
+            # Takes (or keeps) the lead only by beating the cached leader
+            leads = or_(leader_id.is_(None), leader_id == performance_id, leader_count < vote_count)
+            values = {
+                "current_honking_performance_id": case((leads, performance_id), else_=leader_id),
+                "current_honking_vote_count": case((leads, vote_count), else_=leader_count),
+            }
+        else:
+            values = {"current_honking_vote_count": case((leader_id == performance_id, vote_count), else_=leader_count)}
+        session.exec(
+            update(Song).where(Song.id == song_id).values(honking_version_updated_at=now, **values),
+            execution_options=no_sync,
+        )
+
+        if delta < 0:
+            current_leader = session.exec(
+                select(Song.current_honking_performance_id).where(Song.id == song_id)
+            ).first()
+            if current_leader == performance_id:
+                HonkingCacheService._reelect(session, song_id, performance_id, vote_count)
+
+        return vote_count
+
+    @staticmethod
+    def _reelect(session: Session, song_id: int, leader_id: int, leader_count: int) -> None:
+        """After the leader lost votes, hand the lead to a performance that now has more, if any."""
+        top = session.exec(
+            select(SongPerformance.id, SongPerformance.honking_vote_count)
+            .where(SongPerformance.song_id == song_id)
+            .order_by(SongPerformance.honking_vote_count.desc(), SongPerformance.id)
+            .limit(1)
+        ).first()
+        if top and top[1] > 0 and top[1] <= leader_count:
+            return
+        winner_id, winner_count = (top[0], top[1]) if top and top[1] > 0 else (None, 0)
+        session.exec(
+            update(Song)
+            .where(Song.id == song_id)
+            .values(current_honking_performance_id=winner_id, current_honking_vote_count=winner_count),
+            execution_options={"synchronize_session": False},
+        )
+        logger.debug(f"Song {song_id} honking leader re-elected: {leader_id} -> {winner_id}")
+
     @staticmethod
     def on_honking_vote_created(
         session: Session,
         honking_vote: HonkingVersion
     ) -> None:
         """
-        Called when a new honking version vote is created.
+        Called after a new honking version vote has been added to the session.
         Updates the cache for the affected performance and song.
 
         Args:
             session: Database session
             honking_vote: The newly created HonkingVersion
         """
-        # Update performance cache
-        HonkingCacheService.recalculate_performance_cache(
-            session, honking_vote.performance_id
-        )
-
-        # Update song cache
-        HonkingCacheService.recalculate_song_cache(session, honking_vote.song_id)
+        HonkingCacheService.apply_delta(session, honking_vote.song_id, honking_vote.performance_id, 1)
 
         logger.info(
             f"Cache updated after honking vote created: "
@@ -155,16 +242,11 @@ class HonkingCacheService:
             old_performance_id: The performance ID that was previously voted for
             new_honking_vote: The updated HonkingVersion
         """
-        # Update old performance cache
-        HonkingCacheService.recalculate_performance_cache(session, old_performance_id)
-
-        # Update new performance cache
-        HonkingCacheService.recalculate_performance_cache(
-            session, new_honking_vote.performance_id
+        # Increment first, so a re-election after the decrement sees the new count
+        HonkingCacheService.apply_delta(
+            session, new_honking_vote.song_id, new_honking_vote.performance_id, 1
         )
-
-        # Update song cache
-        HonkingCacheService.recalculate_song_cache(session, new_honking_vote.song_id)
+        HonkingCacheService.apply_delta(session, new_honking_vote.song_id, old_performance_id, -1)
 
         logger.info(
             f"Cache updated after honking vote changed: "
@@ -187,11 +269,7 @@ class HonkingCacheService:
             song_id: ID of the song
             performance_id: ID of the performance that was voted for
         """
-        # Update performance cache
-        HonkingCacheService.recalculate_performance_cache(session, performance_id)
-
-        # Update song cache
-        HonkingCacheService.recalculate_song_cache(session, song_id)
+        HonkingCacheService.apply_delta(session, song_id, performance_id, -1)
 
         logger.info(
             f"Cache updated after honking vote deleted: "
@@ -232,20 +310,26 @@ class HonkingCacheService:
 
         results = session.exec(statement).all()
 
-        # Verify performance caches
-        for perf_id, expected_count in results:
-            perf = session.get(SongPerformance, perf_id)
-            if perf and perf.honking_vote_count != expected_count:
+        # Verify performance caches, including performances that lost all their votes
+        expected = dict(results)
+        cached = session.exec(
+            select(SongPerformance.id, SongPerformance.honking_vote_count).where(
+                SongPerformance.song_id == song_id,
+                or_(SongPerformance.honking_vote_count != 0, SongPerformance.id.in_(list(expected))),
+            )
+        ).all()
+        for perf_id, cached_count in cached:
+            if cached_count != expected.get(perf_id, 0):
                 logger.warning(
                     f"Cache inconsistency: Performance {perf_id} has cached count "
-                    f"{perf.honking_vote_count} but actual count is {expected_count}"
+                    f"{cached_count} but actual count is {expected.get(perf_id, 0)}"
                 )
                 return False
 
-        # Verify song cache
+        # Verify song cache; any performance tied for the most votes is a valid winner
         if results:
             expected_winner_id, expected_winner_count = results[0]
-            if song.current_honking_performance_id != expected_winner_id:
+            if expected.get(song.current_honking_performance_id) != expected_winner_count:
                 logger.warning(
                     f"Cache inconsistency: Song {song_id} has cached winner "
                     f"{song.current_honking_performance_id} but actual winner is {expected_winner_id}"
@@ -269,40 +353,223 @@ class HonkingCacheService:
         return True
 
     @staticmethod
-    def rebuild_all_cache(session: Session) -> Tuple[int, int]:
+    def find_inconsistencies(session: Session) -> List[Dict]:
         """
-        Rebuild the entire honking version cache from scratch.
-        Used for migrations or recovery from cache corruption.
+        Compare every cached performance count and song winner against a full recount,
+        with one grouped query per table.
+
+        Returns:
+            List of mismatches, each with table, id, cached and actual values
+        """
+        counts = (
+            select(HonkingVersion.performance_id, func.count(HonkingVersion.id).label("vote_count"))
+            .group_by(HonkingVersion.performance_id)
+            .subquery()
+        )
+        actual_count = func.coalesce(counts.c.vote_count, 0)
+        mismatches = [
+            {"table": "songperformance", "id": perf_id, "cached": cached, "actual": actual}
+            for perf_id, cached, actual in session.exec(
+                select(SongPerformance.id, SongPerformance.honking_vote_count, actual_count)
+                .outerjoin(counts, counts.c.performance_id == SongPerformance.id)
+                .where(SongPerformance.honking_vote_count != actual_count)
+            ).all()
+        ]
+
+        # Any performance tied for the most votes is a valid winner
+        top = (
+            select(HonkingVersion.song_id, func.max(counts.c.vote_count).label("vote_count"))
+            .select_from(counts)
+            .join(HonkingVersion, HonkingVersion.performance_id == counts.c.performance_id)
+            .group_by(HonkingVersion.song_id)
+            .subquery()
+        )
+        winner = (
+            select(HonkingVersion.performance_id)
+            .where(HonkingVersion.song_id == Song.id)
+            .group_by(HonkingVersion.performance_id)
+            .having(func.count(HonkingVersion.id) == top.c.vote_count)
+        )
+        top_count = func.coalesce(top.c.vote_count, 0)
+        for song_id, leader_id, cached, actual in session.exec(
+            select(Song.id, Song.current_honking_performance_id, Song.current_honking_vote_count, top_count)
+            .outerjoin(top, top.c.song_id == Song.id)
+            .where(or_(
+                Song.current_honking_vote_count != top_count,
+                and_(top.c.vote_count.is_(None), Song.current_honking_performance_id.is_not(None)),
+                and_(top.c.vote_count.is_not(None), Song.current_honking_performance_id.not_in(winner)),
+            ))
+        ).all():
+            mismatches.append({"table": "song", "id": song_id, "cached": (leader_id, cached), "actual": actual})
+
+        for mismatch in mismatches:
+            logger.warning(
+                f"Honking cache inconsistency: {mismatch['table']} {mismatch['id']} has cached "
+                f"{mismatch['cached']} but actual is {mismatch['actual']}"
+            )
+        return mismatches
+
+    @staticmethod
+    def rebuild_song_range(session: Session, first_song_id: int, last_song_id: int) -> Tuple[int, int]:
+        """
+        Recount the honking cache of songs with ids in [first_song_id, last_song_id], set-based.
+        Only rows whose values change are written. The caller commits.
 
         Args:
             session: Database session
+            first_song_id: First song id of the range
+            last_song_id: Last song id of the range
 
         Returns:
             Tuple of (songs_updated, performances_updated)
         """
-        songs_updated = 0
-        performances_updated = 0
+        now = datetime.utcnow()
+        no_sync = {"synchronize_session": False}
+        in_range = SongPerformance.song_id.between(first_song_id, last_song_id)
+
+        # Performance counts: one grouped count, applied with UPDATE ... FROM
+        counts = (
+            select(HonkingVersion.performance_id, func.count(HonkingVersion.id).label("vote_count"))
+            .where(HonkingVersion.song_id.between(first_song_id, last_song_id))
+            .group_by(HonkingVersion.performance_id)
+            .subquery()
+        )
+        performances_updated = session.exec(
+            update(SongPerformance)
+            .where(
+                SongPerformance.id == counts.c.performance_id,
+                SongPerformance.honking_vote_count != counts.c.vote_count,
+            )
+            .values(honking_vote_count=counts.c.vote_count, honking_votes_updated_at=now),
+            execution_options=no_sync,
+        ).rowcount
+        performances_updated += session.exec(
+            update(SongPerformance)
+            .where(
+                in_range,
+                SongPerformance.honking_vote_count != 0,
+                ~select(HonkingVersion.id).where(HonkingVersion.performance_id == SongPerformance.id).exists(),
+            )
+            .values(honking_vote_count=0, honking_votes_updated_at=now),
+            execution_options=no_sync,
+        ).rowcount
+
+        # Winners: the top performance per song; ties keep the incumbent, then the lowest id
+        ranked = (
+            select(
+                SongPerformance.song_id,
+                SongPerformance.id,
+                SongPerformance.honking_vote_count,
+                func.row_number().over(
+                    partition_by=SongPerformance.song_id,
+                    order_by=(
+                        SongPerformance.honking_vote_count.desc(),
+                        case((SongPerformance.id == Song.current_honking_performance_id, 0), else_=1),
+                        SongPerformance.id,
+                    ),
+                ).label("rank"),
+            )
+            .join(Song, Song.id == SongPerformance.song_id)
+            .where(in_range, SongPerformance.honking_vote_count > 0)
+            .subquery()
+        )
+        songs_updated = session.exec(
+            update(Song)
+            .where(
+                Song.id == ranked.c.song_id,
+                ranked.c.rank == 1,
+                or_(
+                    Song.current_honking_performance_id.is_(None),
+                    Song.current_honking_performance_id != ranked.c.id,
+                    Song.current_honking_vote_count != ranked.c.honking_vote_count,
+                ),
+            )
+            .values(
+                current_honking_performance_id=ranked.c.id,
+                current_honking_vote_count=ranked.c.honking_vote_count,
+                honking_version_updated_at=now,
+            ),
+            execution_options=no_sync,
+        ).rowcount
+        songs_updated += session.exec(
+            update(Song)
+            .where(
+                Song.id.between(first_song_id, last_song_id),
+                or_(Song.current_honking_performance_id.is_not(None), Song.current_honking_vote_count != 0),
+                ~select(SongPerformance.id)
+                .where(SongPerformance.song_id == Song.id, SongPerformance.honking_vote_count > 0)
+                .exists(),
+            )
+            .values(current_honking_performance_id=None, current_honking_vote_count=0, honking_version_updated_at=now),
+            execution_options=no_sync,
+        ).rowcount
+        return songs_updated, performances_updated
+
+    @staticmethod
+    def rebuild_all_cache(
+        session: Session,
+        chunk_size: int = REBUILD_CHUNK_SONGS,
+        workers: int = 1,
+        progress: Optional[Callable[[Dict], None]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Rebuild the entire honking version cache from scratch, one song-id range at a time.
+        Used for migrations or recovery from cache corruption.
 
-        # Get all songs with honking votes
-        songs_with_votes = session.exec(
-            select(HonkingVersion.song_id).distinct()
-        ).all()
+        Each range is recounted set-based and committed on its own. With workers > 1
+        ranges run concurrently, each in its own session on the same engine.
 
-        for song_id in songs_with_votes:
-            HonkingCacheService.recalculate_song_cache(session, song_id)
-            songs_updated += 1
+        Args:
+            session: Database session
+            chunk_size: Song ids per range
+            workers: Ranges rebuilt concurrently
+            progress: Called after each range with songs done/total, rows updated and songs/second
 
-            # Also update all performances for this song
-            performances = session.exec(
-                select(SongPerformance.id).where(SongPerformance.song_id == song_id)
-            ).all()
+        Returns:
+            Tuple of (songs_updated, performances_updated)
+        """
+        first, last = session.exec(select(func.min(Song.id), func.max(Song.id))).one()
+        if first is None:
+            return 0, 0
+        ranges = [(start, min(start + chunk_size - 1, last)) for start in range(first, last + 1, chunk_size)]
+        total = last - first + 1
+        started = time.monotonic()
+        done = {"songs": 0, "songs_updated": 0, "performances_updated": 0}
+
+        def rebuild(song_range):
+            if workers == 1:
+                updated = HonkingCacheService.rebuild_song_range(session, *song_range)
+                session.commit()
+                return updated
+            with Session(session.get_bind()) as range_session:
+                updated = HonkingCacheService.rebuild_song_range(range_session, *song_range)
+                range_session.commit()
+                return updated
+
+        def report(song_range, updated):
+            done["songs"] += song_range[1] - song_range[0] + 1
+            done["songs_updated"] += updated[0]
+            done["performances_updated"] += updated[1]
+            elapsed = time.monotonic() - started
+            stats = {**done, "total": total, "songs_per_second": done["songs"] / elapsed if elapsed else 0.0}
+            logger.info(
+                f"Honking cache rebuild: {stats['songs']}/{total} song ids, "
+                f"{stats['songs_updated']} songs and {stats['performances_updated']} performances updated, "
+                f"{stats['songs_per_second']:.0f} songs/s"
+            )
+            if progress:
+                progress(stats)
 
-            for perf_id in performances:
-                HonkingCacheService.recalculate_performance_cache(session, perf_id)
-                performances_updated += 1
+        if workers == 1:
+            for song_range in ranges:
+                report(song_range, rebuild(song_range))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for song_range, updated in zip(ranges, pool.map(rebuild, ranges)):
+                    report(song_range, updated)
 
-        session.commit()
         logger.info(
-            f"Cache rebuild complete: {songs_updated} songs, {performances_updated} performances"
+            f"Cache rebuild complete: {done['songs_updated']} songs, "
+            f"{done['performances_updated']} performances in {time.monotonic() - started:.1f}s"
         )
-        return songs_updated, performances_updated
+        return done["songs_updated"], done["performances_updated"]
@@ -0,0 +1,220 @@
+"""
+List Item Service
+
+Keeps ListItem, the normalized form of ``UserList.items``, in sync with the
+JSON column and hydrates pages of items for display.
+
+``UserList.items`` stays the write format clients send (a JSON array of ids,
+or of ``{"id": ..., "label": ...}`` objects); every write rewrites the
+list's ListItem rows with contiguous positions, so a page of items is an
+index range scan on (list_id, position).
+
+Hydration resolves a page with one query per item type, joining songs,
+shows and the cached rating aggregates, so a page costs the same number of
+queries whatever its size.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import Session, func, insert, select, update
+
+from api.models import ListFollow, ListItem, Show, Song, SongPerformance, UserList
+from api.services.rating_cache import average_rating
+
+logger = logging.getLogger(__name__)
+
+# UserList.list_type -> ListItem.item_type
+ITEM_TYPES = {"performances": "performance", "shows": "show", "songs": "song"}
+
+
+def parse_items(user_list: UserList) -> List[Tuple[int, Optional[str]]]:
+    """(item_id, label) pairs from a list's JSON ``items``; malformed entries are skipped."""
+    try:
+        raw_items = json.loads(user_list.items or "[]")
+    except (TypeError, ValueError):
+        logger.warning(f"List {user_list.id} has malformed items JSON")
+        return []
+    if not isinstance(raw_items, list):
+        return []
+
+    items = []
+    for raw in raw_items:
+        label = None
+        if isinstance(raw, dict):
+            label = raw.get("label")
+            raw = raw.get("id")
+        try:
+            items.append((int(raw), label))
+        except (TypeError, ValueError):
+            continue
+    return items
+
+
+class ListItemService:
+    """Service for normalized list items."""
+
+    @staticmethod
+    def sync(session: Session, user_list: UserList) -> int:
+        """
+        Rewrite a list's ListItem rows from its JSON ``items``. The caller commits.
+
+        Args:
+            session: Database session
+            user_list: A flushed UserList
+
+        Returns:
+            Number of items written
+        """
+        session.exec(delete(ListItem).where(ListItem.list_id == user_list.id))
+        item_type = ITEM_TYPES.get(user_list.list_type, "performance")
+        rows = [
+            {"list_id": user_list.id, "position": position, "item_type": item_type,
+             "item_id": item_id, "label": label}
+            for position, (item_id, label) in enumerate(parse_items(user_list))
+        ]
+        if rows:
+            session.exec(insert(ListItem), params=rows)
+        return len(rows)
+
+    @staticmethod
+    def rebuild_all(session: Session) -> Tuple[int, int]:
+        """
+        Re-derive every list's ListItem rows and follower_count, then commit.
+        Used for the migration from the JSON column or to repair drift.
+
+        Returns:
+            Tuple of (lists_rebuilt, items_written)
+        """
+        lists = session.exec(select(UserList)).all()
+        items = sum(ListItemService.sync(session, user_list) for user_list in lists)
+        session.exec(
+            update(UserList).values(
+                follower_count=select(func.count(ListFollow.id))
+                .where(ListFollow.list_id == UserList.id)
+                .scalar_subquery()
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        session.commit()
+        logger.info(f"List items rebuilt: {len(lists)} lists, {items} items")
+        return len(lists), items
+
+    @staticmethod
+    def count(session: Session, list_id: int) -> int:
+        return session.exec(
+            select(func.count()).select_from(ListItem).where(ListItem.list_id == list_id)
+        ).one()
+
+    @staticmethod
+    def page(session: Session, list_id: int, offset: int = 0, limit: int = 50) -> List[dict]:
+        """
+        One page of a list's items, hydrated.
+
+        Args:
+            session: Database session
+            list_id: The list
+            offset: Position of the first item
+            limit: Maximum items
+
+        Returns:
+            List of {"position", "type", "id", "label", "data"}; ``data`` is
+            None for items that no longer exist
+        """
+        items = session.exec(
+            select(ListItem)
+            .where(ListItem.list_id == list_id, ListItem.position >= offset, ListItem.position < offset + limit)
+            .order_by(ListItem.position)
+        ).all()
+
+        ids_by_type: Dict[str, List[int]] = {}
+        for item in items:
+            ids_by_type.setdefault(item.item_type, []).append(item.item_id)
+
+        loaders = {
+            "performance": ListItemService._performances,
+            "show": ListItemService._shows,
+            "song": ListItemService._songs,
+        }
+        hydrated = {
+            item_type: loaders[item_type](session, ids)
+            for item_type, ids in ids_by_type.items()
+            if item_type in loaders
+        }
+
+        return [
+            {
+                "position": item.position,
+                "type": item.item_type,
+                "id": item.item_id,
+                "label": item.label,
+                "data": hydrated.get(item.item_type, {}).get(item.item_id),
+            }
+            for item in items
+        ]
+
+    @staticmethod
+    def _performances(session: Session, ids: List[int]) -> Dict[int, dict]:
+        rows = session.exec(
+            select(SongPerformance, Song, Show)
+            .join(Song, Song.id == SongPerformance.song_id)
+            .join(Show, Show.id == SongPerformance.show_id)
+            .where(SongPerformance.id.in_(ids))
+        ).all()
+        return {
+            perf.id: {
+                "id": perf.id,
+                "position": perf.position,
+                "set_number": perf.set_number,
+                "vote_count": perf.vote_count,
+                "avg_rating": average_rating(perf.vote_count, perf.rating_sum),
+                "song": {"id": song.id, "name": song.name, "slug": song.slug},
+                "show": {"id": show.id, "date": show.date, "venue": show.venue, "location": show.location},
+            }
+            for perf, song, show in rows
+        }
+
+    @staticmethod
+    def _shows(session: Session, ids: List[int]) -> Dict[int, dict]:
+        rows = session.exec(
+            select(Show.id, Show.date, Show.venue, Show.location, Show.vote_count, Show.rating_sum)
+            .where(Show.id.in_(ids))
+        ).all()
+        return {
+            show_id: {
+                "id": show_id,
+                "date": date,
+                "venue": venue,
+                "location": location,
+                "vote_count": vote_count,
+                "avg_rating": average_rating(vote_count, rating_sum),
+            }
+            for show_id, date, venue, location, vote_count, rating_sum in rows
+        }
+
+    @staticmethod
+    def _songs(session: Session, ids: List[int]) -> Dict[int, dict]:
+        rows = session.exec(
+            select(
+                Song.id, Song.name, Song.slug, Song.artist, Song.times_played,
+                func.coalesce(func.sum(SongPerformance.vote_count), 0),
+                func.coalesce(func.sum(SongPerformance.rating_sum), 0),
+            )
+            .outerjoin(SongPerformance, SongPerformance.song_id == Song.id)
+            .where(Song.id.in_(ids))
+            .group_by(Song.id, Song.name, Song.slug, Song.artist, Song.times_played)
+        ).all()
+        return {
+            song_id: {
+                "id": song_id,
+                "name": name,
+                "slug": slug,
+                "artist": artist,
+                "times_played": times_played,
+                "vote_count": vote_count,
+                "avg_rating": average_rating(vote_count, rating_sum),
+            }
+            for song_id, name, slug, artist, times_played, vote_count, rating_sum in rows
+        }
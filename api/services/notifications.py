@@ -1,9 +1,10 @@
 from datetime import datetime
-from sqlmodel import Session
+from sqlalchemy import DateTime, literal
+from sqlmodel import Session, insert, select
 
 from typing import Optional
 
-from api.models import Notification
+from api.models import Notification, UserFollow
 
 def create_notification(
     session: Session,
@@ -33,3 +34,36 @@ def create_notification(
     session.commit()
     session.refresh(notification)
     return notification
+
+
+def notify_followers(
+    session: Session,
+    *,
+    actor_id: int,
+    type: str,
+    object_type: str,
+    object_id: int,
+) -> int:
+    """
+    Notify every follower of ``actor_id`` with a single INSERT ... SELECT,
+    so the follower list never round-trips through Python. The caller commits.
+    Returns the number of notifications created.
+    """
+    followers = select(
+        UserFollow.follower_id,
+        literal(type),
+        literal(actor_id),
+        literal(object_type),
+        literal(object_id),
+        literal(datetime.utcnow(), DateTime()),
+    ).where(
+        UserFollow.followed_id == actor_id,
+        UserFollow.follower_id != actor_id,
+    ).distinct()
+    result = session.exec(
+        insert(Notification).from_select(
+            ["user_id", "type", "actor_id", "object_type", "object_id", "created_at"],
+            followers,
+        )
+    )
+    return result.rowcount
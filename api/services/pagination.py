@@ -0,0 +1,45 @@
+"""
+Opaque cursor tokens for keyset pagination.
+
+A cursor is the sort key of the last row on a page, JSON encoded and
+wrapped in urlsafe base64 so clients treat it as an opaque string. List
+endpoints keep returning a plain JSON array and hand the next cursor back
+in the ``X-Next-Cursor`` response header.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode a row's sort key as an opaque cursor token."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, length: int) -> List[Any]:
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the token is malformed or has the wrong arity
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != length:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    """Expose the next page cursor to the client, if there is one."""
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
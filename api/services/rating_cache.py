@@ -0,0 +1,211 @@
+"""
+Rating Aggregate Cache Maintenance Service
+
+This service maintains denormalized rating aggregates so read paths can
+compute averages from two columns instead of scanning every Vote row.
+
+Cache Fields:
+- SongPerformance.vote_count / SongPerformance.rating_sum: votes cast on the performance
+- Show.vote_count / Show.rating_sum: votes cast on the show itself
+
+Updates are applied as atomic ``col = col + delta`` statements inside the
+same transaction as the vote write, so concurrent voters never lose an
+increment. A full recount is kept for verification and bulk rebuilds.
+"""
+
+from sqlmodel import Session, select, func, update
+from typing import Dict, List, Optional, Tuple
+from api.models import Show, SongPerformance, Vote
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def average_rating(vote_count: int, rating_sum: int) -> Optional[float]:
+    """Return the rounded average for cached aggregates, or None without votes."""
+    if not vote_count:
+        return None
+    return round(rating_sum / vote_count, 1)
+
+
+def average_rating_expr(model):
+    """SQL expression for the unrounded average of a model's cached aggregates."""
+    return (model.rating_sum * 1.0) / func.nullif(model.vote_count, 0)
+
+
+class RatingCacheService:
+    """Service for maintaining rating aggregate cache consistency."""
+
+    @staticmethod
+    def _targets(vote: Vote) -> List[Tuple[type, int]]:
+        targets = []
+        if vote.performance_id:
+            targets.append((SongPerformance, vote.performance_id))
+        if vote.show_id:
+            targets.append((Show, vote.show_id))
+        return targets
+
+    @staticmethod
+    def apply_delta(
+        session: Session,
+        model,
+        object_id: int,
+        count_delta: int,
+        rating_delta: int
+    ) -> None:
+        """
+        Atomically adjust cached aggregates for a performance or show.
+
+        Args:
+            session: Database session
+            model: SongPerformance or Show
+            object_id: ID of the row to update
+            count_delta: Change in vote count
+            rating_delta: Change in rating sum
+        """
+        session.exec(
+            update(model)
+            .where(model.id == object_id)
+            .values(
+                vote_count=model.vote_count + count_delta,
+                rating_sum=model.rating_sum + rating_delta,
+            )
+        )
+
+    @staticmethod
+    def on_vote_created(session: Session, vote: Vote) -> None:
+        """
+        Called after a new vote has been added to the session.
+
+        Args:
+            session: Database session
+            vote: The newly created Vote
+        """
+        for model, object_id in RatingCacheService._targets(vote):
+            RatingCacheService.apply_delta(session, model, object_id, 1, vote.rating)
+
+        logger.debug(
+            f"Rating cache updated after vote created: "
+            f"vote={vote.id}, perf={vote.performance_id}, show={vote.show_id}"
+        )
+
+    @staticmethod
+    def on_vote_changed(session: Session, vote: Vote, old_rating: int) -> None:
+        """
+        Called after an existing vote's rating has been changed.
+
+        Args:
+            session: Database session
+            vote: The updated Vote
+            old_rating: The rating before the change
+        """
+        delta = vote.rating - old_rating
+        if not delta:
+            return
+
+        for model, object_id in RatingCacheService._targets(vote):
+            RatingCacheService.apply_delta(session, model, object_id, 0, delta)
+
+        logger.debug(
+            f"Rating cache updated after vote changed: "
+            f"vote={vote.id}, old={old_rating}, new={vote.rating}"
+        )
+
+    @staticmethod
+    def on_vote_deleted(session: Session, vote: Vote) -> None:
+        """
+        Called when a vote is deleted.
+
+        Args:
+            session: Database session
+            vote: The Vote being removed
+        """
+        for model, object_id in RatingCacheService._targets(vote):
+            RatingCacheService.apply_delta(session, model, object_id, -1, -vote.rating)
+
+    @staticmethod
+    def _actual_aggregates(session: Session, column) -> Dict[int, Tuple[int, int]]:
+        rows = session.exec(
+            select(column, func.count(Vote.id), func.coalesce(func.sum(Vote.rating), 0))
+            .where(column.is_not(None))
+            .group_by(column)
+        ).all()
+        return {object_id: (count, total) for object_id, count, total in rows}
+
+    @staticmethod
+    def find_inconsistencies(session: Session) -> List[Dict]:
+        """
+        Compare cached aggregates against a full recount of Vote rows.
+        Used for integrity checks and debugging.
+
+        Args:
+            session: Database session
+
+        Returns:
+            List of mismatches, each with the table, id, cached and actual values
+        """
+        mismatches = []
+        checks = (
+            (SongPerformance, Vote.performance_id),
+            (Show, Vote.show_id),
+        )
+        for model, column in checks:
+            actual = RatingCacheService._actual_aggregates(session, column)
+            cached = {
+                object_id: (vote_count, rating_sum)
+                for object_id, vote_count, rating_sum in session.exec(
+                    select(model.id, model.vote_count, model.rating_sum)
+                    .where((model.vote_count != 0) | (model.rating_sum != 0))
+                ).all()
+            }
+            for object_id in sorted(set(cached) | set(actual)):
+                vote_count, rating_sum = cached.get(object_id, (0, 0))
+                expected = actual.get(object_id, (0, 0))
+                if (vote_count, rating_sum) != expected:
+                    mismatches.append({
+                        "table": model.__tablename__,
+                        "id": object_id,
+                        "cached": (vote_count, rating_sum),
+                        "actual": expected,
+                    })
+                    logger.warning(
+                        f"Rating cache inconsistency: {model.__tablename__} {object_id} has cached "
+                        f"{(vote_count, rating_sum)} but actual is {expected}"
+                    )
+        return mismatches
+
+    @staticmethod
+    def rebuild_all_cache(session: Session) -> Tuple[int, int]:
+        """
+        Rebuild all rating aggregates from scratch with set-based updates.
+        Used for migrations or recovery from cache corruption.
+
+        Args:
+            session: Database session
+
+        Returns:
+            Tuple of (performances_updated, shows_updated)
+        """
+        updated = []
+        for model, column in ((SongPerformance, Vote.performance_id), (Show, Vote.show_id)):
+            count_sq = (
+                select(func.count(Vote.id))
+                .where(column == model.id)
+                .scalar_subquery()
+            )
+            sum_sq = (
+                select(func.coalesce(func.sum(Vote.rating), 0))
+                .where(column == model.id)
+                .scalar_subquery()
+            )
+            result = session.exec(
+                update(model).values(vote_count=count_sq, rating_sum=sum_sq),
+                execution_options={"synchronize_session": False},
+            )
+            updated.append(result.rowcount)
+
+        session.commit()
+        logger.info(
+            f"Rating cache rebuild complete: {updated[0]} performances, {updated[1]} shows"
+        )
+        return updated[0], updated[1]
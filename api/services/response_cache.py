@@ -0,0 +1,250 @@
+"""
+Response cache for expensive, read-mostly endpoints.
+
+A ResponseCache wraps a pluggable backend with:
+- TTL expiry per entry
+- Single-flight recompute: concurrent misses for the same key in one
+  process wait for a single computation instead of stampeding the DB
+- Generation-based invalidation: ``invalidate()`` bumps a counter stored in
+  the backend, so every worker sharing that backend drops its view at once
+  and a computation that raced with a write never repopulates stale data.
+  The previous generation's entries are then deleted; the SQLite backend
+  also purges expired rows on write, so the shared file stays bounded
+
+Backends:
+- MemoryCacheBackend: per-process LRU, the default
+- SQLiteCacheBackend: one SQLite file shared by every worker on the host,
+  a local stand-in for a networked cache such as Redis
+
+Values stored in the SQLite backend must be JSON serializable.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISS = object()
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry. Counters are kept outside the LRU."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Never evicted: losing a generation counter would revive old entries
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISS
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+
+class SQLiteCacheBackend:
+    """Cache stored in a single SQLite file that several processes can share."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entry_expires_at ON cache_entry (expires_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache_entry WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return _MISS
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return _MISS
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        conn = self._connect()
+        # Expired rows are otherwise only dropped when read again, which
+        # entries of old generations never are
+        conn.execute("DELETE FROM cache_entry WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, separators=(",", ":")), expires_at),
+        )
+
+    def delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> None:
+        # Range on the primary key: every key starting with prefix sorts in [prefix, prefix + 1)
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        self._connect().execute("DELETE FROM cache_entry WHERE key >= ? AND key < ?", (prefix, upper))
+
+    def incr(self, key: str) -> int:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM cache_entry WHERE key = ?", (key,)).fetchone()
+            value = (json.loads(row[0]) if row else 0) + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, NULL)",
+                (key, json.dumps(value)),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return value
+
+
+def create_backend(kind: str = "memory", path: Optional[str] = None, max_entries: int = 1024):
+    """Build a cache backend by name ("memory" or "sqlite")."""
+    if kind == "memory":
+        return MemoryCacheBackend(max_entries=max_entries)
+    if kind == "sqlite":
+        return SQLiteCacheBackend(path or "api/data/cache/response_cache.db")
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+
+class ResponseCache:
+    """TTL cache with single-flight recompute and generation-based invalidation."""
+
+    def __init__(self, namespace: str, backend=None, ttl: float = 60):
+        self.namespace = namespace
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    def _generation(self) -> int:
+        generation = self.backend.get(self._generation_key())
+        return 0 if generation is _MISS else generation
+
+    def _entry_key(self, key: str, generation: int) -> str:
+        return f"{self.namespace}:{generation}:{key}"
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value for ``key``, computing it at most once per
+        process when it is missing or expired.
+
+        Args:
+            key: Cache key within this namespace
+            compute: Zero-argument callable producing the value
+            ttl: Override for the default TTL in seconds
+
+        Returns:
+            The cached or freshly computed value
+        """
+        generation = self._generation()
+        value = self.backend.get(self._entry_key(key, generation))
+        if value is not _MISS:
+            self.stats["hits"] += 1
+            return value
+
+        with self._lock_for(key):
+            # Another thread may have filled the entry while we waited
+            generation = self._generation()
+            value = self.backend.get(self._entry_key(key, generation))
+            if value is not _MISS:
+                self.stats["hits"] += 1
+                return value
+
+            self.stats["misses"] += 1
+            value = compute()
+
+            # Skip the write if an invalidation landed while computing
+            if self._generation() == generation:
+                self.backend.set(self._entry_key(key, generation), value, ttl or self.ttl)
+            return value
+
+    def invalidate(self) -> None:
+        """Drop every entry in this namespace, across all workers sharing the backend."""
+        try:
+            generation = self.backend.incr(self._generation_key())
+            self.stats["invalidations"] += 1
+            # No reader looks up older generations again
+            self.backend.delete_prefix(f"{self.namespace}:{generation - 1}:")
+        except Exception as e:
+            # A failed invalidation must never fail the write that triggered it
+            logger.error(f"Failed to invalidate {self.namespace} cache: {e}")
+
+
+def cache_from_env(namespace: str, prefix: str, default_ttl: float = 60) -> ResponseCache:
+    """
+    Build a ResponseCache configured by environment variables:
+    ``{prefix}_BACKEND`` (memory|sqlite), ``{prefix}_PATH`` and ``{prefix}_TTL``.
+    """
+    backend = create_backend(
+        os.getenv(f"{prefix}_BACKEND", "memory"),
+        os.getenv(f"{prefix}_PATH"),
+    )
+    return ResponseCache(namespace, backend, ttl=float(os.getenv(f"{prefix}_TTL", default_ttl)))
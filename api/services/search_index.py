@@ -0,0 +1,542 @@
+"""
+Search Index Service
+
+Maintains SearchDocument, a denormalized corpus of songs, shows, venues,
+users, reviews and synopses, and queries it with the database's native
+full-text engine:
+- Postgres: a generated ``tsvector`` column with a GIN index for ranked
+  full-text matches, plus a ``pg_trgm`` index on titles for typo tolerance
+- SQLite: an external-content FTS5 table kept in sync by triggers, BM25
+  ranking, and typo correction against the FTS5 vocabulary
+- Anything else: a LIKE scan ordered by popularity
+
+Results are ranked by text relevance boosted by popularity (plays, votes).
+Documents are upserted incrementally by the write paths that change them;
+``rebuild`` (see rebuild_search_index.py) recreates everything.
+"""
+
+import difflib
+import logging
+import math
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, or_, select
+
+from api import database
+from api.models import SearchDocument, Show, Song, SongPerformance, Synopsis, User, Venue, Vote
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 500
+# Weight of log(1 + popularity) relative to text relevance
+POPULARITY_BOOST = 0.15
+# Postgres text search config for both the indexed vector and prefix queries.
+# Unstemmed, so a typed prefix matches the words it starts
+TS_CONFIG = "simple"
+
+SQLITE_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS searchdocument_fts USING fts5("
+    "title, body, content='searchdocument', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS searchdocument_vocab USING fts5vocab(searchdocument_fts, 'row')",
+    "CREATE TRIGGER IF NOT EXISTS searchdocument_ai AFTER INSERT ON searchdocument BEGIN "
+    "INSERT INTO searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS searchdocument_ad AFTER DELETE ON searchdocument BEGIN "
+    "INSERT INTO searchdocument_fts(searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS searchdocument_au AFTER UPDATE ON searchdocument BEGIN "
+    "INSERT INTO searchdocument_fts(searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+POSTGRES_SCHEMA = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Earlier versions stemmed the body with 'english', which prefix queries never matched
+    "DO $$ BEGIN IF EXISTS (SELECT 1 FROM information_schema.columns "
+    "WHERE table_name = 'searchdocument' AND column_name = 'search_vector' "
+    "AND generation_expression LIKE '%english%') "
+    "THEN ALTER TABLE searchdocument DROP COLUMN search_vector; END IF; END $$",
+    "ALTER TABLE searchdocument ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TS_CONFIG}', coalesce(body, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_searchdocument_vector ON searchdocument USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_searchdocument_title_trgm ON searchdocument USING GIN (title gin_trgm_ops)",
+]
+
+_fulltext_ready: Dict[str, bool] = {}
+
+
+def ensure_search_schema(connection) -> bool:
+    """
+    Attach the database-specific full-text index to SearchDocument.
+    Idempotent; run from create_db_and_tables after the tables exist.
+    Runs in a savepoint, so a failure leaves the caller's transaction usable.
+
+    Returns:
+        True if a native full-text index is available
+    """
+    dialect = connection.dialect.name
+    statements = {"sqlite": SQLITE_SCHEMA, "postgresql": POSTGRES_SCHEMA}.get(dialect)
+    if not statements:
+        return False
+    try:
+        with connection.begin_nested():
+            for statement in statements:
+                # no_parameters: the DDL contains literal % (LIKE patterns)
+                connection.exec_driver_sql(statement, execution_options={"no_parameters": True})
+        return True
+    except Exception as e:
+        # e.g. SQLite built without FTS5, or no permission to create pg_trgm
+        logger.warning(f"Full-text search unavailable, falling back to LIKE: {e}")
+        return False
+
+
+def _tokens(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())
+
+
+def _truncate(value: Optional[str], length: int = 120) -> Optional[str]:
+    if not value or len(value) <= length:
+        return value
+    return value[:length - 1].rstrip() + "…"
+
+
+class SearchIndexService:
+    """Service for maintaining and querying the search index."""
+
+    @staticmethod
+    def _has_fulltext(session: Session) -> bool:
+        """Whether ensure_search_schema has attached a native index to this database."""
+        bind = session.get_bind()
+        url = str(bind.url)
+        if url not in _fulltext_ready:
+            dialect = bind.dialect.name
+            if dialect == "sqlite":
+                check = "SELECT 1 FROM sqlite_master WHERE name = 'searchdocument_fts'"
+            elif dialect == "postgresql":
+                check = (
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'searchdocument' AND column_name = 'search_vector'"
+                )
+            else:
+                check = None
+            _fulltext_ready[url] = bool(check and session.execute(text(check)).first())
+        return _fulltext_ready[url]
+
+    @staticmethod
+    def upsert(session: Session, documents: List[dict]) -> int:
+        """
+        Insert or update documents keyed by (doc_type, key). The caller commits.
+
+        Returns:
+            Number of documents written
+        """
+        if not documents:
+            return 0
+        now = datetime.utcnow()
+        rows = [{"body": "", "subtitle": None, "object_id": None, **doc, "updated_at": now} for doc in documents]
+
+        dialect = session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            module = sqlite if dialect == "sqlite" else postgresql
+            statement = module.insert(SearchDocument)
+            statement = statement.on_conflict_do_update(
+                index_elements=["doc_type", "key"],
+                set_={
+                    column: statement.excluded[column]
+                    for column in ("object_id", "title", "subtitle", "url", "body", "popularity", "updated_at")
+                },
+            )
+            session.exec(statement, params=rows)
+        else:
+            for row in rows:
+                existing = session.exec(
+                    select(SearchDocument).where(
+                        SearchDocument.doc_type == row["doc_type"], SearchDocument.key == row["key"]
+                    )
+                ).first()
+                document = existing or SearchDocument()
+                for column, value in row.items():
+                    setattr(document, column, value)
+                session.add(document)
+        return len(rows)
+
+    # -- Document builders -------------------------------------------------
+
+    @staticmethod
+    def index_songs(session: Session, song_ids: Iterable[int]) -> int:
+        song_ids = list(set(song_ids))
+        if not song_ids:
+            return 0
+        stats = (
+            select(
+                SongPerformance.song_id,
+                func.count(SongPerformance.id).label("plays"),
+                func.coalesce(func.sum(SongPerformance.vote_count), 0).label("votes"),
+            )
+            .where(SongPerformance.song_id.in_(song_ids))
+            .group_by(SongPerformance.song_id)
+            .subquery()
+        )
+        rows = session.exec(
+            select(Song.id, Song.name, Song.slug, Song.artist, Song.original_artist, stats.c.plays, stats.c.votes)
+            .outerjoin(stats, stats.c.song_id == Song.id)
+            .where(Song.id.in_(song_ids))
+        ).all()
+        return SearchIndexService.upsert(session, [
+            {
+                "doc_type": "song",
+                "key": str(song_id),
+                "object_id": song_id,
+                "title": name,
+                "subtitle": original_artist or artist,
+                "url": f"/songs/{slug}",
+                "body": original_artist or "",
+                "popularity": (plays or 0) + (votes or 0),
+            }
+            for song_id, name, slug, artist, original_artist, plays, votes in rows
+        ])
+
+    @staticmethod
+    def index_shows(session: Session, show_ids: Iterable[int]) -> int:
+        """Index shows and the venues they were played at."""
+        show_ids = list(set(show_ids))
+        if not show_ids:
+            return 0
+        perf_votes = (
+            select(SongPerformance.show_id, func.sum(SongPerformance.vote_count).label("votes"))
+            .where(SongPerformance.show_id.in_(show_ids))
+            .group_by(SongPerformance.show_id)
+            .subquery()
+        )
+        rows = session.exec(
+            select(
+                Show.id, Show.date, Show.venue, Show.location, Show.tour, Show.vote_count, perf_votes.c.votes,
+                Show.venue_id,
+            )
+            .outerjoin(perf_votes, perf_votes.c.show_id == Show.id)
+            .where(Show.id.in_(show_ids))
+        ).all()
+        written = SearchIndexService.upsert(session, [
+            {
+                "doc_type": "show",
+                "key": str(show_id),
+                "object_id": show_id,
+                "title": f"{date} - {venue}",
+                "subtitle": location,
+                "url": f"/shows/{date}",
+                "body": " ".join(filter(None, [location, tour])),
+                "popularity": (vote_count or 0) + (votes or 0),
+            }
+            for show_id, date, venue, location, tour, vote_count, votes, _ in rows
+        ])
+        return written + SearchIndexService.index_venues(session, {row[7] for row in rows if row[7]})
+
+    @staticmethod
+    def index_venues(session: Session, venue_ids: Iterable[int]) -> int:
+        venue_ids = list(set(venue_ids))
+        if not venue_ids:
+            return 0
+        venues = session.exec(select(Venue).where(Venue.id.in_(venue_ids))).all()
+        return SearchIndexService.upsert(session, [
+            {
+                "doc_type": "venue",
+                "key": venue.slug,
+                "object_id": venue.id,
+                "title": venue.name,
+                "subtitle": ", ".join(filter(None, [venue.city, venue.state])),
+                "url": f"/venues/{venue.slug}",
+                "body": " ".join(filter(None, [venue.city, venue.state])),
+                "popularity": venue.show_count,
+            }
+            for venue in venues
+        ])
+
+    @staticmethod
+    def index_users(session: Session, user_ids: Iterable[int]) -> int:
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return 0
+        review_counts = (
+            select(Vote.user_id, func.count(Vote.id).label("reviews"))
+            .where(Vote.user_id.in_(user_ids))
+            .group_by(Vote.user_id)
+            .subquery()
+        )
+        rows = session.exec(
+            select(User.id, User.username, User.display_name, review_counts.c.reviews)
+            .outerjoin(review_counts, review_counts.c.user_id == User.id)
+            .where(User.id.in_(user_ids))
+        ).all()
+        return SearchIndexService.upsert(session, [
+            {
+                "doc_type": "user",
+                "key": str(user_id),
+                "object_id": user_id,
+                "title": username,
+                "subtitle": display_name or "User",
+                "url": f"/u/{username}",
+                "body": display_name or "",
+                "popularity": reviews or 0,
+            }
+            for user_id, username, display_name, reviews in rows
+        ])
+
+    @staticmethod
+    def index_reviews(session: Session, vote_ids: Iterable[int]) -> int:
+        """Index votes that carry review text; votes without text are removed."""
+        vote_ids = list(set(vote_ids))
+        if not vote_ids:
+            return 0
+        rows = session.exec(
+            select(
+                Vote.id, Vote.rating, Vote.comment, Vote.blurb, Vote.full_review, Vote.performance_id,
+                User.username, Song.name, Show.date, Show.venue,
+            )
+            .join(User, User.id == Vote.user_id)
+            .outerjoin(SongPerformance, SongPerformance.id == Vote.performance_id)
+            .outerjoin(Song, Song.id == SongPerformance.song_id)
+            .outerjoin(Show, Show.id == func.coalesce(Vote.show_id, SongPerformance.show_id))
+            .where(Vote.id.in_(vote_ids))
+        ).all()
+
+        documents, empty = [], []
+        for vote_id, rating, comment, blurb, full_review, performance_id, username, song_name, date, venue in rows:
+            body = " ".join(filter(None, [blurb, full_review, comment]))
+            if not body:
+                empty.append(str(vote_id))
+                continue
+            subject = f"{song_name} ({date})" if song_name else f"{date} - {venue}"
+            documents.append({
+                "doc_type": "review",
+                "key": str(vote_id),
+                "object_id": vote_id,
+                "title": f"{username} on {subject}",
+                "subtitle": _truncate(blurb or full_review or comment),
+                "url": f"/performances/{performance_id}" if performance_id else f"/shows/{date}",
+                "body": body,
+                "popularity": rating or 0,
+            })
+        SearchIndexService.remove(session, "review", empty)
+        return SearchIndexService.upsert(session, documents)
+
+    @staticmethod
+    def index_synopses(session: Session, synopsis_ids: Iterable[int]) -> int:
+        synopsis_ids = list(set(synopsis_ids))
+        if not synopsis_ids:
+            return 0
+        synopses = session.exec(select(Synopsis).where(Synopsis.id.in_(synopsis_ids))).all()
+        song_ids = [s.object_id for s in synopses if s.object_type == "song"]
+        show_ids = [s.object_id for s in synopses if s.object_type == "show"]
+        songs = {row[0]: row for row in session.exec(
+            select(Song.id, Song.name, Song.slug).where(Song.id.in_(song_ids))
+        ).all()} if song_ids else {}
+        shows = {row[0]: row for row in session.exec(
+            select(Show.id, Show.date, Show.venue).where(Show.id.in_(show_ids))
+        ).all()} if show_ids else {}
+
+        documents = []
+        for synopsis in synopses:
+            if synopsis.object_type == "song" and synopsis.object_id in songs:
+                _, name, slug = songs[synopsis.object_id]
+                title, url = name, f"/songs/{slug}"
+            elif synopsis.object_type == "show" and synopsis.object_id in shows:
+                _, date, venue = shows[synopsis.object_id]
+                title, url = f"{date} - {venue}", f"/shows/{date}"
+            else:
+                title, url = synopsis.object_type.title(), f"/wiki/{synopsis.object_type}/{synopsis.object_id}"
+            documents.append({
+                "doc_type": "synopsis",
+                "key": str(synopsis.id),
+                "object_id": synopsis.id,
+                "title": f"{title} (wiki)",
+                "subtitle": _truncate(synopsis.content),
+                "url": url,
+                "body": synopsis.content,
+                "popularity": synopsis.version,
+            })
+        return SearchIndexService.upsert(session, documents)
+
+    @staticmethod
+    def remove(session: Session, doc_type: str, keys: List[str]) -> None:
+        if not keys:
+            return
+        for document in session.exec(
+            select(SearchDocument).where(SearchDocument.doc_type == doc_type, SearchDocument.key.in_(keys))
+        ).all():
+            session.delete(document)
+
+    @staticmethod
+    def rebuild(session: Session) -> Dict[str, int]:
+        """
+        Re-index every searchable object in chunks, then commit.
+
+        Returns:
+            Documents written per type
+        """
+        counts = {}
+        sources = (
+            ("song", Song.id, SearchIndexService.index_songs),
+            ("show", Show.id, SearchIndexService.index_shows),
+            ("user", User.id, SearchIndexService.index_users),
+            ("review", Vote.id, SearchIndexService.index_reviews),
+            ("synopsis", Synopsis.id, SearchIndexService.index_synopses),
+        )
+        for name, id_column, index in sources:
+            ids = session.exec(select(id_column).order_by(id_column)).all()
+            counts[name] = 0
+            for i in range(0, len(ids), CHUNK_SIZE):
+                counts[name] += index(session, ids[i:i + CHUNK_SIZE])
+        session.commit()
+        logger.info(f"Search index rebuilt: {counts}")
+        return counts
+
+    # -- Queries -----------------------------------------------------------
+
+    @staticmethod
+    def search(
+        session: Session,
+        q: str,
+        types: Optional[List[str]] = None,
+        limit: int = 20,
+    ) -> List[SearchDocument]:
+        """
+        Ranked search across the corpus.
+
+        Args:
+            session: Database session
+            q: User query; partial words and small typos are tolerated
+            types: Optional doc_type filter
+            limit: Maximum results
+
+        Returns:
+            SearchDocuments, best match first
+        """
+        tokens = _tokens(q)
+        if not tokens:
+            return []
+
+        dialect = session.get_bind().dialect.name
+        scored = None
+        if SearchIndexService._has_fulltext(session):
+            if dialect == "sqlite":
+                scored = SearchIndexService._search_sqlite(session, tokens, types, limit)
+            elif dialect == "postgresql":
+                scored = SearchIndexService._search_postgres(session, q, tokens, types, limit)
+        if scored is None:
+            scored = SearchIndexService._search_like(session, tokens, types, limit)
+
+        ids = [doc_id for doc_id, _ in sorted(scored, key=lambda item: item[1], reverse=True)[:limit]]
+        if not ids:
+            return []
+        documents = {doc.id: doc for doc in session.exec(select(SearchDocument).where(SearchDocument.id.in_(ids))).all()}
+        return [documents[doc_id] for doc_id in ids if doc_id in documents]
+
+    @staticmethod
+    def _boost(relevance: float, popularity: float) -> float:
+        return relevance * (1 + POPULARITY_BOOST * math.log1p(max(popularity or 0, 0)))
+
+    @staticmethod
+    def _type_filter(types: Optional[List[str]], params: dict) -> str:
+        if not types:
+            return ""
+        names = []
+        for i, doc_type in enumerate(types):
+            params[f"type_{i}"] = doc_type
+            names.append(f":type_{i}")
+        return f" AND d.doc_type IN ({', '.join(names)})"
+
+    @staticmethod
+    def _search_sqlite(session: Session, tokens: List[str], types, limit: int):
+        def run(query_tokens):
+            params = {"match": " ".join(f'"{t}"*' for t in query_tokens), "n": limit * 3}
+            sql = (
+                "SELECT d.id, bm25(searchdocument_fts, 10.0, 1.0) AS rank, d.popularity "
+                "FROM searchdocument_fts JOIN searchdocument d ON d.id = searchdocument_fts.rowid "
+                "WHERE searchdocument_fts MATCH :match"
+                + SearchIndexService._type_filter(types, params)
+                + " ORDER BY rank LIMIT :n"
+            )
+            return [
+                (doc_id, SearchIndexService._boost(-rank, popularity))
+                for doc_id, rank, popularity in session.execute(text(sql), params).all()
+            ]
+
+        results = run(tokens)
+        if not results:
+            corrected = [SearchIndexService._correct_sqlite(session, token) for token in tokens]
+            if corrected != tokens:
+                logger.debug(f"Search corrected {tokens} to {corrected}")
+                results = run(corrected)
+        return results
+
+    @staticmethod
+    def _correct_sqlite(session: Session, token: str) -> str:
+        """Closest indexed term sharing the token's first letter, for typo tolerance."""
+        if len(token) < 4:
+            return token
+        first = token[0]
+        terms = [
+            row[0] for row in session.execute(
+                text("SELECT term FROM searchdocument_vocab WHERE term >= :lo AND term < :hi"),
+                {"lo": first, "hi": chr(ord(first) + 1)},
+            ).all()
+        ]
+        matches = difflib.get_close_matches(token, terms, n=1, cutoff=0.75)
+        return matches[0] if matches else token
+
+    @staticmethod
+    def _search_postgres(session: Session, q: str, tokens: List[str], types, limit: int):
+        params = {
+            "prefix": " & ".join(f"{t}:*" for t in tokens), "q": q, "n": limit * 3,
+            "config": TS_CONFIG, "boost": POPULARITY_BOOST,
+        }
+        sql = (
+            "SELECT d.id, ts_rank_cd(d.search_vector, to_tsquery(CAST(:config AS regconfig), :prefix)) "
+            "+ similarity(d.title, :q) AS relevance, d.popularity "
+            "FROM searchdocument d "
+            "WHERE (d.search_vector @@ to_tsquery(CAST(:config AS regconfig), :prefix) OR d.title % :q)"
+            + SearchIndexService._type_filter(types, params)
+            + " ORDER BY relevance * (1 + :boost * ln(1 + greatest(d.popularity, 0))) DESC LIMIT :n"
+        )
+        return [
+            (doc_id, SearchIndexService._boost(relevance, popularity))
+            for doc_id, relevance, popularity in session.execute(text(sql), params).all()
+        ]
+
+    @staticmethod
+    def _search_like(session: Session, tokens: List[str], types, limit: int):
+        statement = select(SearchDocument.id, SearchDocument.popularity)
+        for token in tokens:
+            pattern = f"%{token}%"
+            statement = statement.where(or_(SearchDocument.title.ilike(pattern), SearchDocument.body.ilike(pattern)))
+        if types:
+            statement = statement.where(SearchDocument.doc_type.in_(types))
+        rows = session.exec(statement.order_by(SearchDocument.popularity.desc()).limit(limit)).all()
+        return [(doc_id, SearchIndexService._boost(1.0, popularity)) for doc_id, popularity in rows]
+
+
+def index_vote_in_background(vote_id: int) -> None:
+    """
+    Background-task entry point after a vote is cast or edited: re-index the
+    review text and the popularity of what was voted on.
+    """
+    with Session(database.engine) as session:
+        vote = session.get(Vote, vote_id)
+        if not vote:
+            return
+        SearchIndexService.index_reviews(session, [vote.id])
+        if vote.performance_id:
+            performance = session.get(SongPerformance, vote.performance_id)
+            if performance:
+                SearchIndexService.index_songs(session, [performance.song_id])
+                SearchIndexService.index_shows(session, [performance.show_id])
+        if vote.show_id:
+            SearchIndexService.index_shows(session, [vote.show_id])
+        session.commit()
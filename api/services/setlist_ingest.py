@@ -0,0 +1,363 @@
+"""
+Set-based ingestion of El Goose setlists.
+
+Turns raw El Goose setlist rows into Show, Song and SongPerformance rows
+with a constant number of statements per batch, however many shows or
+songs the batch contains:
+- all song names (and venue slugs) are resolved with one IN query,
+  missing ones are bulk-inserted with ON CONFLICT DO NOTHING and
+  re-resolved once
+- shows and performances are inserted with multi-row INSERTs
+
+Used by the bulk seeder (seed_from_elgoose.py) and by ShowFetcher for
+on-demand imports. Callers own the transaction.
+"""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select, insert, update
+
+from api.models import Show, Song, SongPerformance, Venue
+from api.services.search_index import SearchIndexService
+from api.services.venues import slugify
+
+logger = logging.getLogger(__name__)
+
+
+def song_slug(song_name: str) -> str:
+    """URL-friendly slug used for Song.slug."""
+    return song_name.lower().replace(" ", "-").replace("'", "").replace(".", "")
+
+
+def index_dates(index_rows: list, start: str, end: str, artist: str = "Goose") -> List[str]:
+    """
+    Distinct show dates from the El Goose show index within [start, end].
+
+    Rows for other artists are dropped when the index carries an artist field.
+    """
+    dates = set()
+    for row in index_rows or []:
+        date_str = row.get("showdate")
+        if not date_str or not (start <= date_str <= end):
+            continue
+        row_artist = row.get("artist")
+        if row_artist and row_artist.lower() != artist.lower():
+            continue
+        dates.add(date_str)
+    return sorted(dates)
+
+
+def parse_setlist(date_str: str, setlist_data: list) -> Optional[dict]:
+    """
+    Parse El Goose setlist rows for one show into plain data.
+
+    Pure function (no I/O), so it can run in a worker pool.
+
+    Returns:
+        Dict with show fields and a ``performances`` list, or None if the
+        rows do not describe a show
+    """
+    if not setlist_data:
+        return None
+
+    first_item = setlist_data[0]
+    elgoose_id = first_item.get("show_id") or first_item.get("showid")
+    if not elgoose_id:
+        logger.warning(f"No show_id in El Goose data for {date_str}")
+        return None
+
+    city = first_item.get("city", "Unknown City")
+    state = first_item.get("state", "")
+
+    performances = []
+    position = 1
+    current_set = 1
+    for item in setlist_data:
+        song_name = item.get("songname")
+        if not song_name:
+            continue
+
+        # Determine set number from setname
+        set_name = item.get("setname", "")
+        if "Encore" in set_name:
+            current_set = 3
+        elif "2" in set_name:
+            current_set = 2
+
+        artist = item.get("artist") or ""
+        is_cover = bool(artist) and artist.lower() != "goose"
+        performances.append({
+            "song_name": song_name,
+            "is_cover": is_cover,
+            "original_artist": artist if is_cover else None,
+            "position": position,
+            "set_number": current_set,
+        })
+        position += 1
+
+    return {
+        "elgoose_id": int(elgoose_id),
+        "date": date_str,
+        "venue": first_item.get("venuename", "Unknown Venue"),
+        "city": city,
+        "state": state,
+        "location": f"{city}, {state}" if state else city,
+        "setlist_data": json.dumps(setlist_data),
+        "performances": performances,
+    }
+
+
+def _insert(session: Session, model):
+    """Dialect-specific INSERT so ON CONFLICT DO NOTHING is available."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    return insert(model)
+
+
+def _resolve_songs(session: Session, names: List[str]) -> Dict[str, int]:
+    if not names:
+        return {}
+    rows = session.exec(select(Song.name, Song.id).where(Song.name.in_(names))).all()
+    return {name: song_id for name, song_id in rows}
+
+
+def ensure_songs(session: Session, songs: Iterable[dict]) -> Dict[str, int]:
+    """
+    Resolve song names to ids, creating the missing songs in bulk.
+
+    Args:
+        session: Database session
+        songs: Dicts with song_name, is_cover and original_artist
+
+    Returns:
+        Mapping of song name to Song.id
+    """
+    by_name = {}
+    for song in songs:
+        by_name.setdefault(song["song_name"], song)
+
+    resolved = _resolve_songs(session, list(by_name))
+    missing = [name for name in by_name if name not in resolved]
+    if not missing:
+        return resolved
+
+    rows = [
+        {
+            "name": name,
+            "artist": "Goose",
+            "slug": song_slug(name),
+            "is_cover": by_name[name]["is_cover"],
+            "original_artist": by_name[name]["original_artist"],
+            "times_played": 0,
+            "current_honking_vote_count": 0,
+        }
+        for name in missing
+    ]
+    statement = _insert(session, Song)
+    if hasattr(statement, "on_conflict_do_nothing"):
+        statement = statement.on_conflict_do_nothing()
+    session.exec(statement, params=rows)
+
+    resolved.update(_resolve_songs(session, missing))
+
+    # Names whose slug collided with an existing song map onto that song
+    unresolved = {song_slug(name): name for name in missing if name not in resolved}
+    if unresolved:
+        for slug, song_id in session.exec(
+            select(Song.slug, Song.id).where(Song.slug.in_(list(unresolved)))
+        ).all():
+            resolved[unresolved[slug]] = song_id
+
+    logger.debug(f"Created {len(missing)} songs in bulk")
+    return resolved
+
+
+def split_location(location: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Split a Show.location ("City, ST") into city and state."""
+    if not location:
+        return None, None
+    city, _, state = location.rpartition(", ")
+    return (city, state) if city else (location, None)
+
+
+def ensure_venues(session: Session, venues: Iterable[dict]) -> Dict[str, int]:
+    """
+    Resolve venues to ids by slug, creating the missing venues in bulk.
+
+    Args:
+        session: Database session
+        venues: Dicts with venue (name), city and state
+
+    Returns:
+        Mapping of venue slug to Venue.id
+    """
+    by_slug = {}
+    for venue in venues:
+        if venue.get("venue"):
+            by_slug.setdefault(slugify(venue["venue"]), venue)
+    if not by_slug:
+        return {}
+
+    def resolve(slugs):
+        return dict(session.exec(select(Venue.slug, Venue.id).where(Venue.slug.in_(slugs))).all())
+
+    resolved = resolve(list(by_slug))
+    missing = [slug for slug in by_slug if slug not in resolved]
+    if not missing:
+        return resolved
+
+    statement = _insert(session, Venue)
+    if hasattr(statement, "on_conflict_do_nothing"):
+        statement = statement.on_conflict_do_nothing(index_elements=["slug"])
+    session.exec(statement, params=[
+        {
+            "name": by_slug[slug]["venue"],
+            "slug": slug,
+            "city": by_slug[slug].get("city") or None,
+            "state": by_slug[slug].get("state") or None,
+            "show_count": 0,
+        }
+        for slug in missing
+    ])
+    resolved.update(resolve(missing))
+    logger.debug(f"Created {len(missing)} venues in bulk")
+    return resolved
+
+
+def refresh_venues(session: Session, venue_ids: Iterable[int]) -> None:
+    """Recompute show_count and first/last show dates for the given venues."""
+    venue_ids = list(set(venue_ids))
+    if not venue_ids:
+        return
+    session.exec(
+        update(Venue)
+        .where(Venue.id.in_(venue_ids))
+        .values(
+            show_count=select(func.count(Show.id)).where(Show.venue_id == Venue.id).scalar_subquery(),
+            first_show_date=select(func.min(Show.date)).where(Show.venue_id == Venue.id).scalar_subquery(),
+            last_show_date=select(func.max(Show.date)).where(Show.venue_id == Venue.id).scalar_subquery(),
+        )
+    )
+
+
+def backfill_venues(session: Session) -> Dict[str, int]:
+    """
+    Link shows without a venue_id to Venue rows, creating venues as needed,
+    then recompute venue aggregates and re-index every venue for search.
+    The caller commits.
+
+    Returns:
+        Counts: venues (created or matched), shows_linked, shows_unlinked (still without a venue)
+    """
+    unlinked = session.exec(
+        select(Show.venue, func.max(Show.location))
+        .where(Show.venue_id.is_(None), Show.venue.is_not(None))
+        .group_by(Show.venue)
+    ).all()
+    venues = []
+    for name, location in unlinked:
+        city, state = split_location(location)
+        venues.append({"venue": name, "city": city, "state": state})
+    venue_ids = ensure_venues(session, venues)
+
+    names_by_id: Dict[int, List[str]] = {}
+    for name, _ in unlinked:
+        names_by_id.setdefault(venue_ids[slugify(name)], []).append(name)
+    linked = 0
+    for venue_id, names in names_by_id.items():
+        result = session.exec(
+            update(Show)
+            .where(Show.venue.in_(names), Show.venue_id.is_(None))
+            .values(venue_id=venue_id)
+        )
+        linked += result.rowcount
+
+    refresh_venues(session, venue_ids.values())
+    SearchIndexService.index_venues(session, session.exec(select(Venue.id)).all())
+    unlinked_shows = session.exec(select(func.count(Show.id)).where(Show.venue_id.is_(None))).one()
+    return {"venues": len(venue_ids), "shows_linked": linked, "shows_unlinked": unlinked_shows}
+
+
+def insert_shows(session: Session, parsed_shows: List[dict]) -> Dict[str, int]:
+    """
+    Insert parsed shows and all their performances with multi-row INSERTs.
+    Shows whose elgoose_id already exists, including ones a concurrent import
+    inserts first, are skipped along with their performances.
+
+    Args:
+        session: Database session
+        parsed_shows: Output of parse_setlist
+
+    Returns:
+        Counts: shows_created, shows_skipped, performances_created
+    """
+    counts = {"shows_created": 0, "shows_skipped": 0, "performances_created": 0}
+    unique = {show["elgoose_id"]: show for show in parsed_shows if show}
+    if not unique:
+        return counts
+
+    existing = set(session.exec(
+        select(Show.elgoose_id).where(Show.elgoose_id.in_(list(unique)))
+    ).all())
+    new_shows = [show for elgoose_id, show in unique.items() if elgoose_id not in existing]
+    counts["shows_skipped"] = len(unique) - len(new_shows)
+    if not new_shows:
+        return counts
+
+    venue_ids = ensure_venues(session, new_shows)
+
+    # RETURNING only yields the rows this statement inserted: shows a concurrent
+    # import won in the meantime are skipped, with their performances
+    statement = _insert(session, Show)
+    if hasattr(statement, "on_conflict_do_nothing"):
+        statement = statement.on_conflict_do_nothing(index_elements=["elgoose_id"])
+    show_ids = dict(session.exec(statement.returning(Show.elgoose_id, Show.id), params=[
+        {
+            "elgoose_id": show["elgoose_id"],
+            "date": show["date"],
+            "venue": show["venue"],
+            "venue_id": venue_ids.get(slugify(show["venue"])),
+            "location": show["location"],
+            "setlist_data": show["setlist_data"],
+            "vote_count": 0,
+            "rating_sum": 0,
+        }
+        for show in new_shows
+    ]).all())
+    created = [show for show in new_shows if show["elgoose_id"] in show_ids]
+    counts["shows_skipped"] = len(unique) - len(created)
+    if not created:
+        return counts
+
+    song_ids = ensure_songs(session, (p for show in created for p in show["performances"]))
+
+    performance_rows = [
+        {
+            "song_id": song_ids[perf["song_name"]],
+            "show_id": show_ids[show["elgoose_id"]],
+            "position": perf["position"],
+            "set_number": perf["set_number"],
+            "honking_vote_count": 0,
+            "vote_count": 0,
+            "rating_sum": 0,
+        }
+        for show in created
+        for perf in show["performances"]
+        if perf["song_name"] in song_ids
+    ]
+    if performance_rows:
+        session.exec(insert(SongPerformance), params=performance_rows)
+
+    refresh_venues(session, venue_ids.values())
+    SearchIndexService.index_shows(session, show_ids.values())
+    SearchIndexService.index_songs(session, {row["song_id"] for row in performance_rows})
+
+    counts["shows_created"] = len(created)
+    counts["performances_created"] = len(performance_rows)
+    return counts
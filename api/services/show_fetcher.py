@@ -11,19 +11,22 @@ This allows the database to grow organically as users request shows,
 without requiring a bulk initial scrape.
 """
 
-import requests
-import json
 import logging
-from datetime import datetime
+from typing import Optional
 from sqlmodel import Session, select
 from sqlalchemy.exc import IntegrityError
 
-from api.models import Show, Song, SongPerformance
-from api.services.cache_manager import CacheManager
+from api.models import Show
+from api.services.cache_manager import get_cache_manager, negative_ttl_for_date
+from api.services.elgoose_client import ElGooseError, get_elgoose_client
+from api.services.setlist_ingest import insert_shows, parse_setlist
+from api.services.single_flight import SingleFlight, advisory_lock
+from api.services.typeahead import typeahead
 
 logger = logging.getLogger(__name__)
 
-EL_GOOSE_BASE_URL = "https://elgoose.net/api/v2"
+# Coalesces concurrent on-demand imports of the same date in this process
+_show_imports = SingleFlight()
 
 
 class ShowFetcher:
@@ -40,100 +43,38 @@ class ShowFetcher:
         Returns:
             List of show data or None if not found
         """
-        from services.cache_manager import CacheManager
-        cache = CacheManager()
+        cache = get_cache_manager()
         cache_key = f"show_date_{date_str}"
-        
-        # Check cache first
-        cached_data = cache.get(cache_key)
-        if cached_data:
+
+        # Check cache first (a negative entry means "no show on this date")
+        found, cached_data = cache.lookup(cache_key)
+        if found:
             logger.info(f"Using cached data for {date_str}")
             return cached_data
 
         try:
-            url = f"{EL_GOOSE_BASE_URL}/setlists/showdate/{date_str}.json"
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                # Handle wrapped response
-                result = None
-                if isinstance(data, dict) and "data" in data:
-                    if data.get("error") and data["error"] != 0:
-                        return None
-                    result = data["data"]
-                elif isinstance(data, list) and len(data) > 0:
-                    result = data
-                
-                if result:
-                    cache.set(cache_key, result)
-                    return result
-
-            return None
-        except Exception as e:
+            result = get_elgoose_client().get_setlist(date_str)
+        except ElGooseError as e:
             logger.warning(f"Error fetching from El Goose for {date_str}: {e}")
             return None
 
-    @staticmethod
-    def create_or_update_song(session: Session, song_name: str, item_data: dict = None) -> Song:
-        """
-        Get existing song or create new one.
-
-        Args:
-            session: Database session
-            song_name: Name of the song
-            item_data: Optional El Goose item data with additional info
-
-        Returns:
-            Song object
-        """
-        # Try to find existing song
-        existing = session.exec(
-            select(Song).where(Song.name == song_name)
-        ).first()
-
-        if existing:
-            return existing
-
-        # Determine if it's a cover
-        is_cover = False
-        original_artist = None
-
-        if item_data and "artist" in item_data:
-            is_cover = item_data.get("artist", "").lower() != "goose"
-            if is_cover:
-                original_artist = item_data.get("artist")
-
-        # Create slug
-        slug = song_name.lower().replace(" ", "-").replace("'", "").replace(".", "")
-
-        # Create new song
-        song = Song(
-            name=song_name,
-            artist="Goose",
-            slug=slug,
-            is_cover=is_cover,
-            original_artist=original_artist,
-        )
-
-        try:
-            session.add(song)
-            session.commit()
-            session.refresh(song)
-            return song
-        except IntegrityError:
-            # Handle race condition where song was created by another request
-            session.rollback()
-            return session.exec(
-                select(Song).where(Song.name == song_name)
-            ).first()
+        if result:
+            cache.set(cache_key, result)
+            return result
+        if result is not None:
+            cache.set_negative(cache_key, negative_ttl_for_date(date_str))
+        return None
 
     @staticmethod
     def populate_show(session: Session, date_str: str, setlist_data: list) -> Show:
         """
         Create a show and its song performances from El Goose data.
 
+        All songs of the setlist are resolved with one IN query, missing songs
+        are bulk-inserted and the performances are written with one multi-row
+        INSERT, all in a single transaction. If a concurrent import inserted
+        the show first, nothing is written and the winner's show is returned.
+
         Args:
             session: Database session
             date_str: Date in YYYY-MM-DD format
@@ -142,103 +83,68 @@ class ShowFetcher:
         Returns:
             Show object or None if creation failed
         """
-        try:
-            if not setlist_data or len(setlist_data) == 0:
-                return None
-
-            first_item = setlist_data[0]
-
-            # Extract identifiers
-            elgoose_id = first_item.get("show_id") or first_item.get("showid")
-            if not elgoose_id:
-                logger.warning(f"No show_id in El Goose data for {date_str}")
-                return None
-
-            # Check if already exists
-            existing = session.exec(
-                select(Show).where(Show.elgoose_id == elgoose_id)
-            ).first()
-
-            if existing:
-                return existing
-
-            # Extract venue info
-            venue = first_item.get("venuename", "Unknown Venue")
-            city = first_item.get("city", "Unknown City")
-            state = first_item.get("state", "")
-            location = f"{city}, {state}" if state else city
-
-            # Create show
-            show = Show(
-                elgoose_id=elgoose_id,
-                date=date_str,
-                venue=venue,
-                location=location,
-                setlist_data=json.dumps(setlist_data),
-            )
-
-            session.add(show)
-            session.flush()  # Get show ID for foreign key
-
-            # Create performances
-            position = 1
-            current_set = 1
-
-            for item in setlist_data:
-                song_name = item.get("songname")
-                if not song_name:
-                    continue
-
-                # Get or create song
-                song = ShowFetcher.create_or_update_song(session, song_name, item)
-
-                # Determine set number from setname
-                set_name = item.get("setname", "")
-                if "Encore" in set_name:
-                    current_set = 3
-                elif "2" in set_name:
-                    current_set = 2
-
-                # Create performance
-                performance = SongPerformance(
-                    song_id=song.id,
-                    show_id=show.id,
-                    position=position,
-                    set_number=current_set,
-                    notes=None,  # Could extract guest info here
-                )
-
-                session.add(performance)
-                position += 1
+        parsed = parse_setlist(date_str, setlist_data)
+        if not parsed:
+            return None
 
-            # Commit all changes
+        try:
+            counts = insert_shows(session, [parsed])
             session.commit()
-            session.refresh(show)
+        except IntegrityError:
+            # Race with a concurrent import on dialects without ON CONFLICT
+            # (elsewhere insert_shows skips the lost show itself)
+            session.rollback()
+            counts = None
+        except Exception as e:
+            logger.error(f"Error populating show for {date_str}: {e}")
+            session.rollback()
+            return None
 
+        show = session.exec(
+            select(Show).where(Show.elgoose_id == parsed["elgoose_id"])
+        ).first()
+        if show and counts and counts["shows_created"]:
             logger.info(
-                f"✓ Created show: {venue} on {date_str} "
-                f"({len(setlist_data)} songs, elgoose_id={elgoose_id})"
+                f"✓ Created show: {parsed['venue']} on {date_str} "
+                f"({counts['performances_created']} songs, elgoose_id={parsed['elgoose_id']})"
             )
+            typeahead.add_shows(session, [show.id])
+        return show
 
-            return show
+    @staticmethod
+    def _import_show(session: Session, date_str: str) -> Optional[int]:
+        """
+        Fetch and populate a show, returning its id. Runs once per date at a
+        time (see get_or_fetch_show), so callers must re-load the Show in
+        their own session.
+        """
+        # Serialize with other workers, then re-check: one of them may have
+        # imported the show while we waited
+        if advisory_lock(session, f"show_import:{date_str}"):
+            show = session.exec(select(Show).where(Show.date == date_str)).first()
+            if show:
+                session.commit()
+                return show.id
 
-        except IntegrityError:
-            # Handle race condition where show was created by concurrent request
-            session.rollback()
-            return session.exec(
-                select(Show).where(Show.date == date_str)
-            ).first()
-        except Exception as e:
-            logger.error(f"Error populating show for {date_str}: {e}")
+        logger.info(f"Show not in database, fetching from El Goose for {date_str}")
+        setlist_data = ShowFetcher.fetch_from_elgoose(date_str)
+
+        if not setlist_data:
+            logger.info(f"No show found in El Goose for {date_str}")
             session.rollback()
             return None
 
+        show = ShowFetcher.populate_show(session, date_str, setlist_data)
+        return show.id if show else None
+
     @staticmethod
     def get_or_fetch_show(session: Session, date_str: str) -> Show:
         """
         Get show from database, or fetch from El Goose and populate if not found.
 
-        This is the main entry point for on-demand show fetching.
+        This is the main entry point for on-demand show fetching. Concurrent
+        requests for the same missing date are coalesced: one request fetches
+        and populates the show while the others wait for its result.
 
         Args:
             session: Database session
@@ -256,14 +162,5 @@ class ShowFetcher:
             logger.debug(f"Found show in database for {date_str}")
             return show
 
-        # Not in database, fetch from El Goose
-        logger.info(f"Show not in database, fetching from El Goose for {date_str}")
-        setlist_data = ShowFetcher.fetch_from_elgoose(date_str)
-
-        if not setlist_data:
-            logger.info(f"No show found in El Goose for {date_str}")
-            return None
-
-        # Populate database
-        show = ShowFetcher.populate_show(session, date_str, setlist_data)
-        return show
+        show_id = _show_imports.do(date_str, lambda: ShowFetcher._import_show(session, date_str))
+        return session.get(Show, show_id) if show_id else None
@@ -0,0 +1,92 @@
+"""
+Per-key request coalescing.
+
+``SingleFlight.do(key, fn)`` runs ``fn`` once for all callers that ask for
+the same key while a call is in flight; the others block until it finishes
+and receive its result (or its exception). Nothing is cached afterwards, the
+next caller for the key starts a fresh call.
+
+For coordination across worker processes on Postgres, ``advisory_lock``
+takes a transaction-scoped advisory lock that is released on commit or
+rollback.
+"""
+
+import logging
+import threading
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key within one process."""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` unless a call for ``key`` is already in flight, in which
+        case wait for that call and share its outcome.
+
+        Args:
+            key: Identifies equivalent work
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            The result of the single in-flight call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["calls"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+def advisory_lock(session: Session, key: str) -> bool:
+    """
+    Take a Postgres transaction-level advisory lock for ``key``, blocking
+    until other workers holding it commit. No-op on other databases.
+
+    Returns:
+        True if a lock was taken
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    lock_id = zlib.crc32(key.encode("utf-8"))
+    session.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": lock_id})
+    logger.debug(f"Acquired advisory lock for {key}")
+    return True
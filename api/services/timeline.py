@@ -0,0 +1,302 @@
+"""
+Following Timeline Service
+
+Maintains TimelineEntry, the materialized "people I follow" feed, with a
+hybrid fan-out strategy:
+- Fan-out on write: when a user reviews, one INSERT ... SELECT copies the vote
+  into every follower's timeline (run as a background task)
+- Fan-out on read: users with more than FANOUT_FOLLOWER_LIMIT followers are
+  skipped on write; readers merge those users' recent votes at read time
+
+Follower counts come from the maintained UserCounters.followers_count, so
+the read path only adds primary-key lookups per followee. When an unfollow
+brings an author back down to the limit, their recent votes (cast while
+they were served on read) are backfilled into their followers' timelines
+in the background.
+
+Timelines are capped at MAX_ENTRIES per reader. Trimming is amortized: a
+fan-out trims its followers' timelines with probability TRIM_PROBABILITY.
+Following someone backfills their recent votes; unfollowing removes them.
+"""
+
+import logging
+import os
+import random
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, delete, exists, literal, or_, true
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, func, insert, select
+
+from api import database
+from api.models import TimelineEntry, UserCounters, UserFollow, Vote
+
+logger = logging.getLogger(__name__)
+
+FANOUT_FOLLOWER_LIMIT = int(os.getenv("TIMELINE_FANOUT_LIMIT", 5000))
+MAX_ENTRIES = int(os.getenv("TIMELINE_MAX_ENTRIES", 800))
+TRIM_PROBABILITY = float(os.getenv("TIMELINE_TRIM_PROBABILITY", 0.05))
+
+TIMELINE_COLUMNS = ["user_id", "vote_id", "actor_id", "created_at"]
+
+
+def _before(created_at_col, id_col, after: Optional[Tuple[datetime, int]]):
+    """Keyset condition for rows strictly after ``after`` in (created_at, id) DESC order."""
+    last_created_at, last_id = after
+    return or_(
+        created_at_col < last_created_at,
+        and_(created_at_col == last_created_at, id_col < last_id),
+    )
+
+
+class TimelineService:
+    """Service for maintaining and reading following timelines."""
+
+    @staticmethod
+    def follower_count(session: Session, user_id: int) -> int:
+        """A user's follower count from UserCounters, recounted only if the row is missing."""
+        count = session.exec(
+            select(UserCounters.followers_count).where(UserCounters.user_id == user_id)
+        ).first()
+        if count is None:
+            count = session.exec(
+                select(func.count()).select_from(UserFollow).where(UserFollow.followed_id == user_id)
+            ).one()
+        return count
+
+    @staticmethod
+    def fan_out_vote(session: Session, vote_id: int, trim: Optional[bool] = None) -> int:
+        """
+        Copy a vote into its author's followers' timelines.
+
+        Args:
+            session: Database session (caller commits)
+            vote_id: The new vote
+            trim: Force (True) or skip (False) trimming; None samples TRIM_PROBABILITY
+
+        Returns:
+            Number of timeline entries written (0 for high-follower authors)
+        """
+        vote = session.get(Vote, vote_id)
+        if not vote:
+            return 0
+        if TimelineService.follower_count(session, vote.user_id) > FANOUT_FOLLOWER_LIMIT:
+            logger.debug(f"Skipping fan-out for user {vote.user_id}: served on read")
+            return 0
+
+        followers = (
+            select(
+                UserFollow.follower_id,
+                literal(vote.id),
+                literal(vote.user_id),
+                literal(vote.created_at, TimelineEntry.__table__.c.created_at.type),
+            )
+            .where(
+                UserFollow.followed_id == vote.user_id,
+                UserFollow.follower_id != vote.user_id,
+                ~exists().where(
+                    TimelineEntry.user_id == UserFollow.follower_id,
+                    TimelineEntry.vote_id == vote.id,
+                ),
+            )
+            .distinct()
+        )
+        result = session.exec(insert(TimelineEntry).from_select(TIMELINE_COLUMNS, followers))
+
+        if trim or (trim is None and random.random() < TRIM_PROBABILITY):
+            TimelineService.trim(
+                session,
+                select(UserFollow.follower_id).where(UserFollow.followed_id == vote.user_id),
+            )
+        return result.rowcount
+
+    @staticmethod
+    def on_follow(session: Session, follower_id: int, followed_id: int) -> None:
+        """
+        Backfill a new follow's recent votes into the follower's timeline.
+        Call after UserStatsService.on_follow, so the follower count includes this follow.
+        """
+        if TimelineService.follower_count(session, followed_id) > FANOUT_FOLLOWER_LIMIT:
+            return
+        recent = (
+            select(
+                literal(follower_id),
+                Vote.id,
+                Vote.user_id,
+                Vote.created_at,
+            )
+            .where(
+                Vote.user_id == followed_id,
+                ~exists().where(
+                    TimelineEntry.user_id == follower_id,
+                    TimelineEntry.vote_id == Vote.id,
+                ),
+            )
+            .order_by(Vote.created_at.desc(), Vote.id.desc())
+            .limit(MAX_ENTRIES)
+        )
+        session.exec(insert(TimelineEntry).from_select(TIMELINE_COLUMNS, recent))
+
+    @staticmethod
+    def on_unfollow(session: Session, follower_id: int, followed_id: int) -> bool:
+        """
+        Remove an unfollowed user's votes from the follower's timeline.
+        Call after UserStatsService.on_follow(..., delta=-1).
+
+        Returns:
+            True if the unfollowed user just dropped to FANOUT_FOLLOWER_LIMIT
+            followers; the caller should then run backfill_followers for them
+        """
+        session.exec(
+            delete(TimelineEntry).where(
+                TimelineEntry.user_id == follower_id,
+                TimelineEntry.actor_id == followed_id,
+            )
+        )
+        return TimelineService.follower_count(session, followed_id) == FANOUT_FOLLOWER_LIMIT
+
+    @staticmethod
+    def backfill_followers(session: Session, author_id: int) -> int:
+        """
+        Copy an author's recent votes into every follower's timeline, e.g. once
+        they are fanned out on write again. Votes already present are skipped.
+
+        Args:
+            session: Database session (caller commits)
+            author_id: The author
+
+        Returns:
+            Number of timeline entries written
+        """
+        recent = (
+            select(Vote.id, Vote.created_at)
+            .where(Vote.user_id == author_id)
+            .order_by(Vote.created_at.desc(), Vote.id.desc())
+            .limit(MAX_ENTRIES)
+            .subquery()
+        )
+        entries = (
+            select(UserFollow.follower_id, recent.c.id, literal(author_id), recent.c.created_at)
+            .join(recent, true())
+            .where(
+                UserFollow.followed_id == author_id,
+                UserFollow.follower_id != author_id,
+                ~exists().where(
+                    TimelineEntry.user_id == UserFollow.follower_id,
+                    TimelineEntry.vote_id == recent.c.id,
+                ),
+            )
+        )
+        result = session.exec(insert(TimelineEntry).from_select(TIMELINE_COLUMNS, entries))
+        TimelineService.trim(
+            session, select(UserFollow.follower_id).where(UserFollow.followed_id == author_id)
+        )
+        return result.rowcount
+
+    @staticmethod
+    def trim(session: Session, user_ids=None, max_entries: int = MAX_ENTRIES) -> int:
+        """
+        Delete entries beyond the newest ``max_entries`` per reader.
+
+        Args:
+            session: Database session (caller commits)
+            user_ids: Readers to trim (list or subquery); None trims everyone
+            max_entries: Entries to keep per reader
+
+        Returns:
+            Number of entries deleted
+        """
+        ranked = select(
+            TimelineEntry.id,
+            func.row_number().over(
+                partition_by=TimelineEntry.user_id,
+                order_by=(TimelineEntry.created_at.desc(), TimelineEntry.vote_id.desc()),
+            ).label("rank"),
+        )
+        if user_ids is not None:
+            ranked = ranked.where(TimelineEntry.user_id.in_(user_ids))
+        ranked = ranked.subquery()
+
+        result = session.exec(
+            delete(TimelineEntry).where(
+                TimelineEntry.id.in_(select(ranked.c.id).where(ranked.c.rank > max_entries))
+            )
+        )
+        return result.rowcount
+
+    @staticmethod
+    def high_follower_followees(session: Session, user_id: int) -> List[int]:
+        """Users ``user_id`` follows whose votes are merged on read instead of fanned out."""
+        # Recount followees without a UserCounters row, as follower_count does on write
+        followers = aliased(UserFollow)
+        recount = (
+            select(func.count())
+            .select_from(followers)
+            .where(followers.followed_id == UserFollow.followed_id)
+            .scalar_subquery()
+        )
+        return session.exec(
+            select(UserFollow.followed_id)
+            .outerjoin(UserCounters, UserCounters.user_id == UserFollow.followed_id)
+            .where(
+                UserFollow.follower_id == user_id,
+                func.coalesce(UserCounters.followers_count, recount) > FANOUT_FOLLOWER_LIMIT,
+            )
+        ).all()
+
+    @staticmethod
+    def page(
+        session: Session,
+        user_id: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> List[Tuple[datetime, int]]:
+        """
+        One page of a reader's timeline, newest first.
+
+        Args:
+            session: Database session
+            user_id: The reader
+            limit: Page size; up to ``limit + 1`` keys are returned so the
+                caller can tell whether another page exists
+            after: (created_at, vote_id) of the last item of the previous page
+
+        Returns:
+            List of (created_at, vote_id)
+        """
+        statement = select(TimelineEntry.created_at, TimelineEntry.vote_id).where(
+            TimelineEntry.user_id == user_id
+        )
+        if after:
+            statement = statement.where(_before(TimelineEntry.created_at, TimelineEntry.vote_id, after))
+        keys = session.exec(
+            statement.order_by(TimelineEntry.created_at.desc(), TimelineEntry.vote_id.desc()).limit(limit + 1)
+        ).all()
+
+        followees = TimelineService.high_follower_followees(session, user_id)
+        if followees:
+            statement = select(Vote.created_at, Vote.id).where(Vote.user_id.in_(followees))
+            if after:
+                statement = statement.where(_before(Vote.created_at, Vote.id, after))
+            keys += session.exec(
+                statement.order_by(Vote.created_at.desc(), Vote.id.desc()).limit(limit + 1)
+            ).all()
+            keys = sorted(set(keys), reverse=True)
+
+        return [tuple(key) for key in keys[:limit + 1]]
+
+
+def fan_out_vote_in_background(vote_id: int) -> None:
+    """Background-task entry point: fan a vote out in its own session."""
+    with Session(database.engine) as session:
+        TimelineService.fan_out_vote(session, vote_id)
+        session.commit()
+
+
+def backfill_followers_in_background(author_id: int) -> None:
+    """Background-task entry point: backfill an author's followers in its own session."""
+    with Session(database.engine) as session:
+        written = TimelineService.backfill_followers(session, author_id)
+        session.commit()
+    logger.info(f"Backfilled {written} timeline entries for followers of user {author_id}")
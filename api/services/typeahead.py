@@ -0,0 +1,231 @@
+"""
+Typeahead Index
+
+An in-process prefix index of song, venue, tour and user names that backs
+``/search/suggest`` without touching the database.
+
+Every word of an entry's label is kept in one sorted list of
+``(word, entry_key)`` pairs. A lookup bisects to the first word starting with
+the query's longest term and walks forward, so its cost depends on the number
+of matches rather than the size of the corpus. Every query term must
+prefix some word of the label ("red roc" matches "Red Rocks").
+Matches are ranked by whole-label prefix first, then weight (plays, shows).
+
+Each API worker builds its own copy at startup (``load``) and applies its own
+writes incrementally (``add_shows``, ``add_users``). Writes made by other
+workers are picked up by a reload once the index is older than
+REFRESH_SECONDS.
+"""
+
+import bisect
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import Session, func, select
+
+from api import database
+from api.models import Show, Song, SongPerformance, User, Venue
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = int(os.getenv("TYPEAHEAD_REFRESH_SECONDS", 300))
+TYPES = ("song", "venue", "tour", "user")
+
+_WORD = re.compile(r"\w+")
+
+EntryKey = Tuple[str, str]
+
+
+def normalize(value: str) -> List[str]:
+    """Lowercase, accent-folded words of ``value``."""
+    folded = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    return _WORD.findall(folded.lower())
+
+
+def _entry(type: str, key, label: str, url: str, weight: Optional[int]) -> dict:
+    return {"type": type, "key": str(key), "label": label, "url": url, "weight": weight or 0}
+
+
+def _catalog_entries(session: Session, show_ids: Optional[List[int]] = None) -> List[dict]:
+    """Song, venue and tour entries, limited to those appearing in ``show_ids`` if given."""
+    plays = (
+        select(SongPerformance.song_id, func.count(SongPerformance.id).label("plays"))
+        .group_by(SongPerformance.song_id)
+        .subquery()
+    )
+    songs = select(Song.id, Song.name, Song.slug, plays.c.plays).outerjoin(plays, plays.c.song_id == Song.id)
+    venues = select(Venue.slug, Venue.name, Venue.show_count)
+    tours = select(Show.tour, func.count(Show.id)).where(Show.tour.is_not(None))
+    if show_ids is not None:
+        songs = songs.where(
+            Song.id.in_(select(SongPerformance.song_id).where(SongPerformance.show_id.in_(show_ids)))
+        )
+        venues = venues.where(Venue.id.in_(select(Show.venue_id).where(Show.id.in_(show_ids))))
+        tours = tours.where(Show.tour.in_(select(Show.tour).where(Show.id.in_(show_ids))))
+
+    entries = [
+        _entry("song", song_id, name, f"/songs/{slug}", count)
+        for song_id, name, slug, count in session.exec(songs).all()
+    ]
+    entries += [
+        _entry("venue", slug, name, f"/venues/{slug}", count)
+        for slug, name, count in session.exec(venues).all()
+    ]
+    entries += [
+        _entry("tour", tour, tour, f"/tours/{tour}", count)
+        for tour, count in session.exec(tours.group_by(Show.tour)).all()
+    ]
+    return entries
+
+
+def _user_entries(session: Session, user_ids: Optional[List[int]] = None) -> Tuple[List[dict], List[int]]:
+    """Entries for indexable users, plus the ids of users that opted out."""
+    statement = select(User.id, User.username, User.indexable)
+    if user_ids is not None:
+        statement = statement.where(User.id.in_(user_ids))
+    entries, hidden = [], []
+    for user_id, username, indexable in session.exec(statement).all():
+        if indexable:
+            entries.append(_entry("user", user_id, username, f"/u/{username}", 0))
+        else:
+            hidden.append(user_id)
+    return entries, hidden
+
+
+class TypeaheadIndex:
+    """Thread-safe in-memory prefix index; see the module docstring."""
+
+    def __init__(self):
+        self._entries: Dict[EntryKey, dict] = {}
+        self._words: List[Tuple[str, EntryKey]] = []
+        self._lock = threading.Lock()
+        self._reloading = False
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, session: Session) -> int:
+        """
+        Replace the index with every song, venue, tour and user in the database.
+
+        Returns:
+            Number of entries loaded
+        """
+        entries = _catalog_entries(session) + _user_entries(session)[0]
+        by_key = {(e["type"], e["key"]): e for e in entries}
+        words = sorted(
+            (word, key) for key, entry in by_key.items() for word in set(normalize(entry["label"]))
+        )
+        with self._lock:
+            self._entries, self._words = by_key, words
+            self.loaded_at = time.monotonic()
+        logger.info(f"Typeahead index loaded with {len(by_key)} entries")
+        return len(by_key)
+
+    def is_stale(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > REFRESH_SECONDS
+
+    def _put(self, entry: dict) -> None:
+        """Insert or replace one entry. Caller holds the lock."""
+        key = (entry["type"], entry["key"])
+        self._discard(key)
+        self._entries[key] = entry
+        for word in set(normalize(entry["label"])):
+            bisect.insort(self._words, (word, key))
+
+    def _discard(self, key: EntryKey) -> None:
+        """Remove one entry if present. Caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for word in set(normalize(entry["label"])):
+            i = bisect.bisect_left(self._words, (word, key))
+            if i < len(self._words) and self._words[i] == (word, key):
+                del self._words[i]
+
+    def add_shows(self, session: Session, show_ids: Iterable[int]) -> None:
+        """Add or refresh the songs, venues and tours of newly created shows."""
+        show_ids = list(show_ids)
+        if not show_ids:
+            return
+        entries = _catalog_entries(session, show_ids)
+        with self._lock:
+            for entry in entries:
+                self._put(entry)
+
+    def add_users(self, session: Session, user_ids: Iterable[int]) -> None:
+        """Add new users, or refresh them after a username or privacy change."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        entries, hidden = _user_entries(session, user_ids)
+        with self._lock:
+            for entry in entries:
+                self._put(entry)
+            for user_id in hidden:
+                self._discard(("user", str(user_id)))
+
+    def suggest(self, q: str, types: Optional[Iterable[str]] = None, limit: int = 8) -> List[dict]:
+        """
+        Entries whose label words start with every term of ``q``.
+
+        Args:
+            q: User input; the last term may be partial
+            types: Restrict to these entry types
+            limit: Maximum suggestions
+
+        Returns:
+            List of {"type", "key", "label", "url"} dicts, best first
+        """
+        terms = normalize(q)
+        if not terms:
+            return []
+        first, rest = max(terms, key=len), terms
+        types = set(types) if types else None
+        phrase = " ".join(terms)
+
+        with self._lock:
+            start = bisect.bisect_left(self._words, (first, ("", "")))
+            keys = set()
+            for i in range(start, len(self._words)):
+                word, key = self._words[i]
+                if not word.startswith(first):
+                    break
+                keys.add(key)
+            matches = [self._entries[key] for key in keys if not types or key[0] in types]
+
+        scored = []
+        for entry in matches:
+            words = normalize(entry["label"])
+            if not all(any(word.startswith(term) for word in words) for term in rest):
+                continue
+            label_prefix = " ".join(words).startswith(phrase)
+            scored.append((not label_prefix, -entry["weight"], entry["label"].lower(), entry))
+        scored.sort(key=lambda item: item[:3])
+        return [
+            {"type": e["type"], "key": e["key"], "label": e["label"], "url": e["url"]}
+            for *_, e in scored[:limit]
+        ]
+
+    def reload_in_background(self) -> None:
+        """Background-task entry point: reload in its own session, once at a time."""
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        try:
+            with Session(database.engine) as session:
+                self.load(session)
+        except Exception as e:
+            logger.error(f"Typeahead reload failed: {e}")
+        finally:
+            self._reloading = False
+
+
+typeahead = TypeaheadIndex()
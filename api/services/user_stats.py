@@ -0,0 +1,151 @@
+"""
+User Stats Counter Service
+
+Maintains UserCounters, one row of denormalized counters per user, so
+profile and user endpoints read a single row by primary key instead of
+counting (or loading) every vote, follow, attendance and list.
+
+Counters:
+- votes_count: Vote rows cast by the user (ratings and reviews alike)
+- followers_count / following_count: UserFollow rows on either side
+- shows_attended: UserShowAttendance rows
+- lists_count: UserList rows
+
+Write paths apply atomic ``col = col + delta`` updates in their own
+transaction. A missing row is created from a full recount the first time
+it is read (and as zeros on registration), so increments never need to
+insert. ``rebuild_all`` recounts everything set-based for repair.
+"""
+
+import logging
+from typing import Dict, List
+
+from sqlalchemy import literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, insert, select, update
+
+from api.models import User, UserCounters, UserFollow, UserList, UserShowAttendance, Vote
+
+logger = logging.getLogger(__name__)
+
+# Counter column -> (counted model, column holding the user id)
+COUNTER_SOURCES = {
+    "votes_count": (Vote, Vote.user_id),
+    "followers_count": (UserFollow, UserFollow.followed_id),
+    "following_count": (UserFollow, UserFollow.follower_id),
+    "shows_attended": (UserShowAttendance, UserShowAttendance.user_id),
+    "lists_count": (UserList, UserList.user_id),
+}
+
+
+def _count_subquery(counter: str, user_id_expr):
+    _, column = COUNTER_SOURCES[counter]
+    return select(func.count()).select_from(column.table).where(column == user_id_expr).scalar_subquery()
+
+
+class UserStatsService:
+    """Service for maintaining per-user counters."""
+
+    @staticmethod
+    def increment(session: Session, user_id: int, **deltas: int) -> None:
+        """
+        Atomically adjust one user's counters. The caller commits.
+
+        Args:
+            session: Database session
+            user_id: The user whose counters change
+            **deltas: Counter name -> change, e.g. ``followers_count=-1``
+        """
+        values = {name: getattr(UserCounters, name) + delta for name, delta in deltas.items() if delta}
+        if not values:
+            return
+        session.exec(update(UserCounters).where(UserCounters.user_id == user_id).values(**values))
+
+    @staticmethod
+    def on_follow(session: Session, follower_id: int, followed_id: int, delta: int = 1) -> None:
+        """Adjust both sides of a follow (``delta=-1`` for an unfollow)."""
+        UserStatsService.increment(session, followed_id, followers_count=delta)
+        UserStatsService.increment(session, follower_id, following_count=delta)
+
+    @staticmethod
+    def create(session: Session, user_id: int) -> None:
+        """
+        Create a user's counter row from a full recount; no-op if it exists.
+        The caller commits.
+        """
+        row = select(literal(user_id), *[_count_subquery(name, user_id) for name in COUNTER_SOURCES])
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(UserCounters)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(UserCounters)
+        elif session.get(UserCounters, user_id):
+            return
+        else:
+            statement = insert(UserCounters)
+        statement = statement.from_select(["user_id", *COUNTER_SOURCES], row)
+        if hasattr(statement, "on_conflict_do_nothing"):
+            statement = statement.on_conflict_do_nothing()
+        session.exec(statement)
+
+    @staticmethod
+    def get(session: Session, user_id: int) -> UserCounters:
+        """
+        Read a user's counters with one primary-key lookup, creating the row
+        (and committing) the first time.
+        """
+        counters = session.get(UserCounters, user_id)
+        if counters is None:
+            UserStatsService.create(session, user_id)
+            session.commit()
+            counters = session.get(UserCounters, user_id)
+        return counters
+
+    @staticmethod
+    def find_inconsistencies(session: Session) -> List[Dict]:
+        """
+        Compare stored counters against a full recount.
+
+        Returns:
+            List of mismatches, each with user_id, counter, cached and actual values
+        """
+        columns = [getattr(UserCounters, name) for name in COUNTER_SOURCES]
+        actuals = [_count_subquery(name, UserCounters.user_id) for name in COUNTER_SOURCES]
+        mismatches = []
+        for row in session.exec(select(UserCounters.user_id, *columns, *actuals)).all():
+            user_id, values = row[0], row[1:]
+            cached, actual = values[:len(COUNTER_SOURCES)], values[len(COUNTER_SOURCES):]
+            for name, cached_value, actual_value in zip(COUNTER_SOURCES, cached, actual):
+                if cached_value != actual_value:
+                    mismatches.append({
+                        "user_id": user_id, "counter": name, "cached": cached_value, "actual": actual_value,
+                    })
+                    logger.warning(
+                        f"User counter inconsistency: user {user_id} {name} has cached "
+                        f"{cached_value} but actual is {actual_value}"
+                    )
+        return mismatches
+
+    @staticmethod
+    def rebuild_all(session: Session) -> int:
+        """
+        Create missing counter rows and recount every user set-based.
+        Used for migrations or recovery from drift.
+
+        Returns:
+            Number of counter rows rebuilt
+        """
+        missing = select(User.id, *[literal(0)] * len(COUNTER_SOURCES)).where(
+            ~select(UserCounters.user_id).where(UserCounters.user_id == User.id).exists()
+        )
+        session.exec(insert(UserCounters).from_select(["user_id", *COUNTER_SOURCES], missing))
+
+        result = session.exec(
+            update(UserCounters).values(**{
+                name: _count_subquery(name, UserCounters.user_id) for name in COUNTER_SOURCES
+            }),
+            execution_options={"synchronize_session": False},
+        )
+        session.commit()
+        logger.info(f"User counters rebuilt for {result.rowcount} users")
+        return result.rowcount
@@ -0,0 +1,10 @@
+"""
+Venue helpers shared by the venues router and setlist ingestion.
+"""
+
+import re
+
+
+def slugify(text: str) -> str:
+    """Simple slugify for venue names"""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip('-')
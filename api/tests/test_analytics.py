@@ -0,0 +1,152 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from api import database
+from api.database import get_session
+from api.models import AnalyticsEvent, AnalyticsRollup
+from api.routes import analytics as analytics_router
+from api.services.analytics_retention import AnalyticsRetentionService
+from api.services.analytics_rollup import AnalyticsRollupService
+from api.services.event_buffer import EventBuffer
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    return engine
+
+
+@pytest.fixture(name="buffer")
+def buffer_fixture(monkeypatch):
+    buffer = EventBuffer(max_events=5, batch_size=2, flush_seconds=60)
+    monkeypatch.setattr(analytics_router, "event_buffer", buffer)
+    return buffer
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine, buffer):
+    return create_test_app(engine=engine, routers=[analytics_router.router], get_session_dep=get_session)
+
+
+def _track(client, path="/shows"):
+    return client.post("/analytics/event", json={"event_type": "page_view", "path": path, "session_id": "s1"})
+
+
+def test_events_are_written_in_batches(client, engine, buffer):
+    for i in range(5):
+        assert _track(client, f"/shows/{i}").status_code == 200
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert buffer.flush() == 5
+    inserts = [s for s in statements if s.startswith("INSERT INTO analyticsevent")]
+    assert len(inserts) == 3  # batches of 2, 2, 1
+
+    with Session(engine) as session:
+        paths = session.exec(select(AnalyticsEvent.path).order_by(AnalyticsEvent.id)).all()
+    assert paths == [f"/shows/{i}" for i in range(5)]
+    assert (buffer.counters["written"], buffer.counters["batches"]) == (5, 3)
+
+
+def test_full_buffer_drops_and_signals_backpressure(client, buffer):
+    for _ in range(5):
+        _track(client)
+    response = _track(client)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
+    assert buffer.stats()["dropped"] == 1
+
+
+def test_stop_flushes_pending_events(engine, buffer):
+    SQLModel.metadata.create_all(engine)
+    buffer.start()
+    buffer.add("page_view", "/songs", "s1")
+    buffer.stop()
+    with Session(engine) as session:
+        assert session.exec(select(AnalyticsEvent.path)).all() == ["/songs"]
+
+
+def _add_events(engine, *events):
+    with Session(engine) as session:
+        session.add_all([
+            AnalyticsEvent(event_type=event_type, path=path, session_id=session_id, timestamp=timestamp)
+            for event_type, path, session_id, timestamp in events
+        ])
+        session.commit()
+
+
+def test_rollups_are_incremental_and_back_stats(client, engine):
+    day = datetime(2026, 10, 1)
+    _add_events(
+        engine,
+        ("page_view", "/shows", "a", day + timedelta(hours=10, minutes=5)),
+        ("page_view", "/shows", "a", day + timedelta(hours=10, minutes=50)),
+        ("page_view", "/songs", "b", day + timedelta(hours=11)),
+        ("click", "/shows", "a", day + timedelta(hours=10)),
+        ("page_view", "/shows", "c", day + timedelta(days=1, hours=3)),
+    )
+    hour = select(AnalyticsRollup.count, AnalyticsRollup.unique_sessions).where(
+        AnalyticsRollup.granularity == "hour", AnalyticsRollup.path == "/shows",
+        AnalyticsRollup.event_type == "page_view", AnalyticsRollup.bucket_start == day + timedelta(hours=10),
+    )
+    with Session(engine) as session:
+        assert AnalyticsRollupService.run(session)["events"] == 5
+        assert session.exec(hour).one() == (2, 1)
+
+        # A late event for an already rolled-up hour only recomputes that hour and day
+        _add_events(engine, ("page_view", "/shows", "d", day + timedelta(hours=10, minutes=59)))
+        assert AnalyticsRollupService.run(session) == {"events": 1, "rollups": 5, "last_event_id": 6}
+        assert session.exec(hour).one() == (3, 2)
+        assert AnalyticsRollupService.run(session)["events"] == 0
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    body = client.get("/analytics/stats", params={
+        "start": (day + timedelta(hours=9)).isoformat(), "end": (day + timedelta(days=1, hours=4)).isoformat(),
+    }).json()
+    assert not [s for s in statements if "FROM analyticsevent" in s]
+    assert (body["period"], body["page_views"]) == ("custom", 5)
+    assert body["top_pages"] == [{"path": "/shows", "count": 4}, {"path": "/songs", "count": 1}]
+
+    body = client.get("/analytics/stats", params={
+        "start": (day + timedelta(hours=11)).isoformat(), "end": (day + timedelta(hours=12)).isoformat(),
+    }).json()
+    assert (body["page_views"], body["session_buckets"]) == (1, 1)
+
+
+def test_retention_archives_expired_months(engine, tmp_path):
+    SQLModel.metadata.create_all(engine)
+    archive_dir = str(tmp_path / "archive")
+    _add_events(
+        engine,
+        ("page_view", "/shows", "a", datetime(2026, 6, 3, 12)),
+        ("page_view", "/songs", "b", datetime(2026, 6, 30, 23, 59)),
+        ("page_view", "/shows", "c", datetime(2026, 7, 15)),
+        ("page_view", "/shows", "d", datetime(2026, 10, 1)),
+    )
+    now = datetime(2026, 10, 18)
+    with Session(engine) as session:
+        archived = AnalyticsRetentionService.apply_retention(session, now, retention_days=90, archive_dir=archive_dir)
+        assert archived == {"2026-06": 2}  # July is inside the window's first month
+        assert session.exec(select(func.count(AnalyticsEvent.id))).one() == 2
+
+        # A late event for an archived month goes to a second part
+        _add_events(engine, ("page_view", "/shows", "e", datetime(2026, 6, 10)))
+        assert AnalyticsRetentionService.apply_retention(session, now, 90, archive_dir) == {"2026-06": 1}
+        assert len(os.listdir(archive_dir)) == 2
+
+        june = list(AnalyticsRetentionService.iter_archived_events(
+            archive_dir, datetime(2026, 6, 1), datetime(2026, 6, 30)))
+        assert [e["session_id"] for e in june] == ["a", "e"]
+
+        assert AnalyticsRetentionService.rollup_archives(session, datetime(2026, 6, 1), datetime(2026, 8, 1),
+                                                         archive_dir) > 0
+        count, sessions, top, _ = AnalyticsRollupService.stats(session, datetime(2026, 6, 1), datetime(2026, 8, 1))
+    assert (count, sessions) == (4, 4)
+    assert top == [("/shows", 3), ("/songs", 1)]
@@ -0,0 +1,76 @@
+import json
+import os
+import time
+from datetime import date, timedelta
+
+from api.services import show_fetcher
+from api.services.cache_manager import CacheManager, NEGATIVE_TTL, RECENT_NEGATIVE_TTL, negative_ttl_for_date
+
+
+def test_memory_then_disk_tiers(tmp_path):
+    cache = CacheManager(str(tmp_path))
+    cache.set("show_date_2024-06-01", [{"songname": "Arcadia"}])
+
+    assert cache.get("show_date_2024-06-01") == [{"songname": "Arcadia"}]
+    assert cache.stats["memory_hits"] == 1
+
+    # A fresh instance only has the disk tier
+    reopened = CacheManager(str(tmp_path))
+    assert reopened.get("show_date_2024-06-01") == [{"songname": "Arcadia"}]
+    assert reopened.stats["disk_hits"] == 1
+    assert reopened.get("show_date_2024-06-01") == [{"songname": "Arcadia"}]
+    assert reopened.stats["memory_hits"] == 1
+
+
+def test_ttl_and_negative_entries(tmp_path):
+    cache = CacheManager(str(tmp_path))
+    cache.set("short", {"a": 1}, ttl=0.05)
+    cache.set_negative("show_date_2024-01-01")
+
+    assert cache.lookup("show_date_2024-01-01") == (True, None)
+    assert cache.stats["negative_hits"] == 1
+    assert cache.lookup("never-set") == (False, None)
+
+    time.sleep(0.06)
+    assert cache.lookup("short") == (False, None)
+    assert cache.stats["misses"] == 2
+
+
+def test_memory_tier_is_byte_bounded(tmp_path):
+    cache = CacheManager(str(tmp_path), max_memory_bytes=600)
+    values = [os.urandom(200).hex() for _ in range(10)]
+    for i, value in enumerate(values):
+        cache.set(f"k{i}", value)
+
+    assert cache._memory_bytes <= 600
+    assert cache.stats["evictions"] > 0
+    # Evicted entries are still served from disk
+    assert cache.get("k0") == values[0]
+
+
+def test_imports_legacy_json_files(tmp_path):
+    (tmp_path / "show_date_2023-01-01.json").write_text(json.dumps([{"songname": "Hot Tea"}], indent=2))
+    cache = CacheManager(str(tmp_path))
+    assert cache.get("show_date_2023-01-01") == [{"songname": "Hot Tea"}]
+
+
+class NoShowClient:
+    def get_setlist(self, date_str):
+        return []
+
+
+def test_recent_dates_are_negative_cached_briefly(tmp_path, monkeypatch):
+    today = date.today()
+    assert negative_ttl_for_date((today + timedelta(days=1)).isoformat()) == RECENT_NEGATIVE_TTL
+    assert negative_ttl_for_date((today - timedelta(days=1)).isoformat()) == RECENT_NEGATIVE_TTL
+    assert negative_ttl_for_date("2019-01-01") == NEGATIVE_TTL
+
+    # Asking during tonight's show must not block the import for hours
+    cache = CacheManager(str(tmp_path))
+    monkeypatch.setattr(show_fetcher, "get_cache_manager", lambda: cache)
+    monkeypatch.setattr(show_fetcher, "get_elgoose_client", NoShowClient)
+    assert show_fetcher.ShowFetcher.fetch_from_elgoose(today.isoformat()) is None
+    expires_at = cache._connect().execute(
+        "SELECT expires_at FROM cache_entry WHERE key = ?", (f"show_date_{today.isoformat()}",)
+    ).fetchone()[0]
+    assert expires_at - time.time() <= RECENT_NEGATIVE_TTL
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+import requests
+
+from api.services.elgoose_client import AsyncElGooseClient, ElGooseClient, ElGooseError
+from api.tests.utils.fake_elgoose import FakeElGoose
+
+
+@pytest.fixture(name="fake")
+def fake_fixture():
+    fake = FakeElGoose().start()
+    fake.add_show("2024-06-01", 101, ["Arcadia", "Hot Tea"])
+    yield fake
+    fake.stop()
+
+
+def make_client(fake, cls=ElGooseClient, **kwargs):
+    options = dict(base_url=fake.base_url, backoff_base=0.01, max_backoff=0.05, requests_per_second=0)
+    options.update(kwargs)
+    return cls(**options)
+
+
+def test_get_setlist_and_empty_dates(fake):
+    client = make_client(fake)
+    rows = client.get_setlist("2024-06-01")
+    assert [r["songname"] for r in rows] == ["Arcadia", "Hot Tea"]
+    assert client.get_setlist("2024-06-02") == []
+
+
+def test_retries_transient_failures(fake):
+    client = make_client(fake)
+    fake.fail("2024-06-01.json", 503, 502)
+    assert len(client.get_setlist("2024-06-01")) == 2
+    assert client.stats["retries"] == 2
+
+    fake.fail("2024-06-01.json", 503, 503, 503, 503)
+    with pytest.raises(ElGooseError):
+        client.get_setlist("2024-06-01")
+
+
+def test_etag_revalidation(fake):
+    client = make_client(fake)
+    first = client.get_setlist("2024-06-01")
+    second = client.get_setlist("2024-06-01")
+    assert first == second
+    assert client.stats["not_modified"] == 1
+
+
+def test_async_client_fetches_concurrently(fake):
+    fake.add_show("2024-06-02", 102, ["Yeti"])
+
+    async def run():
+        async with make_client(fake, AsyncElGooseClient, max_concurrency=2) as client:
+            return await client.get_setlists(["2024-06-01", "2024-06-02", "2024-06-03"])
+
+    results = asyncio.run(run())
+    assert len(results["2024-06-01"]) == 2
+    assert results["2024-06-02"][0]["songname"] == "Yeti"
+    assert results["2024-06-03"] == []
+
+
+def test_transport_and_decode_errors_become_elgoose_errors(fake, monkeypatch):
+    client = make_client(fake)
+    real_get = client.http.get
+    calls = []
+
+    def flaky_get(url, **kwargs):
+        calls.append(url)
+        if len(calls) == 1:
+            raise requests.exceptions.ChunkedEncodingError("connection broken")
+        return real_get(url, **kwargs)
+
+    monkeypatch.setattr(client.http, "get", flaky_get)
+    assert len(client.get_setlist("2024-06-01")) == 2
+    assert client.stats["retries"] == 1
+
+    html = requests.Response()
+    html.status_code, html._content = 200, b"<html>maintenance</html>"
+    monkeypatch.setattr(client.http, "get", lambda url, **kwargs: html)
+    with pytest.raises(ElGooseError, match="Invalid JSON"):
+        client.get_setlist("2024-06-02")
@@ -0,0 +1,153 @@
+import gzip
+import json
+import os
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from api import database
+from api.database import get_session
+from api.models import (
+    HonkingVersion, ListItem, PerformanceTag, Show, Song, SongPerformance, Tag, User, UserFollow, UserList,
+    UserShowAttendance, Vote,
+)
+from api.routes import export as export_router
+from api.routes import performances as performances_router
+from api.routes.auth import get_current_user
+from api.services.dataset_dump import DatasetDumpService
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    return engine
+
+
+def _seed(session, votes):
+    fan = User(username="fan", email="fan@example.com", hashed_password="x")
+    friend = User(username="friend", email="friend@example.com", hashed_password="x")
+    song = Song(name="Arcadia", slug="arcadia", artist="Goose")
+    show = Show(elgoose_id=1, date="2024-06-01", venue="Red Rocks", location="Morrison, CO", setlist_data="[]")
+    session.add_all([fan, friend, song, show])
+    session.flush()
+    performances = [SongPerformance(song_id=song.id, show_id=show.id, position=i, set_number=1) for i in range(votes)]
+    session.add_all(performances)
+    session.flush()
+    session.add_all([Vote(user_id=fan.id, performance_id=p.id, rating=9) for p in performances])
+    user_list = UserList(user_id=fan.id, title="Jams", list_type="performances", items="[]")
+    session.add_all([UserShowAttendance(user_id=fan.id, show_id=show.id),
+                     UserFollow(follower_id=fan.id, followed_id=friend.id), user_list])
+    session.flush()
+    session.add_all([ListItem(list_id=user_list.id, position=i, item_type="performance", item_id=p.id)
+                     for i, p in enumerate(performances[:2])])
+    session.commit()
+    return fan.id
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    client = create_test_app(engine=engine, routers=[export_router.router], get_session_dep=get_session)
+
+    def current_user():
+        with Session(engine) as session:
+            return session.exec(select(User).where(User.username == "fan")).one()
+
+    client.app.dependency_overrides[get_current_user] = current_user
+    yield client
+    client.app.dependency_overrides.clear()
+
+
+def test_csv_export_layout(client, engine):
+    with Session(engine) as session:
+        fan_id = _seed(session, 3)
+
+    response = client.get("/export/me/csv")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == f"attachment; filename=user_{fan_id}_data.csv"
+    lines = response.text.splitlines()
+    votes = lines.index("VOTING HISTORY")
+    assert lines[votes + 1] == "song_name,artist,performance_link,rating,voted_at"
+    assert lines[votes + 2].startswith("Arcadia,Goose,/performances/1,9,")
+    assert lines[lines.index("ATTENDED SHOWS") + 2] == '2024-06-01,Red Rocks,"Morrison, CO"'
+    assert lines[lines.index("FOLLOWING") + 2].startswith("friend,")
+    assert lines[lines.index("LISTS") + 2] == "Jams,,performances,2"
+
+
+def test_jsonl_export_uses_constant_queries(client, engine):
+    with Session(engine) as session:
+        _seed(session, 40)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = client.get("/export/me/jsonl")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["type"] for r in records].count("vote") == 40
+    assert records[0]["type"] == "profile" and records[0]["username"] == "fan"
+    assert len(statements) < 10
+
+
+def test_dataset_dump_full_then_incremental(engine, tmp_path):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        fan_id = _seed(session, 3)
+        public, private = Tag(name="jam"), Tag(name="mine", is_private=True, owner_user_id=fan_id)
+        session.add_all([public, private, HonkingVersion(user_id=fan_id, song_id=1, performance_id=2)])
+        session.flush()
+        session.add_all([PerformanceTag(performance_id=1, tag_id=public.id),
+                         PerformanceTag(performance_id=2, tag_id=private.id)])
+        session.commit()
+
+    out_dir = tmp_path / "dump"
+    manifest = DatasetDumpService.dump(str(out_dir), formats=["ndjson"])
+
+    def read(name):
+        with gzip.open(out_dir / name, "rt") as f:
+            return [json.loads(line) for line in f]
+
+    assert {t: e["rows"] for t, e in manifest["tables"].items()} == {
+        "shows": 1, "songs": 1, "performances": 3, "vote_aggregates": 3,
+        "tags": 1, "tag_assignments": 1, "honking_versions": 1,
+    }
+    assert read("vote_aggregates.ndjson.gz")[0]["rating_sum"] == 9
+    assert read("tag_assignments.ndjson.gz") == [
+        {"target_type": "performance", "target_id": 1, "tag_id": 1,
+         "created_at": manifest["tables"]["tag_assignments"]["watermark"]}
+    ]
+    assert manifest["tables"]["performances"]["watermark"] == 3
+
+    with Session(engine) as session:
+        session.add(SongPerformance(song_id=1, show_id=1, position=9, set_number=2))
+        session.commit()
+    manifest = DatasetDumpService.dump(str(out_dir), incremental=True, formats=["ndjson"])
+    performances = manifest["tables"]["performances"]
+    assert (performances["rows"], performances["since"], performances["watermark"]) == (1, 3, 4)
+    assert [row["id"] for row in read(performances["files"][0])] == [4]
+    assert manifest["tables"]["vote_aggregates"]["rows"] == 0
+
+
+def test_dataset_dump_reemits_rerated_votes(engine, tmp_path):
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        _seed(session, 2)
+    out_dir = str(tmp_path / "dump")
+    DatasetDumpService.dump(out_dir, tables=["vote_aggregates"], formats=["ndjson"])
+
+    client = create_test_app(engine=engine, routers=[performances_router.router], get_session_dep=get_session)
+
+    def current_user():
+        with Session(engine) as session:
+            return session.exec(select(User).where(User.username == "fan")).one()
+
+    client.app.dependency_overrides[get_current_user] = current_user
+    assert client.post("/performances/2/vote", json={"rating": 4}).status_code == 200
+
+    aggregates = DatasetDumpService.dump(
+        out_dir, tables=["vote_aggregates"], incremental=True, formats=["ndjson"]
+    )["tables"]["vote_aggregates"]
+    with gzip.open(os.path.join(out_dir, aggregates["files"][0]), "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert [(row["performance_id"], row["rating_sum"]) for row in rows] == [(2, 4)]
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from api.database import get_session
+from api.models import Show, Song, SongPerformance, User, Vote
+from api.routes import feed as feed_router
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="client")
+def client_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    app_client = create_test_app(
+        engine=engine,
+        routers=[feed_router.router],
+        get_session_dep=get_session,
+    )
+
+    with Session(engine) as session:
+        user = User(username="voter", email="voter@example.com", hashed_password="x")
+        song = Song(name="Arcadia", slug="arcadia")
+        show = Show(elgoose_id=1, date="2024-06-01", venue="Venue", location="City, ST", setlist_data="[]")
+        session.add_all([user, song, show])
+        session.flush()
+        perf = SongPerformance(song_id=song.id, show_id=show.id, position=1)
+        session.add(perf)
+        session.flush()
+
+        base = datetime(2024, 6, 2, 12, 0, 0)
+        # Votes 0-1 and 2-3 share timestamps to exercise the id tie-breaker
+        for i in range(7):
+            session.add(Vote(
+                user_id=user.id,
+                performance_id=perf.id if i % 2 else None,
+                show_id=None if i % 2 else show.id,
+                rating=i + 1,
+                created_at=base + timedelta(minutes=i // 2),
+            ))
+        session.commit()
+
+    yield app_client
+    app_client.app.dependency_overrides.clear()
+
+
+def test_community_feed_cursor_walks_every_vote_once(client: TestClient):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/feed/community", params=params)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
+
+
+def test_community_feed_serializes_and_supports_offset(client: TestClient):
+    items = client.get("/feed/community", params={"limit": 2, "offset": 5}).json()
+    assert [item["id"] for item in items] == [2, 1]
+    assert items[0]["performance"]["song_slug"] == "arcadia"
+    assert items[1]["show"]["venue"] == "Venue"
+    assert items[1]["user"]["username"] == "voter"
+
+
+def test_community_feed_rejects_bad_cursor(client: TestClient):
+    assert client.get("/feed/community", params={"cursor": "not-a-cursor"}).status_code == 400
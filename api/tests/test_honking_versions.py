@@ -0,0 +1,181 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine, select
+
+from api.database import get_session
+from api.models import HonkingVersion, Show, Song, SongPerformance, User
+from api.routes import honking_versions as honking_router
+from api.routes.auth import get_current_user, get_current_user_optional
+from api.services.honking_cache import HonkingCacheService
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    client = create_test_app(engine=engine, routers=[honking_router.router], get_session_dep=get_session)
+    with Session(engine) as session:
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", hashed_password="x") for i in range(3)]
+        song = Song(name="Arcadia", slug="arcadia")
+        show = Show(elgoose_id=1, date="2024-06-01", venue="Venue", location="City, ST", setlist_data="[]")
+        session.add_all([*users, song, show])
+        session.flush()
+        performances = [SongPerformance(song_id=song.id, show_id=show.id, position=i) for i in range(3)]
+        session.add_all(performances)
+        session.commit()
+        client.ids = {"users": [u.id for u in users], "song": song.id, "perfs": [p.id for p in performances]}
+
+    client.user = 0
+
+    def current_user():
+        if client.user is None:
+            return None
+        with Session(engine) as session:
+            return session.get(User, client.ids["users"][client.user])
+
+    client.app.dependency_overrides[get_current_user] = current_user
+    client.app.dependency_overrides[get_current_user_optional] = current_user
+    yield client
+    client.app.dependency_overrides.clear()
+
+
+def _vote(client, user, perf):
+    client.user = user
+    response = client.post(f"/honking-versions/song/{client.ids['song']}", json={"performance_id": client.ids["perfs"][perf]})
+    assert response.status_code == 200
+
+
+def _leader(engine, client):
+    with Session(engine) as session:
+        song = session.get(Song, client.ids["song"])
+        assert HonkingCacheService.verify_cache_consistency(session, song.id)
+        assert HonkingCacheService.find_inconsistencies(session) == []
+        perfs = client.ids["perfs"]
+        return perfs.index(song.current_honking_performance_id) if song.current_honking_performance_id else None, \
+            song.current_honking_vote_count
+
+
+def test_deltas_track_the_leader(client, engine):
+    _vote(client, 0, 0)
+    assert _leader(engine, client) == (0, 1)
+    _vote(client, 1, 1)
+    assert _leader(engine, client) == (0, 1)  # ties keep the incumbent
+    _vote(client, 2, 1)
+    assert _leader(engine, client) == (1, 2)
+
+    # The leader losing votes re-ranks the song
+    _vote(client, 2, 2)
+    assert _leader(engine, client) == (1, 1)
+    _vote(client, 2, 2)  # same performance again is a no-op
+    assert _leader(engine, client) == (1, 1)
+    _vote(client, 1, 2)
+    assert _leader(engine, client) == (2, 2)
+    client.user = 2
+    assert client.delete(f"/honking-versions/song/{client.ids['song']}").status_code == 200
+    assert _leader(engine, client) == (2, 1)  # tied with perf 0; the incumbent keeps the lead
+
+    for user in range(2):
+        client.user = user
+        assert client.delete(f"/honking-versions/song/{client.ids['song']}").status_code == 200
+    assert _leader(engine, client) == (None, 0)
+
+
+def test_concurrent_revotes_apply_deltas_once(client, engine):
+    _vote(client, 0, 0)
+    raced = []
+
+    def competing_revote(conn, cursor, statement, parameters, context, executemany):
+        # A double click: the same re-vote commits between this request's read and its update
+        if statement.startswith("UPDATE honkingversion") and not raced:
+            raced.append(True)
+            with Session(engine) as other:
+                honking = other.exec(select(HonkingVersion)).one()
+                honking.performance_id = client.ids["perfs"][1]
+                other.add(honking)
+                other.flush()
+                HonkingCacheService.on_honking_vote_changed(other, client.ids["perfs"][0], honking)
+                other.commit()
+
+    event.listen(engine, "before_cursor_execute", competing_revote)
+    _vote(client, 0, 1)
+    event.remove(engine, "before_cursor_execute", competing_revote)
+
+    assert raced
+    assert _leader(engine, client) == (1, 1)
+
+
+def test_vote_does_not_recount(client, engine):
+    _vote(client, 0, 0)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    _vote(client, 1, 1)
+    _vote(client, 0, 1)
+    assert not [s for s in statements if "GROUP BY" in s or "count(honkingversion.id)" in s]
+
+
+def test_rebuild_all_cache_repairs_drift(client, engine):
+    _vote(client, 0, 0)
+    _vote(client, 1, 1)
+    _vote(client, 2, 1)
+    with Session(engine) as session:
+        other = Song(name="Other", slug="other", current_honking_vote_count=3)
+        session.add(other)
+        song = session.get(Song, client.ids["song"])
+        song.current_honking_performance_id = client.ids["perfs"][2]
+        song.current_honking_vote_count = 5
+        stale = session.get(SongPerformance, client.ids["perfs"][2])
+        stale.honking_vote_count = 4
+        session.add_all([song, stale])
+        session.commit()
+
+        assert len(HonkingCacheService.find_inconsistencies(session)) == 3
+        reports = []
+        assert HonkingCacheService.rebuild_all_cache(session, chunk_size=1, workers=2, progress=reports.append) == (2, 1)
+        assert reports[-1]["songs"] == reports[-1]["total"] == 2
+        assert HonkingCacheService.find_inconsistencies(session) == []
+        # Nothing left to change
+        assert HonkingCacheService.rebuild_all_cache(session) == (0, 0)
+    assert _leader(engine, client) == (1, 2)
+
+
+def test_breakdown_is_served_from_counters_and_revalidates(client, engine):
+    _vote(client, 0, 0)
+    _vote(client, 1, 1)
+    _vote(client, 2, 1)
+    url = f"/honking-versions/song/{client.ids['song']}"
+    perfs = client.ids["perfs"]
+
+    client.user = None
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = client.get(url)
+    assert response.status_code == 200
+    assert not [s for s in statements if "GROUP BY" in s]
+    data = response.json()
+    assert data["honking_version"]["performance_id"] == perfs[1]
+    assert data["honking_version"]["honking_votes"] == 2
+    assert data["honking_votes"] == [
+        {"performance_id": perfs[1], "vote_count": 2},
+        {"performance_id": perfs[0], "vote_count": 1},
+    ]
+    assert data["user_honking_vote"] is None
+    assert response.headers["cache-control"] == "public, no-cache"
+    assert client.get(url, params={"top": 1}).json()["honking_votes"] == [{"performance_id": perfs[1], "vote_count": 2}]
+
+    etag = response.headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": response.headers["last-modified"]}).status_code == 304
+    assert client.get(url, params={"top": 1}, headers={"If-None-Match": etag}).status_code == 200
+
+    # Each caller's own vote is part of the validator; any vote invalidates it
+    client.user = 0
+    mine = client.get(url)
+    assert mine.json()["user_honking_vote"]["performance_id"] == perfs[0]
+    assert mine.headers["etag"] != etag and mine.headers["cache-control"] == "private, no-cache"
+    _vote(client, 0, 2)
+    client.user = None
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine, select
+
+from api.database import get_session
+from api.models import ListItem, Show, Song, SongPerformance, User, UserList
+from api.routes import lists as lists_router
+from api.routes.auth import get_current_user
+from api.services.list_items import ListItemService
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    client = create_test_app(engine=engine, routers=[lists_router.router], get_session_dep=get_session)
+    with Session(engine) as session:
+        owner = User(username="owner", email="owner@example.com", hashed_password="x")
+        fan = User(username="fan", email="fan@example.com", hashed_password="x")
+        song = Song(name="Arcadia", slug="arcadia")
+        session.add_all([owner, fan, song])
+        session.flush()
+        shows = [
+            Show(elgoose_id=i, date=f"2024-06-{i:02d}", venue="Venue", location="City, ST", setlist_data="[]",
+                 vote_count=2, rating_sum=17)
+            for i in range(1, 31)
+        ]
+        session.add_all(shows)
+        session.flush()
+        performances = [
+            SongPerformance(song_id=song.id, show_id=show.id, position=1, set_number=1, vote_count=1, rating_sum=9)
+            for show in shows
+        ]
+        session.add_all(performances)
+        session.commit()
+        client.ids = {
+            "owner": owner.id, "fan": fan.id,
+            "performances": [p.id for p in performances], "shows": [s.id for s in shows],
+        }
+
+    client.user = "owner"
+
+    def current_user():
+        with Session(engine) as session:
+            return session.get(User, client.ids[client.user])
+
+    client.app.dependency_overrides[get_current_user] = current_user
+    yield client
+    client.app.dependency_overrides.clear()
+
+
+def _create(client, items, list_type="performances"):
+    response = client.post("/lists/", json={"title": "Jams", "list_type": list_type, "items": json.dumps(items)})
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_items_are_hydrated_in_constant_queries(client, engine):
+    perf_ids = client.ids["performances"]
+    list_id = _create(client, [{"id": perf_ids[0], "label": "The one"}, *perf_ids[1:], 999999])
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    page = client.get(f"/lists/{list_id}/items", params={"limit": 20}).json()
+    first_page_queries = len(statements)
+
+    assert page["total"] == 31
+    assert [item["position"] for item in page["items"]] == list(range(20))
+    first = page["items"][0]
+    assert (first["type"], first["label"], first["data"]["song"]["name"]) == ("performance", "The one", "Arcadia")
+    assert (first["data"]["vote_count"], first["data"]["avg_rating"]) == (1, 9.0)
+
+    statements.clear()
+    page = client.get(f"/lists/{list_id}/items", params={"offset": 20, "limit": 20}).json()
+    assert len(statements) == first_page_queries
+    assert len(page["items"]) == 11
+    assert page["items"][-1]["data"] is None  # deleted or unknown item
+
+
+def test_update_resyncs_items(client, engine):
+    list_id = _create(client, client.ids["performances"][:3])
+    show_ids = client.ids["shows"][:2]
+    response = client.put(f"/lists/{list_id}", json={
+        "title": "Shows", "list_type": "shows", "items": json.dumps(show_ids),
+    })
+    assert response.status_code == 200
+
+    items = client.get(f"/lists/{list_id}/items").json()["items"]
+    assert [(item["type"], item["id"]) for item in items] == [("show", show_ids[0]), ("show", show_ids[1])]
+    assert items[0]["data"]["avg_rating"] == 8.5
+
+
+def test_follower_count_is_maintained(client, engine):
+    list_id = _create(client, [])
+    client.user = "fan"
+    assert client.post(f"/lists/{list_id}/follow").status_code == 200
+    assert client.get(f"/lists/{list_id}").json()["follower_count"] == 1
+    assert client.get("/lists/").json()[0]["follower_count"] == 1
+    assert client.delete(f"/lists/{list_id}/follow").status_code == 200
+    assert client.get(f"/lists/{list_id}").json()["follower_count"] == 0
+
+
+def test_rebuild_migrates_json_items(client, engine):
+    with Session(engine) as session:
+        session.add(UserList(user_id=client.ids["owner"], title="Legacy", list_type="shows",
+                             items=json.dumps(client.ids["shows"][:4])))
+        session.commit()
+        assert ListItemService.rebuild_all(session) == (1, 4)
+        assert len(session.exec(select(ListItem)).all()) == 4
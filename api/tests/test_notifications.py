@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine, select
+
+from api import database
+from api.database import get_session
+from api.models import Notification, Show, User, UserFollow
+from api.routes import votes as votes_router
+from api.routes.auth import get_current_user
+from api.services.notifications import notify_followers
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    return engine
+
+
+@pytest.fixture(name="users")
+def users_fixture(engine):
+    create_test_app(engine=engine)
+    with Session(engine) as session:
+        users = [User(username=f"u{i}", email=f"u{i}@example.com", hashed_password="x") for i in range(51)]
+        session.add_all(users)
+        session.flush()
+        actor = users[0]
+        session.add_all([UserFollow(follower_id=u.id, followed_id=actor.id) for u in users[1:]])
+        session.add(UserFollow(follower_id=actor.id, followed_id=actor.id))
+        session.commit()
+        return [u.id for u in users]
+
+
+def test_notify_followers_is_one_statement(engine, users):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with Session(engine) as session:
+        created = notify_followers(session, actor_id=users[0], type="review", object_type="vote", object_id=9)
+        session.commit()
+
+    assert created == 50
+    assert len([s for s in statements if s.lstrip().upper().startswith("INSERT")]) == 1
+    with Session(engine) as session:
+        recipients = session.exec(select(Notification.user_id)).all()
+        assert sorted(recipients) == users[1:]
+
+
+def test_vote_fans_out_in_background(engine, users):
+    client = create_test_app(engine=engine, routers=[votes_router.router], get_session_dep=get_session)
+    with Session(engine) as session:
+        show = Show(elgoose_id=1, date="2024-06-01", venue="Venue", location="City, ST", setlist_data="[]")
+        session.add(show)
+        session.commit()
+        show_id = show.id
+        actor = session.get(User, users[0])
+
+    client.app.dependency_overrides[get_current_user] = lambda: actor
+    response = client.post("/votes/", json={"show_id": show_id, "rating": 8})
+    assert response.status_code == 200
+
+    with Session(engine) as session:
+        notifications = session.exec(select(Notification)).all()
+        assert len(notifications) == 50
+        assert {n.object_id for n in notifications} == {response.json()["id"]}
+        assert all(isinstance(n.created_at, datetime) for n in notifications)
@@ -0,0 +1,75 @@
+import pytest
+from sqlmodel import Session, create_engine, SQLModel
+
+from api.models import Show, Song, SongPerformance, User, Vote
+from api.services.rating_cache import RatingCacheService, average_rating
+
+
+@pytest.fixture(name="session")
+def session_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture(name="performance")
+def performance_fixture(session: Session):
+    song = Song(name="Arcadia", slug="arcadia")
+    show = Show(elgoose_id=1, date="2024-06-01", venue="Venue", location="City, ST", setlist_data="[]")
+    session.add_all([song, show])
+    session.flush()
+    perf = SongPerformance(song_id=song.id, show_id=show.id, position=1)
+    session.add(perf)
+    session.commit()
+    return perf
+
+
+def _add_vote(session: Session, username: str, **kwargs) -> Vote:
+    user = User(username=username, email=f"{username}@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    vote = Vote(user_id=user.id, **kwargs)
+    session.add(vote)
+    session.flush()
+    RatingCacheService.on_vote_created(session, vote)
+    session.commit()
+    return vote
+
+
+def test_deltas_track_votes(session: Session, performance: SongPerformance):
+    first = _add_vote(session, "a", performance_id=performance.id, rating=8)
+    _add_vote(session, "b", performance_id=performance.id, rating=5)
+    _add_vote(session, "c", show_id=performance.show_id, rating=9)
+
+    session.refresh(performance)
+    assert (performance.vote_count, performance.rating_sum) == (2, 13)
+    assert average_rating(performance.vote_count, performance.rating_sum) == 6.5
+
+    old_rating = first.rating
+    first.rating = 10
+    session.add(first)
+    RatingCacheService.on_vote_changed(session, first, old_rating)
+    session.commit()
+
+    session.refresh(performance)
+    show = session.get(Show, performance.show_id)
+    assert (performance.vote_count, performance.rating_sum) == (2, 15)
+    assert (show.vote_count, show.rating_sum) == (1, 9)
+    assert RatingCacheService.find_inconsistencies(session) == []
+
+
+def test_rebuild_repairs_drift(session: Session, performance: SongPerformance):
+    _add_vote(session, "a", performance_id=performance.id, rating=7)
+    performance.vote_count = 42
+    session.add(performance)
+    session.commit()
+
+    mismatches = RatingCacheService.find_inconsistencies(session)
+    assert [m["id"] for m in mismatches] == [performance.id]
+
+    assert RatingCacheService.rebuild_all_cache(session) == (1, 1)
+    session.refresh(performance)
+    assert (performance.vote_count, performance.rating_sum) == (1, 7)
+    assert RatingCacheService.find_inconsistencies(session) == []
+    assert average_rating(0, 0) is None
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from api.services.response_cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+
+
+def test_ttl_expiry():
+    cache = ResponseCache("t", MemoryCacheBackend(), ttl=0.05)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert cache.get_or_compute("k", compute) == 1
+    assert cache.get_or_compute("k", compute) == 1
+    time.sleep(0.06)
+    assert cache.get_or_compute("k", compute) == 2
+
+
+def test_single_flight():
+    cache = ResponseCache("t", MemoryCacheBackend(), ttl=60)
+    calls = []
+    start = threading.Event()
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return "payload"
+
+    def worker(results):
+        start.wait()
+        results.append(cache.get_or_compute("k", compute))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    start.set()
+    for t in threads:
+        t.join()
+
+    assert results == ["payload"] * 8
+    assert len(calls) == 1
+
+
+def test_invalidation_shared_across_workers(tmp_path):
+    path = tmp_path / "cache.db"
+    worker_a = ResponseCache("stats", SQLiteCacheBackend(str(path)), ttl=60)
+    worker_b = ResponseCache("stats", SQLiteCacheBackend(str(path)), ttl=60)
+
+    assert worker_a.get_or_compute("payload", lambda: {"v": 1}) == {"v": 1}
+    assert worker_b.get_or_compute("payload", lambda: {"v": 2}) == {"v": 1}
+
+    worker_b.invalidate()
+    assert worker_a.get_or_compute("payload", lambda: {"v": 3}) == {"v": 3}
+
+
+def test_memory_backend_evicts_lru():
+    backend = MemoryCacheBackend(max_entries=2)
+    cache = ResponseCache("t", backend, ttl=60)
+    for key in ("a", "b", "c"):
+        cache.get_or_compute(key, lambda: key)
+    assert cache.get_or_compute("a", lambda: "recomputed") == "recomputed"
+
+
+def test_invalidation_reclaims_old_generations(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    cache = ResponseCache("stats", backend, ttl=60)
+    for version in range(5):
+        cache.get_or_compute("payload", lambda: {"v": version})
+        cache.invalidate()
+    backend.set("other", 1, ttl=0.01)
+    time.sleep(0.02)
+    backend.set("stats:fresh", 1)
+
+    keys = [row[0] for row in backend._connect().execute("SELECT key FROM cache_entry ORDER BY key")]
+    assert keys == ["stats:fresh", "stats:generation"]
+
+
+def test_memory_generation_survives_eviction():
+    backend = MemoryCacheBackend(max_entries=2)
+    cache = ResponseCache("t", backend, ttl=60)
+    cache.get_or_compute("a", lambda: "old")
+    backend.incr("t:generation")  # bump without reclaiming, as a racing worker would
+    backend.get("t:0:a")
+    backend.set("other", 1)  # pushes out the least recently used key
+    assert cache.get_or_compute("a", lambda: "new") == "new"
@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session, create_engine
+
+from api.database import get_session
+from api.models import User, Vote
+from api.routes import search as search_router
+from api.services import search_index
+from api.services.search_index import SearchIndexService, ensure_search_schema
+from api.services.setlist_ingest import insert_shows, parse_setlist
+from api.tests.utils.test_app import create_test_app
+
+
+def _setlist(show_id, songs, venue="Venue"):
+    return [
+        {"show_id": show_id, "venuename": venue, "city": "Town", "state": "ST", "songname": song, "setname": "Set 1"}
+        for song in songs
+    ]
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    client = create_test_app(engine=engine, routers=[search_router.router], get_session_dep=get_session)
+    with engine.begin() as connection:
+        assert ensure_search_schema(connection)
+
+    with Session(engine) as session:
+        insert_shows(session, [
+            parse_setlist("2024-06-01", _setlist(1, ["Arcadia", "Arcadium Jam"], venue="Red Rocks")),
+            parse_setlist("2024-06-02", _setlist(2, ["Arcadia", "Hungersite"], venue="Red Rocks")),
+            parse_setlist("2024-06-03", _setlist(3, ["Arcadia", "Tumble"], venue="The Capitol Theatre")),
+        ])
+        user = User(username="honker", email="honker@example.com", hashed_password="x")
+        session.add(user)
+        session.flush()
+        vote = Vote(user_id=user.id, show_id=1, rating=9, blurb="Ridiculous peak in the second set")
+        session.add(vote)
+        session.flush()
+        SearchIndexService.index_users(session, [user.id])
+        SearchIndexService.index_reviews(session, [vote.id])
+        session.commit()
+    return client
+
+
+class FakePostgresConnection:
+    """Records DDL, formatting it like psycopg2 and aborting the transaction on errors like Postgres."""
+
+    def __init__(self, fail_on=None):
+        self.dialect = SimpleNamespace(name="postgresql")
+        self.fail_on = fail_on
+        self.executed = []
+        self.aborted = False
+
+    def exec_driver_sql(self, statement, parameters=None, execution_options=None):
+        if self.aborted:
+            raise RuntimeError("current transaction is aborted")
+        if not (execution_options or {}).get("no_parameters"):
+            statement = statement % (parameters or {})
+        if self.fail_on and statement.startswith(self.fail_on):
+            self.aborted = True
+            raise RuntimeError("permission denied")
+        self.executed.append(statement)
+
+    @contextmanager
+    def begin_nested(self):
+        try:
+            yield
+        except Exception:
+            self.aborted = False
+            raise
+
+
+def test_postgres_schema_statements_run_verbatim():
+    connection = FakePostgresConnection()
+    assert ensure_search_schema(connection)
+    assert connection.executed == search_index.POSTGRES_SCHEMA
+
+
+def test_postgres_schema_failure_leaves_transaction_usable():
+    connection = FakePostgresConnection(fail_on="CREATE EXTENSION")
+    assert not ensure_search_schema(connection)
+    connection.exec_driver_sql("SELECT 1")
+    assert connection.executed == ["SELECT 1"]
+
+
+def _search(client, q, **params):
+    response = client.get("/search/", params={"q": q, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_prefix_match_ranks_popular_songs_first(client):
+    results = _search(client, "arcad", types="song")
+    assert [r["title"] for r in results] == ["Arcadia", "Arcadium Jam"]
+    assert results[0]["url"] == "/songs/arcadia"
+
+
+def test_typo_tolerance(client):
+    assert [r["title"] for r in _search(client, "arcadai", types="song")][:1] == ["Arcadia"]
+    assert [r["title"] for r in _search(client, "hungersight", types="song")] == ["Hungersite"]
+
+
+def test_searches_venues_users_and_review_text(client):
+    assert [r["type"] for r in _search(client, "capitol")] == ["venue", "show"]
+    assert [r["title"] for r in _search(client, "honk", types="user")] == ["honker"]
+    reviews = _search(client, "ridiculous peak")
+    assert [r["type"] for r in reviews] == ["review"]
+
+
+def test_new_shows_are_indexed_incrementally(client, engine):
+    assert _search(client, "echo of the rogue") == []
+    with Session(engine) as session:
+        insert_shows(session, [parse_setlist("2024-07-01", _setlist(4, ["Echo of the Rogue"]))])
+        session.commit()
+    assert [r["title"] for r in _search(client, "echo of the rogue", types="song")] == ["Echo of the Rogue"]
+
+
+def test_opted_out_users_stay_searchable_in_app(client, engine):
+    with Session(engine) as session:
+        user = User(username="honkless", email="honkless@example.com", hashed_password="x", indexable=False)
+        session.add(user)
+        session.flush()
+        SearchIndexService.index_users(session, [user.id])
+        session.commit()
+    assert [r["title"] for r in _search(client, "honkless", types="user")] == ["honkless"]
@@ -0,0 +1,134 @@
+import pytest
+from datetime import datetime
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from api.models import Show, Song, SongPerformance
+from api.services.cache_manager import CacheManager
+from api.services import setlist_ingest
+from api.services.setlist_ingest import index_dates, insert_shows, parse_setlist
+from api.seed_from_elgoose import ElGooseScraper
+from api.tests.utils.fake_elgoose import FakeElGoose
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(name="fake")
+def fake_fixture():
+    fake = FakeElGoose().start()
+    fake.add_show("2024-06-01", 101, ["Arcadia", "Hot Tea", "Arcadia"])
+    fake.add_show("2024-06-03", 102, ["Hot Tea", "Yeti"], setname="Set 2")
+    fake.add_show("2024-06-05", 103, ["Tumble"])
+    yield fake
+    fake.stop()
+
+
+def make_scraper(fake, engine, tmp_path, **kwargs):
+    options = dict(
+        workers=1,
+        batch_size=2,
+        checkpoint_path=tmp_path / "checkpoint.json",
+        client_options=dict(base_url=fake.base_url, backoff_base=0.01, max_backoff=0.05, requests_per_second=0),
+        db_engine=engine,
+        cache=CacheManager(str(tmp_path / "cache")),
+    )
+    options.update(kwargs)
+    return ElGooseScraper(**options)
+
+
+def test_parse_setlist_sets_and_covers():
+    rows = [
+        {"show_id": 7, "venuename": "V", "city": "C", "state": "ST", "songname": "A", "setname": "Set 1"},
+        {"show_id": 7, "songname": "B", "setname": "Set 2", "artist": "Talking Heads"},
+        {"show_id": 7, "songname": "C", "setname": ""},
+        {"show_id": 7, "songname": "D", "setname": "Encore"},
+    ]
+    parsed = parse_setlist("2024-01-01", rows)
+    assert parsed["location"] == "C, ST"
+    assert [p["set_number"] for p in parsed["performances"]] == [1, 2, 2, 3]
+    assert parsed["performances"][1]["original_artist"] == "Talking Heads"
+    assert parse_setlist("2024-01-02", []) is None
+
+
+def test_index_dates_filters_range_and_artist():
+    index = [
+        {"showdate": "2024-01-01", "artist": "Goose"},
+        {"showdate": "2024-01-02", "artist": "Vasudo"},
+        {"showdate": "2024-02-01", "artist": "Goose"},
+        {"showdate": "2024-01-01", "artist": "Goose"},
+    ]
+    assert index_dates(index, "2024-01-01", "2024-01-31") == ["2024-01-01"]
+
+
+def test_insert_shows_is_idempotent(engine):
+    parsed = parse_setlist("2024-01-01", [
+        {"show_id": 1, "songname": "Arcadia"},
+        {"show_id": 1, "songname": "Hot Tea"},
+    ])
+    with Session(engine) as session:
+        session.add(Song(name="Arcadia", slug="arcadia"))
+        session.commit()
+
+        counts = insert_shows(session, [parsed])
+        session.commit()
+        assert counts == {"shows_created": 1, "shows_skipped": 0, "performances_created": 2}
+        assert insert_shows(session, [parsed])["shows_skipped"] == 1
+        assert len(session.exec(select(Song)).all()) == 2
+
+
+def test_insert_shows_skips_show_lost_to_concurrent_import(engine, monkeypatch):
+    parsed = parse_setlist("2024-01-01", [
+        {"show_id": 1, "songname": "Arcadia"},
+        {"show_id": 1, "songname": "Hot Tea"},
+    ])
+    ensure_venues = setlist_ingest.ensure_venues
+
+    def racing_ensure_venues(session, shows):
+        # The other import commits the show after this one checked for it
+        monkeypatch.setattr(setlist_ingest, "ensure_venues", ensure_venues)
+        with Session(engine) as other:
+            assert insert_shows(other, [parsed])["shows_created"] == 1
+            other.commit()
+        return ensure_venues(session, shows)
+
+    monkeypatch.setattr(setlist_ingest, "ensure_venues", racing_ensure_venues)
+    with Session(engine) as session:
+        counts = insert_shows(session, [parsed])
+        session.commit()
+        assert counts == {"shows_created": 0, "shows_skipped": 1, "performances_created": 0}
+        assert len(session.exec(select(Show)).all()) == 1
+        assert len(session.exec(select(SongPerformance)).all()) == 2
+
+
+def test_scraper_imports_only_show_dates(fake, engine, tmp_path):
+    scraper = make_scraper(fake, engine, tmp_path)
+    scraper.scrape_date_range(datetime(2024, 6, 1), datetime(2024, 6, 30))
+
+    setlist_requests = [p for p in fake.requests if "/setlists/" in p]
+    assert len(setlist_requests) == 3
+    assert scraper.stats["shows_created"] == 3
+    assert scraper.stats["songs_created"] == 4
+    assert scraper.stats["performances_created"] == 6
+
+    with Session(engine) as session:
+        show = session.exec(select(Show).where(Show.elgoose_id == 102)).one()
+        perfs = session.exec(select(SongPerformance).where(SongPerformance.show_id == show.id)).all()
+        assert {p.set_number for p in perfs} == {2}
+
+
+def test_scraper_resumes_from_checkpoint(fake, engine, tmp_path):
+    fake.fail("2024-06-05.json", 500, 500, 500, 500)
+    scraper = make_scraper(fake, engine, tmp_path)
+    scraper.scrape_date_range(datetime(2024, 6, 1), datetime(2024, 6, 30))
+    assert scraper.stats["shows_created"] == 2
+    assert scraper.stats["errors"] == 1
+
+    fake.requests.clear()
+    resumed = make_scraper(fake, engine, tmp_path)
+    resumed.scrape_date_range(datetime(2024, 6, 1), datetime(2024, 6, 30))
+    assert [p for p in fake.requests if "/setlists/" in p] == ["/api/v2/setlists/showdate/2024-06-05.json"]
+    assert resumed.stats["shows_created"] == 1
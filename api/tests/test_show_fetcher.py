@@ -0,0 +1,135 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from api.models import Show, Song, SongPerformance
+from api.services import setlist_ingest
+from api.services.show_fetcher import ShowFetcher
+from api.services.single_flight import SingleFlight
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _setlist(show_id, songs):
+    return [
+        {"show_id": show_id, "venuename": f"Venue {show_id}", "city": "Town", "state": "ST",
+         "songname": song, "setname": "Encore" if i == len(songs) - 1 else "Set 1"}
+        for i, song in enumerate(songs)
+    ]
+
+
+def _count_statements(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_populate_show_uses_constant_statements(engine):
+    with Session(engine) as session:
+        session.add(Song(name="Song 0", slug="song-0"))
+        session.commit()
+
+        statements = _count_statements(engine)
+        small = ShowFetcher.populate_show(session, "2024-05-01", _setlist(1, ["Song 0", "Other 1"]))
+        small_count = len(statements)
+
+        statements.clear()
+        show = ShowFetcher.populate_show(session, "2024-06-01", _setlist(2, [f"Song {i}" for i in range(20)]))
+
+        assert len(statements) == small_count
+        assert small.elgoose_id == 1 and show.elgoose_id == 2
+        perfs = session.exec(
+            select(SongPerformance).where(SongPerformance.show_id == show.id).order_by(SongPerformance.position)
+        ).all()
+        assert len(perfs) == 20
+        assert perfs[-1].set_number == 3
+        assert len(session.exec(select(Song)).all()) == 21
+
+
+def test_populate_show_returns_existing_show(engine):
+    with Session(engine) as session:
+        first = ShowFetcher.populate_show(session, "2024-06-01", _setlist(1, ["Arcadia"]))
+        second = ShowFetcher.populate_show(session, "2024-06-01", _setlist(1, ["Arcadia"]))
+
+        assert first.id == second.id
+        assert len(session.exec(select(Show)).all()) == 1
+        assert len(session.exec(select(SongPerformance)).all()) == 1
+
+
+def test_populate_show_from_two_sessions_keeps_one_setlist(engine, monkeypatch):
+    ensure_venues = setlist_ingest.ensure_venues
+    winner = {}
+
+    def racing_ensure_venues(session, shows):
+        # Another worker (or the seeder) imports the same show mid-import
+        monkeypatch.setattr(setlist_ingest, "ensure_venues", ensure_venues)
+        with Session(engine) as other:
+            winner["id"] = ShowFetcher.populate_show(other, "2024-06-01", _setlist(1, ["Arcadia", "Hot Tea"])).id
+        return ensure_venues(session, shows)
+
+    monkeypatch.setattr(setlist_ingest, "ensure_venues", racing_ensure_venues)
+    with Session(engine) as session:
+        show = ShowFetcher.populate_show(session, "2024-06-01", _setlist(1, ["Arcadia", "Hot Tea"]))
+
+        assert show.id == winner["id"]
+        assert len(session.exec(select(Show)).all()) == 1
+        assert len(session.exec(select(SongPerformance)).all()) == 2
+
+
+def test_concurrent_fetches_are_coalesced(engine, monkeypatch):
+    calls = []
+    started = threading.Event()
+
+    def slow_fetch(date_str):
+        calls.append(date_str)
+        started.set()
+        time.sleep(0.2)
+        return _setlist(7, ["Arcadia", "Hot Tea"])
+
+    monkeypatch.setattr(ShowFetcher, "fetch_from_elgoose", staticmethod(slow_fetch))
+
+    def request():
+        with Session(engine) as session:
+            show = ShowFetcher.get_or_fetch_show(session, "2024-06-01")
+            return show.elgoose_id
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(request)]
+        started.wait(1)
+        futures += [pool.submit(request) for _ in range(7)]
+        results = [f.result() for f in futures]
+
+    assert results == [7] * 8
+    assert calls == ["2024-06-01"]
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(1)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", failing)
+        while not flight.stats["calls"]:
+            time.sleep(0.01)
+        follower = pool.submit(flight.do, "key", lambda: "unused")
+        while not flight.stats["coalesced"]:
+            time.sleep(0.01)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
+
+    assert flight.do("key", lambda: "fresh") == "fresh"
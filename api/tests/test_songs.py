@@ -0,0 +1,112 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+from api.database import get_session
+from api.models import Show, Song, SongPerformance, User, Vote
+from api.routes import songs as songs_router
+from api.services.rating_cache import RatingCacheService
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    return engine
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    app_client = create_test_app(
+        engine=engine,
+        routers=[songs_router.router],
+        get_session_dep=get_session,
+    )
+
+    with Session(engine) as session:
+        user = User(username="voter", email="voter@example.com", hashed_password="x")
+        arcadia = Song(name="Arcadia", slug="arcadia")
+        hot_tea = Song(name="Hot Tea", slug="hot-tea")
+        yeti = Song(name="Yeti", slug="yeti")
+        early = Show(elgoose_id=1, date="2023-01-01", venue="Venue A", location="City, ST", setlist_data="[]")
+        late = Show(elgoose_id=2, date="2024-06-01", venue="Venue B", location="City, ST", setlist_data="[]")
+        session.add_all([user, arcadia, hot_tea, yeti, early, late])
+        session.flush()
+
+        perfs = [
+            SongPerformance(song_id=arcadia.id, show_id=early.id, position=1),
+            SongPerformance(song_id=arcadia.id, show_id=late.id, position=1),
+            SongPerformance(song_id=hot_tea.id, show_id=late.id, position=2),
+        ]
+        session.add_all(perfs)
+        session.flush()
+
+        session.add_all([
+            Vote(user_id=user.id, performance_id=perfs[0].id, rating=6),
+            Vote(user_id=user.id, performance_id=perfs[1].id, rating=9),
+            Vote(user_id=user.id, performance_id=perfs[2].id, rating=10),
+        ])
+        session.commit()
+        RatingCacheService.rebuild_all_cache(session)
+
+    yield app_client
+    app_client.app.dependency_overrides.clear()
+
+
+def test_list_songs_aggregates(client: TestClient):
+    response = client.get("/songs/")
+    assert response.status_code == 200
+    data = {song["slug"]: song for song in response.json()}
+
+    assert data["arcadia"]["times_played"] == 2
+    assert data["arcadia"]["last_played"] == "2024-06-01"
+    assert data["arcadia"]["vote_count"] == 2
+    assert data["arcadia"]["avg_rating"] == 7.5
+    assert data["yeti"]["times_played"] == 0
+    assert data["yeti"]["avg_rating"] is None
+
+
+def test_list_songs_sort_and_pagination(client: TestClient):
+    by_plays = client.get("/songs/", params={"sort": "plays"}).json()
+    assert [s["slug"] for s in by_plays] == ["arcadia", "hot-tea", "yeti"]
+
+    by_rating = client.get("/songs/", params={"sort": "rating"}).json()
+    assert [s["slug"] for s in by_rating] == ["hot-tea", "arcadia", "yeti"]
+
+    page = client.get("/songs/", params={"limit": 1, "offset": 1}).json()
+    assert [s["slug"] for s in page] == ["hot-tea"]
+
+    assert client.get("/songs/", params={"sort": "bogus"}).status_code == 400
+
+
+def test_list_songs_single_query(client: TestClient, engine):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        client.get("/songs/")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_song_performances_sorted_and_paged(client: TestClient):
+    full = client.get("/songs/arcadia/performances").json()
+    assert [p["avg_rating"] for p in full] == [9.0, 6.0]
+    assert all(p["vote_count"] == 1 for p in full)
+    assert all(p["tags"] == [] for p in full)
+
+    first = client.get("/songs/arcadia/performances", params={"limit": 1})
+    assert [p["id"] for p in first.json()] == [full[0]["id"]]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/songs/arcadia/performances", params={"limit": 1, "cursor": cursor})
+    assert [p["id"] for p in second.json()] == [full[1]["id"]]
+    assert "X-Next-Cursor" not in second.headers
+
+    assert client.get("/songs/arcadia/performances", params={"cursor": "garbage"}).status_code == 400
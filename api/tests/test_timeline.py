@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine, select
+
+from api.database import get_session
+from api.models import Show, TimelineEntry, User, UserCounters, UserFollow, Vote
+from api.routes import feed as feed_router
+from api.routes.auth import get_current_user
+from api.services import timeline
+from api.services.timeline import TimelineService
+from api.services.user_stats import UserStatsService
+from api.tests.utils.test_app import create_test_app
+
+BASE = datetime(2024, 6, 1, 12, 0, 0)
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    client = create_test_app(engine=engine, routers=[feed_router.router], get_session_dep=get_session)
+    with Session(engine) as session:
+        users = {name: User(username=name, email=f"{name}@example.com", hashed_password="x")
+                 for name in ("reader", "author", "star", "fan")}
+        show = Show(elgoose_id=1, date="2024-06-01", venue="Venue", location="City, ST", setlist_data="[]")
+        session.add_all([*users.values(), show])
+        session.flush()
+        session.add_all([
+            UserFollow(follower_id=users["reader"].id, followed_id=users["author"].id),
+            UserFollow(follower_id=users["reader"].id, followed_id=users["star"].id),
+            UserFollow(follower_id=users["fan"].id, followed_id=users["star"].id),
+        ])
+        session.commit()
+        UserStatsService.rebuild_all(session)
+        client.ids = {name: user.id for name, user in users.items()}
+        client.ids["show"] = show.id
+        client.app.dependency_overrides[get_current_user] = lambda: session.get(User, client.ids["reader"])
+    yield client
+    client.app.dependency_overrides.clear()
+
+
+def _vote(session: Session, user_id: int, show_id: int, minutes: int) -> int:
+    vote = Vote(user_id=user_id, show_id=show_id, rating=7, created_at=BASE + timedelta(minutes=minutes))
+    session.add(vote)
+    session.flush()
+    TimelineService.fan_out_vote(session, vote.id, trim=False)
+    session.commit()
+    return vote.id
+
+
+def _walk(client: TestClient, limit: int):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/feed/following", params=params)
+        assert response.status_code == 200
+        ids += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+
+def test_following_feed_merges_fanned_out_and_high_follower_votes(client, engine, monkeypatch):
+    monkeypatch.setattr(timeline, "FANOUT_FOLLOWER_LIMIT", 1)
+    ids = client.ids
+    with Session(engine) as session:
+        expected = [
+            _vote(session, ids["author"], ids["show"], 0),
+            _vote(session, ids["star"], ids["show"], 1),
+            _vote(session, ids["author"], ids["show"], 2),
+            _vote(session, ids["star"], ids["show"], 3),
+        ]
+        _vote(session, ids["fan"], ids["show"], 4)  # not followed by the reader
+        # The star has two followers, so only the author's votes are materialized
+        assert len(session.exec(select(TimelineEntry)).all()) == 2
+
+    assert _walk(client, limit=3) == list(reversed(expected))
+
+
+def test_high_follower_author_without_counters_is_merged_on_read(client, engine, monkeypatch):
+    monkeypatch.setattr(timeline, "FANOUT_FOLLOWER_LIMIT", 1)
+    ids = client.ids
+    with Session(engine) as session:
+        # Counters not backfilled yet for the star
+        session.delete(session.get(UserCounters, ids["star"]))
+        session.commit()
+        vote_id = _vote(session, ids["star"], ids["show"], 0)
+        assert session.exec(select(TimelineEntry)).all() == []
+        assert TimelineService.high_follower_followees(session, ids["reader"]) == [ids["star"]]
+
+    assert _walk(client, limit=5) == [vote_id]
+
+
+def test_follow_backfills_and_unfollow_removes(client, engine):
+    ids = client.ids
+    with Session(engine) as session:
+        vote_id = _vote(session, ids["fan"], ids["show"], 0)
+        session.add(UserFollow(follower_id=ids["reader"], followed_id=ids["fan"]))
+        UserStatsService.on_follow(session, ids["reader"], ids["fan"])
+        TimelineService.on_follow(session, ids["reader"], ids["fan"])
+        session.commit()
+    assert _walk(client, limit=5) == [vote_id]
+
+    with Session(engine) as session:
+        TimelineService.on_unfollow(session, ids["reader"], ids["fan"])
+        session.commit()
+        assert session.exec(select(TimelineEntry)).all() == []
+
+
+def test_trim_keeps_newest_entries(client, engine):
+    ids = client.ids
+    with Session(engine) as session:
+        vote_ids = [_vote(session, ids["author"], ids["show"], i) for i in range(5)]
+        assert TimelineService.trim(session, max_entries=2) == 3
+        session.commit()
+        kept = session.exec(select(TimelineEntry.vote_id)).all()
+        assert sorted(kept) == vote_ids[-2:]
+
+
+def test_author_dropping_to_limit_is_backfilled(client, engine, monkeypatch):
+    monkeypatch.setattr(timeline, "FANOUT_FOLLOWER_LIMIT", 1)
+    ids = client.ids
+    with Session(engine) as session:
+        star_votes = [_vote(session, ids["star"], ids["show"], i) for i in range(2)]
+        assert session.exec(select(TimelineEntry)).all() == []
+
+        # The fan unfollows: the star is back at the limit and fanned out on write
+        session.delete(session.exec(select(UserFollow).where(UserFollow.follower_id == ids["fan"])).one())
+        UserStatsService.on_follow(session, ids["fan"], ids["star"], delta=-1)
+        assert TimelineService.on_unfollow(session, ids["fan"], ids["star"])
+        assert TimelineService.high_follower_followees(session, ids["reader"]) == []
+        assert TimelineService.backfill_followers(session, ids["star"]) == 2
+        session.commit()
+        entries = session.exec(select(TimelineEntry.user_id, TimelineEntry.vote_id)).all()
+        assert sorted(entries) == [(ids["reader"], vote_id) for vote_id in star_votes]
+
+    assert _walk(client, limit=5) == list(reversed(star_votes))
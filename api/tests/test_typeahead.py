@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+from api import database
+from api.database import get_session
+from api.models import Show, User
+from api.routes import auth as auth_router
+from api.routes import search as search_router
+from api.services.setlist_ingest import insert_shows, parse_setlist
+from api.services.show_fetcher import ShowFetcher
+from api.services.typeahead import typeahead
+from api.tests.utils.test_app import create_test_app
+
+
+def _setlist(show_id, songs, venue):
+    return [
+        {"show_id": show_id, "venuename": venue, "city": "Town", "state": "ST", "songname": song, "setname": "Set 1"}
+        for song in songs
+    ]
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    monkeypatch.setattr(database, "engine", engine)
+    return engine
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    client = create_test_app(
+        engine=engine, routers=[search_router.router, auth_router.router], get_session_dep=get_session
+    )
+    with Session(engine) as session:
+        insert_shows(session, [
+            parse_setlist("2024-06-01", _setlist(1, ["Arcadia", "Hungersite"], "Red Rocks Amphitheatre")),
+            parse_setlist("2024-06-02", _setlist(2, ["Arcadia", "Arrow"], "Red Rocks Amphitheatre")),
+        ])
+        session.get(Show, 1).tour = "Summer Tour 2024"
+        session.add(User(username="hidden_honker", email="h@example.com", hashed_password="x", indexable=False))
+        session.commit()
+        typeahead.load(session)
+    return client
+
+
+def _suggest(client, q, **params):
+    response = client.get("/search/suggest", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(s["type"], s["label"]) for s in response.json()]
+
+
+def test_suggest_ranks_by_weight_without_queries(client, engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    assert _suggest(client, "ar") == [("song", "Arcadia"), ("song", "Arrow")]
+    assert _suggest(client, "red roc") == [("venue", "Red Rocks Amphitheatre")]
+    assert _suggest(client, "amphi") == [("venue", "Red Rocks Amphitheatre")]
+    assert _suggest(client, "summer", types="tour") == [("tour", "Summer Tour 2024")]
+    assert _suggest(client, "honker") == []
+    assert statements == []
+
+
+def test_new_shows_and_users_are_added_incrementally(client, engine):
+    with Session(engine) as session:
+        ShowFetcher.populate_show(session, "2024-07-01", _setlist(3, ["Arrow", "Atlas Dogs"], "The Anthem"))
+    assert _suggest(client, "a")[:3] == [("song", "Arcadia"), ("song", "Arrow"), ("song", "Atlas Dogs")]
+    assert ("venue", "The Anthem") in _suggest(client, "anth")
+
+    response = client.post("/auth/register", json={
+        "username": "honker", "email": "honker@example.com", "password": "secret-password",
+    })
+    assert response.status_code == 200
+    assert _suggest(client, "honk") == [("user", "honker")]
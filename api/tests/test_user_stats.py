@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine, select
+
+from api.database import get_session
+from api.models import Show, User, UserCounters, UserFollow, Vote
+from api.routes import attended as attended_router
+from api.routes import follows as follows_router
+from api.routes import lists as lists_router
+from api.routes import users as users_router
+from api.routes.auth import get_current_user
+from api.services.user_stats import UserStatsService
+from api.tests.utils.test_app import create_test_app
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    client = create_test_app(
+        engine=engine,
+        routers=[users_router.router, follows_router.router, attended_router.router, lists_router.router],
+        get_session_dep=get_session,
+    )
+    with Session(engine) as session:
+        alice = User(username="alice", email="alice@example.com", hashed_password="x")
+        bob = User(username="bob", email="bob@example.com", hashed_password="x")
+        show = Show(elgoose_id=1, date="2024-06-01", venue="Venue", location="City, ST", setlist_data="[]")
+        session.add_all([alice, bob, show])
+        session.flush()
+        # Written before counters exist: picked up by the recount on first read
+        session.add_all([Vote(user_id=alice.id, show_id=show.id, rating=8) for _ in range(3)])
+        session.commit()
+        client.ids = {"alice": alice.id, "bob": bob.id, "show": show.id}
+
+    def as_alice():
+        with Session(engine) as session:
+            return session.get(User, client.ids["alice"])
+
+    client.app.dependency_overrides[get_current_user] = as_alice
+    yield client
+    client.app.dependency_overrides.clear()
+
+
+def test_counters_follow_write_paths(client, engine):
+    assert client.get("/users/alice").json()["stats"]["reviews_count"] == 3
+
+    assert client.post("/users/bob/follow").status_code == 200
+    assert client.post(f"/attended/{client.ids['show']}").status_code == 200
+    assert client.post("/lists/", json={"title": "Best Jams", "list_type": "performances", "items": "[]"}).status_code == 200
+
+    alice = client.get("/users/me").json()["stats"]
+    assert (alice["following_count"], alice["shows_attended"], alice["lists_count"]) == (1, 1, 1)
+    assert client.get("/users/bob").json()["stats"]["followers_count"] == 1
+
+    assert client.delete("/users/bob/follow").status_code == 200
+    assert client.delete(f"/attended/{client.ids['show']}").status_code == 200
+    assert client.get("/users/bob").json()["stats"]["followers_count"] == 0
+    assert client.get("/users/me").json()["stats"]["shows_attended"] == 0
+
+    with Session(engine) as session:
+        assert UserStatsService.find_inconsistencies(session) == []
+
+
+def test_user_read_is_one_counter_lookup(client, engine):
+    client.get("/users/alice")
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    client.get("/users/alice")
+    counted = ("FROM vote", "FROM userfollow", "FROM usershowattendance", "FROM userlist")
+    assert not [s for s in statements if any(table in s for table in counted)]
+    assert len([s for s in statements if "FROM usercounters" in s]) == 1
+
+
+def test_rebuild_repairs_drift(client, engine):
+    with Session(engine) as session:
+        UserStatsService.create(session, client.ids["alice"])
+        session.add(UserFollow(follower_id=client.ids["bob"], followed_id=client.ids["alice"]))
+        session.commit()
+        assert [m["counter"] for m in UserStatsService.find_inconsistencies(session)] == ["followers_count"]
+
+        assert UserStatsService.rebuild_all(session) == 2
+        assert UserStatsService.find_inconsistencies(session) == []
+        counters = session.get(UserCounters, client.ids["alice"])
+        assert (counters.votes_count, counters.followers_count) == (3, 1)
+        assert len(session.exec(select(UserCounters)).all()) == 2
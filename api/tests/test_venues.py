@@ -0,0 +1,72 @@
+import pytest
+from sqlmodel import Session, create_engine, select
+
+from api.database import get_session
+from api.models import Show, Venue
+from api.routes import venues as venues_router
+from api.services.setlist_ingest import backfill_venues, insert_shows, parse_setlist
+from api.tests.utils.test_app import create_test_app
+
+
+def _setlist(show_id, songs, venue):
+    return [
+        {"show_id": show_id, "venuename": venue, "city": "Morrison", "state": "CO", "songname": song,
+         "setname": "Set 1"}
+        for song in songs
+    ]
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture(name="client")
+def client_fixture(engine):
+    return create_test_app(engine=engine, routers=[venues_router.router], get_session_dep=get_session)
+
+
+def test_ingest_links_shows_and_maintains_aggregates(client, engine):
+    with Session(engine) as session:
+        insert_shows(session, [
+            parse_setlist("2024-06-01", _setlist(1, ["Arcadia", "Hot Tea"], "Red Rocks Amphitheatre")),
+            parse_setlist("2023-06-02", _setlist(2, ["Arcadia"], "Red Rocks Amphitheatre")),
+        ])
+        insert_shows(session, [parse_setlist("2025-06-03", _setlist(3, ["Hot Tea", "Arcadia"], "Red Rocks Amphitheatre"))])
+        session.commit()
+        venues = session.exec(select(Venue)).all()
+        assert len(venues) == 1
+        assert {show.venue_id for show in session.exec(select(Show)).all()} == {venues[0].id}
+
+    response = client.get("/venues/red-rocks-amphitheatre")
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["city"], body["state"]) == ("Morrison", "CO")
+    assert body["stats"]["show_count"] == 3
+    assert (body["stats"]["first_show_date"], body["stats"]["last_show_date"]) == ("2023-06-02", "2025-06-03")
+    assert [(s["name"], s["plays"]) for s in body["stats"]["top_songs"]] == [("Arcadia", 3), ("Hot Tea", 2)]
+    assert [s["date"] for s in body["shows"]] == ["2023-06-02", "2024-06-01", "2025-06-03"]
+
+    assert client.get("/venues/").json() == [{"name": "Red Rocks Amphitheatre", "slug": "red-rocks-amphitheatre"}]
+    assert client.get("/venues/nowhere").status_code == 404
+
+
+def test_backfill_links_legacy_shows(client, engine):
+    with Session(engine) as session:
+        session.add_all([
+            Show(elgoose_id=1, date="2022-01-01", venue="The Capitol Theatre", location="Port Chester, NY",
+                 setlist_data="[]"),
+            Show(elgoose_id=2, date="2022-01-02", venue="The Capitol Theatre", location="Port Chester, NY",
+                 setlist_data="[]"),
+            Show(elgoose_id=3, date="2022-02-01", venue="Brooklyn Bowl", location="Brooklyn", setlist_data="[]"),
+        ])
+        session.commit()
+
+        assert backfill_venues(session) == {"venues": 2, "shows_linked": 3, "shows_unlinked": 0}
+        session.commit()
+        assert backfill_venues(session) == {"venues": 0, "shows_linked": 0, "shows_unlinked": 0}
+
+        capitol = session.exec(select(Venue).where(Venue.slug == "the-capitol-theatre")).one()
+        assert (capitol.city, capitol.state, capitol.show_count) == ("Port Chester", "NY", 2)
+        bowl = session.exec(select(Venue).where(Venue.slug == "brooklyn-bowl")).one()
+        assert (bowl.city, bowl.state) == ("Brooklyn", None)
@@ -0,0 +1,100 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class FakeElGoose:
+    """
+    Minimal local stand-in for the El Goose v2 API.
+
+    Serves setlists registered with ``add_show`` at
+    /api/v2/setlists/showdate/{date}.json and lists them in /api/v2/shows.json,
+    answers unknown dates with an empty
+    wrapped payload, supports ETag revalidation, and can inject failures.
+    """
+
+    def __init__(self):
+        self.setlists: Dict[str, List[dict]] = {}
+        self.links: Dict[int, List[dict]] = {}
+        self.failures: Dict[str, List[int]] = {}
+        self.requests: List[str] = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}/api/v2"
+
+    def add_show(self, date: str, show_id: int, songs: List[str], venue: str = "Test Venue",
+                 city: str = "Town", state: str = "ST", setname: Optional[str] = None):
+        self.setlists[date] = [
+            {
+                "show_id": show_id,
+                "showdate": date,
+                "venuename": venue,
+                "city": city,
+                "state": state,
+                "songname": song,
+                "setname": setname or "Set 1",
+            }
+            for song in songs
+        ]
+
+    def fail(self, path_suffix: str, *statuses: int):
+        """Respond to the next requests ending with ``path_suffix`` with ``statuses``."""
+        self.failures.setdefault(path_suffix, []).extend(statuses)
+
+    def start(self) -> "FakeElGoose":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body=None, headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                with fake.lock:
+                    fake.requests.append(self.path)
+                    for suffix, statuses in fake.failures.items():
+                        if self.path.endswith(suffix) and statuses:
+                            return self._send(statuses.pop(0), {"error": True})
+
+                if "/setlists/showdate/" in self.path:
+                    date = self.path.rsplit("/", 1)[-1].replace(".json", "")
+                    body = {"error": False, "data": fake.setlists.get(date, [])}
+                elif self.path.endswith("/shows.json"):
+                    body = {"error": False, "data": [
+                        {"show_id": rows[0]["show_id"], "showdate": date, "artist": "Goose"}
+                        for date, rows in sorted(fake.setlists.items()) if rows
+                    ]}
+                elif "/links/show_id/" in self.path:
+                    show_id = int(self.path.rsplit("/", 1)[-1].replace(".json", ""))
+                    body = {"error": False, "data": fake.links.get(show_id, [])}
+                else:
+                    return self._send(404)
+
+                etag = f'"{abs(hash(json.dumps(body, sort_keys=True)))}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, headers={"ETag": etag})
+                self._send(200, body, {"ETag": etag, "Content-Type": "application/json"})
+
+        return Handler
@@ -7,13 +7,15 @@ import { getApiEndpoint } from '@/lib/api';
 import { useToast } from '@/components/ToastContainer';
 import Link from 'next/link';
 
+type ExportFormat = 'csv' | 'jsonl';
+
 export default function ExportPage() {
     const { data: session } = useSession();
     const { addToast } = useToast();
-    const [downloading, setDownloading] = useState(false);
+    const [downloading, setDownloading] = useState<ExportFormat | null>(null);
     const [error, setError] = useState<string>('');
 
-    const handleDownload = async () => {
+    const handleDownload = async (format: ExportFormat) => {
         setError('');
         if (!session?.user?.accessToken) {
             const msg = 'Please sign in to download your export.';
@@ -21,9 +23,9 @@ export default function ExportPage() {
             addToast(msg, 'error');
             return;
         }
-        setDownloading(true);
+        setDownloading(format);
         try {
-            const res = await fetch(getApiEndpoint('/export/me/csv'), {
+            const res = await fetch(getApiEndpoint(`/export/me/${format}`), {
                 headers: {
                     Authorization: `Bearer ${session.user.accessToken}`,
                 },
@@ -36,7 +38,7 @@ export default function ExportPage() {
             const url = window.URL.createObjectURL(blob);
             const a = document.createElement('a');
             a.href = url;
-            a.download = 'honkingversion_export.csv';
+            a.download = `honkingversion_export.${format}`;
             document.body.appendChild(a);
             a.click();
             a.remove();
@@ -47,7 +49,7 @@ export default function ExportPage() {
             setError(msg);
             addToast(msg, 'error');
         } finally {
-            setDownloading(false);
+            setDownloading(null);
         }
     };
 
@@ -73,17 +75,27 @@ export default function ExportPage() {
                     Download Your Complete Data
                 </h2>
                 <p className="text-[#a0a0a0] mb-4">
-                    Export a CSV file containing your complete HonkingVersion data. This includes your profile, all votes and ratings, shows you've attended, users you follow, and custom lists.
+                    Export a CSV file containing your complete HonkingVersion data. This includes your profile, all votes and ratings, shows you've attended, users you follow, and custom lists. JSON Lines (one record per line) is also available for scripts and data tools.
                 </p>
                 {error && <p className="text-red-500 mb-4">{error}</p>}
-                <button
-                    onClick={handleDownload}
-                    disabled={downloading}
-                    className="inline-flex items-center gap-2 bg-[#ff6b35] text-[#0a0a0a] px-6 py-3 font-[family-name:var(--font-ibm-plex-mono)] hover:bg-[#ff8c5a] font-bold disabled:opacity-60"
-                >
-                    <Download className="w-4 h-4" />
-                    {downloading ? 'Preparing…' : 'Download CSV'}
-                </button>
+                <div className="flex flex-wrap gap-3">
+                    <button
+                        onClick={() => handleDownload('csv')}
+                        disabled={downloading !== null}
+                        className="inline-flex items-center gap-2 bg-[#ff6b35] text-[#0a0a0a] px-6 py-3 font-[family-name:var(--font-ibm-plex-mono)] hover:bg-[#ff8c5a] font-bold disabled:opacity-60"
+                    >
+                        <Download className="w-4 h-4" />
+                        {downloading === 'csv' ? 'Preparing…' : 'Download CSV'}
+                    </button>
+                    <button
+                        onClick={() => handleDownload('jsonl')}
+                        disabled={downloading !== null}
+                        className="inline-flex items-center gap-2 border border-[#ff6b35] text-[#ff6b35] px-6 py-3 font-[family-name:var(--font-ibm-plex-mono)] hover:bg-[#ff6b35] hover:text-[#0a0a0a] font-bold disabled:opacity-60"
+                    >
+                        <Download className="w-4 h-4" />
+                        {downloading === 'jsonl' ? 'Preparing…' : 'Download JSON Lines'}
+                    </button>
+                </div>
             </div>
 
             <div className="grid grid-cols-1 md:grid-cols-2 gap-4 mb-8">
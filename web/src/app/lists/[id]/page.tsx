@@ -11,6 +11,8 @@ import ItemTags from '@/components/ItemTags';
 import ListEditor from '@/components/ListEditor';
 import ListFollowButton from '@/components/ListFollowButton';
 
+const ITEM_PAGE_SIZE = 50;
+
 export default function ListDetailPage() {
     const params = useParams();
     const router = useRouter();
@@ -25,6 +27,7 @@ export default function ListDetailPage() {
     const [shareToken, setShareToken] = useState<string | null>(null);
     const [sharing, setSharing] = useState(false);
     const [itemDetails, setItemDetails] = useState<any[]>([]);
+    const [itemTotal, setItemTotal] = useState(0);
     const [followerCount, setFollowerCount] = useState(0);
     const [isFollowing, setIsFollowing] = useState(false);
 
@@ -58,56 +61,41 @@ export default function ListDetailPage() {
         }
     }, [id, session, tokenParam]);
 
+    const fetchItemPage = async (offset: number) => {
+        const query = new URLSearchParams({ offset: String(offset), limit: String(ITEM_PAGE_SIZE) });
+        if (tokenParam) query.set('token', tokenParam);
+        const res = await fetch(getApiEndpoint(`/lists/${id}/items?${query}`), { cache: 'no-store' });
+        if (!res.ok) return null;
+        const page = await res.json();
+        setItemTotal(page.total);
+        return page.items.map((item: any) => (item.data ? item : { ...item, type: 'unknown' }));
+    };
+
     useEffect(() => {
         const fetchDetails = async () => {
-            if (!list?.items) {
+            if (!list) {
                 setItemDetails([]);
                 return;
             }
-            const itemsArray = Array.isArray(list.items)
-                ? list.items
-                : (() => {
-                    try {
-                        return JSON.parse(list.items as string);
-                    } catch {
-                        return [];
-                    }
-                })();
-
-            const results: any[] = [];
-            for (const raw of itemsArray) {
-                const itemId = typeof raw === 'object' && raw?.id ? raw.id : raw;
-                const label = typeof raw === 'object' && raw?.label ? raw.label : null;
-                try {
-                    if (list.list_type === 'shows') {
-                        const res = await fetch(getApiEndpoint(`/shows/id/${itemId}`), { cache: 'no-store' });
-                        if (res.ok) {
-                            results.push({ type: 'show', data: await res.json(), id: itemId, label });
-                            continue;
-                        }
-                    } else if (list.list_type === 'performances') {
-                        const res = await fetch(getApiEndpoint(`/performances/${itemId}`), { cache: 'no-store' });
-                        if (res.ok) {
-                            results.push({ type: 'performance', data: await res.json(), id: itemId, label });
-                            continue;
-                        }
-                    } else if (list.list_type === 'songs') {
-                        const res = await fetch(getApiEndpoint(`/songs/id/${itemId}`), { cache: 'no-store' });
-                        if (res.ok) {
-                            results.push({ type: 'song', data: await res.json(), id: itemId, label });
-                            continue;
-                        }
-                    }
-                } catch (e) {
-                    console.error('Failed to fetch item detail', e);
-                }
-                results.push({ type: 'unknown', id: itemId, label });
+            try {
+                setItemDetails((await fetchItemPage(0)) ?? []);
+            } catch (e) {
+                console.error('Failed to fetch list items', e);
             }
-            setItemDetails(results);
         };
         fetchDetails();
+        // eslint-disable-next-line react-hooks/exhaustive-deps
     }, [list]);
 
+    const loadMoreItems = async () => {
+        try {
+            const more = await fetchItemPage(itemDetails.length);
+            if (more) setItemDetails((prev) => [...prev, ...more]);
+        } catch (e) {
+            console.error('Failed to fetch list items', e);
+        }
+    };
+
     const handleDelete = async () => {
         if (!session?.user?.accessToken || !confirm('Are you sure you want to delete this list?')) return;
 
@@ -299,6 +287,14 @@ export default function ListDetailPage() {
                     ) : (
                         <div className="text-[#a0a0a0] italic">This list is empty.</div>
                     )}
+                    {itemDetails.length < itemTotal && (
+                        <button
+                            onClick={loadMoreItems}
+                            className="w-full py-3 border border-[#333] text-[#a0a0a0] hover:border-[#00d9ff] hover:text-[#f5f5f5] font-[family-name:var(--font-ibm-plex-mono)] text-sm"
+                        >
+                            Load more ({itemTotal - itemDetails.length} remaining)
+                        </button>
+                    )}
                 </div>
 
                 <ListEditor
@@ -6,7 +6,7 @@ import Link from 'next/link';
 import { getApiEndpoint } from '@/lib/api';
 
 interface SearchResult {
-    type: 'show' | 'song' | 'user';
+    type: 'show' | 'song' | 'user' | 'venue' | 'review' | 'synopsis';
     id: number;
     title: string;
     subtitle?: string;
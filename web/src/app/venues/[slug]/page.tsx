@@ -11,11 +11,22 @@ interface Show {
   elgoose_id?: string;
 }
 
+interface TopSong {
+  name: string;
+  slug: string;
+  plays: number;
+}
+
 interface VenueData {
   name: string;
   slug: string;
+  city?: string | null;
+  state?: string | null;
   stats: {
     show_count: number;
+    first_show_date?: string | null;
+    last_show_date?: string | null;
+    top_songs: TopSong[];
   };
   shows: Show[];
 }
@@ -93,6 +104,26 @@ export default function VenueDetailPage({ params }: { params: Promise<{ slug: st
         )}
       </div>
 
+      {venue.stats.top_songs.length > 0 && (
+        <div className="mb-8">
+          <h2 className="font-[family-name:var(--font-space-grotesk)] text-2xl font-bold text-[#f5f5f5] mb-4">
+            Most Played Here
+          </h2>
+          <div className="space-y-2">
+            {venue.stats.top_songs.map((song) => (
+              <Link
+                key={song.slug}
+                href={`/songs/${song.slug}`}
+                className="flex justify-between p-3 bg-[#1a1a1a] border border-[#a0a0a0] hover:border-[#ff6b35] transition"
+              >
+                <span className="text-[#f5f5f5]">{song.name}</span>
+                <span className="font-[family-name:var(--font-ibm-plex-mono)] text-[#90ee90]">{song.plays}×</span>
+              </Link>
+            ))}
+          </div>
+        </div>
+      )}
+
       <div>
         <h2 className="font-[family-name:var(--font-space-grotesk)] text-2xl font-bold text-[#f5f5f5] mb-4">
           All Shows at {venue.name}
@@ -140,7 +171,11 @@ export default function VenueDetailPage({ params }: { params: Promise<{ slug: st
         </h3>
         <p className="text-[#a0a0a0] text-sm">
           {venue.name} has hosted {venue.stats.show_count} Goose{' '}
-          {venue.stats.show_count === 1 ? 'performance' : 'performances'}. Click on any show above to see the setlist
+          {venue.stats.show_count === 1 ? 'performance' : 'performances'}
+          {venue.stats.first_show_date && venue.stats.last_show_date && venue.stats.show_count > 1
+            ? `, from ${venue.stats.first_show_date} to ${venue.stats.last_show_date}`
+            : ''}
+          . Click on any show above to see the setlist
           and vote on individual performances.
         </p>
       </div>
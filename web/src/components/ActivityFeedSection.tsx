@@ -16,10 +16,12 @@ export default function ActivityFeedSection() {
   const [loadingInitial, setLoadingInitial] = useState(true);
   const [page, setPage] = useState(0);
   const [hasMore, setHasMore] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   useEffect(() => {
     setPage(0);
     setHasMore(true);
+    setNextCursor(null);
     setFeedActivities([]);
     fetchFeed(true);
     // eslint-disable-next-line react-hooks/exhaustive-deps
@@ -38,13 +40,21 @@ export default function ActivityFeedSection() {
       const endpoint =
         feedType === 'following'
           ? `/users/me/feed?limit=${PAGE_SIZE}&offset=${offset}`
-          : `/feed/community?limit=${PAGE_SIZE}&offset=${offset}`;
+          : !reset && nextCursor
+            ? `/feed/community?limit=${PAGE_SIZE}&cursor=${encodeURIComponent(nextCursor)}`
+            : `/feed/community?limit=${PAGE_SIZE}&offset=${offset}`;
 
       const res = await fetch(getApiEndpoint(endpoint), { headers });
       if (res.ok) {
         const data = await res.json();
         setFeedActivities((prev) => (reset ? data : [...prev, ...data]));
-        setHasMore(data.length === PAGE_SIZE);
+        if (feedType === 'community') {
+          const cursor = res.headers.get('X-Next-Cursor');
+          setNextCursor(cursor);
+          setHasMore(Boolean(cursor));
+        } else {
+          setHasMore(data.length === PAGE_SIZE);
+        }
       }
     } catch (error) {
       console.error('Failed to fetch feed', error);
@@ -5,17 +5,16 @@ import { useRouter } from 'next/navigation';
 import Link from 'next/link';
 import { Search, Music, MapPin, User as UserIcon } from 'lucide-react';
 
-interface SearchResult {
-    type: 'song' | 'show' | 'user';
-    id: number;
-    title: string;
-    subtitle?: string;
+interface Suggestion {
+    type: 'song' | 'venue' | 'tour' | 'user';
+    key: string;
+    label: string;
     url: string;
 }
 
 export default function SearchBar() {
     const [query, setQuery] = useState('');
-    const [suggestions, setSuggestions] = useState<SearchResult[]>([]);
+    const [suggestions, setSuggestions] = useState<Suggestion[]>([]);
     const [isOpen, setIsOpen] = useState(false);
     const [isLoading, setIsLoading] = useState(false);
     const router = useRouter();
@@ -37,7 +36,7 @@ export default function SearchBar() {
         setIsLoading(true);
         timeoutRef.current = setTimeout(async () => {
             try {
-                const response = await fetch(`/api/search?q=${encodeURIComponent(query)}`);
+                const response = await fetch(`/api/search/suggest?q=${encodeURIComponent(query)}`);
                 if (response.ok) {
                     const results = await response.json();
                     setSuggestions(results);
@@ -48,7 +47,7 @@ export default function SearchBar() {
             } finally {
                 setIsLoading(false);
             }
-        }, 300);
+        }, 100);
 
         return () => {
             if (timeoutRef.current) {
@@ -77,7 +76,7 @@ export default function SearchBar() {
         }
     };
 
-    const handleSuggestionClick = (result: SearchResult) => {
+    const handleSuggestionClick = (result: Suggestion) => {
         router.push(result.url);
         setIsOpen(false);
         setQuery('');
@@ -87,7 +86,8 @@ export default function SearchBar() {
         switch (type) {
             case 'song':
                 return <Music className="w-4 h-4" />;
-            case 'show':
+            case 'venue':
+            case 'tour':
                 return <MapPin className="w-4 h-4" />;
             case 'user':
                 return <UserIcon className="w-4 h-4" />;
@@ -129,7 +129,7 @@ export default function SearchBar() {
                 <div className="absolute top-full left-0 right-0 mt-1 bg-[var(--bg-secondary)] border border-[var(--border)] rounded-sm shadow-lg z-50 overflow-hidden">
                     {suggestions.map((result, index) => (
                         <button
-                            key={`${result.type}-${result.id}-${index}`}
+                            key={`${result.type}-${result.key}-${index}`}
                             onClick={() => handleSuggestionClick(result)}
                             className="w-full px-4 py-3 text-left hover:bg-[var(--bg-muted)] transition-colors border-b border-[var(--border-subtle)] last:border-b-0 flex items-start gap-3 group"
                         >
@@ -138,13 +138,11 @@ export default function SearchBar() {
                             </div>
                             <div className="flex-1 min-w-0">
                                 <div className="text-sm font-medium text-[var(--text-primary)] group-hover:text-[var(--accent-primary)] transition-colors truncate">
-                                    {result.title}
+                                    {result.label}
+                                </div>
+                                <div className="text-xs text-[var(--text-secondary)] capitalize">
+                                    {result.type}
                                 </div>
-                                {result.subtitle && (
-                                    <div className="text-xs text-[var(--text-secondary)] truncate">
-                                        {result.subtitle}
-                                    </div>
-                                )}
                             </div>
                         </button>
                     ))}
@@ -2,6 +2,9 @@ import { v4 as uuidv4 } from 'uuid';
 
 const SESSION_KEY = 'hv_analytics_session_id';
 
+// Set when the API sheds load (503 + Retry-After); events are skipped until then
+let pausedUntil = 0;
+
 export const getSessionId = (): string => {
     if (typeof window === 'undefined') return '';
 
@@ -18,12 +21,13 @@ export const trackEvent = async (
     metadata?: Record<string, any>
 ) => {
     if (typeof window === 'undefined') return;
+    if (Date.now() < pausedUntil) return;
 
     const sessionId = getSessionId();
     const path = window.location.pathname;
 
     try {
-        await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/analytics/event`, {
+        const res = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/analytics/event`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -37,6 +41,10 @@ export const trackEvent = async (
                 session_id: sessionId,
             }),
         });
+        if (res.status === 503) {
+            const retryAfter = Number(res.headers.get('Retry-After')) || 5;
+            pausedUntil = Date.now() + retryAfter * 1000;
+        }
     } catch (error) {
         console.error('Failed to track event:', error);
     }
@@ -93,6 +93,7 @@ export interface User {
         reviews_count: number;
         followers_count: number;
         following_count: number;
+        lists_count?: number;
     };
     is_following?: boolean;
 }